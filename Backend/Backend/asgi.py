@@ -14,3 +14,13 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Backend.settings')
 
 application = get_asgi_application()
+
+# Optionally load the models listed in settings.MODEL_REGISTRY['WARMUP'] before the first request
+from accounts.controllers.model_registry import warm_up_from_settings  # noqa: E402
+
+warm_up_from_settings()
+
+# Optionally start settings.BROWSER_POOL['PREWARM'] headless browsers for test executions
+from accounts.controllers.browser_pool import warm_up_from_settings as warm_up_browsers  # noqa: E402
+
+warm_up_browsers()
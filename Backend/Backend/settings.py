@@ -157,4 +157,71 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:5173',
-]
\ No newline at end of file
+]
+
+
+# Persistent embedding cache (memory-mapped float16 vectors with an LRU index)
+EMBEDDING_CACHE = {
+    'ENABLED': env.bool('EMBEDDING_CACHE_ENABLED', default=True),
+    'DIR': env('EMBEDDING_CACHE_DIR', default=str(BASE_DIR / 'cache' / 'embeddings')),
+    'MAX_ENTRIES': env.int('EMBEDDING_CACHE_MAX_ENTRIES', default=200000),
+}
+
+
+# Lazy model registry: models load on first use; WARMUP lists the ones to load at server start
+# ("e5", "summarizer"), and idle models are evicted past the memory budget (0 = unlimited)
+MODEL_REGISTRY = {
+    'WARMUP': env.list('MODEL_WARMUP', default=[]),
+    'WARMUP_BLOCKING': env.bool('MODEL_WARMUP_BLOCKING', default=False),
+    'MEMORY_BUDGET_MB': env.int('MODEL_MEMORY_BUDGET_MB', default=0),
+    'IDLE_TIMEOUT_SECONDS': env.int('MODEL_IDLE_TIMEOUT_SECONDS', default=0),
+    'FAILURE_BACKOFF_SECONDS': env.int('MODEL_FAILURE_BACKOFF_SECONDS', default=300),
+}
+
+
+# Persistent cache of BART semantic descriptions (SQLite), shared by the BDD, HTML and mapping stages
+SUMMARY_CACHE = {
+    'ENABLED': env.bool('SUMMARY_CACHE_ENABLED', default=True),
+    'PATH': env('SUMMARY_CACHE_PATH', default=str(BASE_DIR / 'cache' / 'summaries.sqlite3')),
+    'BATCH_SIZE': env.int('SUMMARY_BATCH_SIZE', default=8),
+}
+
+
+# Page acquisition for the mapping pipeline: pooled concurrent fetching, a per-host concurrency
+# limit and an on-disk body cache revalidated with ETag/Last-Modified once older than TTL_SECONDS
+PAGE_FETCHER = {
+    'MAX_WORKERS': env.int('PAGE_FETCHER_MAX_WORKERS', default=8),
+    'PER_HOST': env.int('PAGE_FETCHER_PER_HOST', default=4),
+    'TIMEOUT_SECONDS': env.int('PAGE_FETCHER_TIMEOUT_SECONDS', default=10),
+    'CACHE_ENABLED': env.bool('PAGE_CACHE_ENABLED', default=True),
+    'CACHE_DIR': env('PAGE_CACHE_DIR', default=str(BASE_DIR / 'cache' / 'pages')),
+    'TTL_SECONDS': env.int('PAGE_CACHE_TTL_SECONDS', default=60),
+}
+
+
+# CPU inference backend for the E5 and sentence-transformer models:
+# "fp32" (default), "int8" (dynamic quantization of Linear layers) or "onnx" (needs optimum[onnxruntime]).
+# See benchmarks/inference_backend_report.py for the accuracy/latency trade-off.
+INFERENCE_BACKEND = env('INFERENCE_BACKEND', default='fp32')
+
+
+# Headless Chrome workers shared by test executions: pool size, browsers started at server
+# start, how long a request waits for a free browser and after how many runs a browser is recycled
+BROWSER_POOL = {
+    'SIZE': env.int('BROWSER_POOL_SIZE', default=2),
+    'PREWARM': env.int('BROWSER_POOL_PREWARM', default=0),
+    'HEADLESS': env.bool('BROWSER_HEADLESS', default=True),
+    'LEASE_TIMEOUT_SECONDS': env.int('BROWSER_LEASE_TIMEOUT_SECONDS', default=300),
+    'MAX_USES': env.int('BROWSER_MAX_USES', default=50),
+}
+
+
+# Database-backed job queue for the execution, mapping and fine-tuning endpoints; run workers with
+# `python manage.py run_jobs`. EAGER runs jobs inside the request instead (tests, single-process setups).
+JOBS = {
+    'EAGER': env.bool('JOBS_EAGER', default=False),
+    'POLL_INTERVAL_SECONDS': env.int('JOBS_POLL_INTERVAL_SECONDS', default=1),
+    'HEARTBEAT_SECONDS': env.int('JOBS_HEARTBEAT_SECONDS', default=30),
+    'STALE_AFTER_SECONDS': env.int('JOBS_STALE_AFTER_SECONDS', default=600),
+    'RETRY_DELAY_SECONDS': env.int('JOBS_RETRY_DELAY_SECONDS', default=30),
+}
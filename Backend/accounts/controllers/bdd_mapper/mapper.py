@@ -1,9 +1,10 @@
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
 import torch
+from ..shared import get_sentence_model
 
 class BDDToLocatorMapper:
     def __init__(self, model_name="all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+        self.model = get_sentence_model(model_name)
 
     def match(self, bdd_steps, locators_dict):
         pom_texts = list(locators_dict.keys())
@@ -1,64 +1,45 @@
-from .shared import tokenizer, model
-import torch
-from transformers import pipeline
+from .shared import embedding_service
+from .summarizer import summarize
 
-def process_bdd(scenario):
+def process_bdd(scenario, enable_summarization=True):
     """
     Process a single BDD scenario from a file and generate embeddings and semantic descriptions.
     Splits the scenario into steps and processes each step individually.
+    Descriptions come from the cached summarization stage and can be switched off per project.
     """
-    # Initialize summarizer
-    summarizer = None
-    try:
-        summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-    except Exception as e:
-        print(f"Failed to load summarization model: {e}")
-
-    steps = scenario.split("\n")
+    steps = [step.strip() for step in scenario.split("\n") if step.strip()]  # Skip empty lines
     processed_steps = []
 
-    for step in steps:
-        step = step.strip()
-        if step:  # Skip empty lines
-            # Generate embedding for the step
-            step_embedding = get_embedding(step)
+    # Generate embeddings for every step and the entire scenario in a single batched call
+    embeddings = embedding_service.encode(steps + [scenario])
+    # Summarize the unique steps and the scenario in one pass through the summarization stage
+    descriptions = summarize(steps + [scenario], enabled=enable_summarization)
+
+    for index, step in enumerate(steps):
+        # Embedding for the step
+        step_embedding = embeddings[index:index + 1]
 
-            # Generate semantic description for the step
-            step_description = generate_semantic_description(step, summarizer) if summarizer else "No description available"
+        # Generate semantic description for the step
+        step_description = descriptions[index]
 
-            # Add the processed step to the list
-            processed_steps.append({
-                "step": step,
-                "embedding": step_embedding,
-                "description": step_description
-            })
+        # Add the processed step to the list
+        processed_steps.append({
+            "step": step,
+            "embedding": step_embedding,
+            "description": step_description
+        })
 
     # Return the processed scenario with step-level data
     return {
         "scenario": scenario,
         "steps": processed_steps,
-        "embedding": get_embedding(scenario),  # Embedding for the entire scenario
-        "description": generate_semantic_description(scenario, summarizer) if summarizer else "No description available"  # Description for the entire scenario
+        "embedding": embeddings[-1:],  # Embedding for the entire scenario
+        "description": descriptions[-1]  # Description for the entire scenario
     }
 
 def get_embedding(text):
     """
     Generate embeddings for a given text using the E5 model.
     """
-    inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True)
-    with torch.no_grad():
-        outputs = model(**inputs)
-    return outputs.last_hidden_state.mean(dim=1)  # Average pooling
+    return embedding_service.encode_one(text)
 
-def generate_semantic_description(text, summarizer):
-    """
-    Generate a semantic description of a BDD scenario or step using a summarization model.
-    """
-    if summarizer:
-        input_length = len(text.split())
-        max_length = min(50, input_length)
-        min_length = min(25, max_length // 2)
-        description = summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)[0]['summary_text']
-        return description
-    else:
-        return "No description available"
\ No newline at end of file
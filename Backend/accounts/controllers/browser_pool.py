@@ -0,0 +1,261 @@
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPoolExhausted(TimeoutError):
+    """Raised when no browser worker became free within the lease timeout."""
+
+
+def chrome_factory(headless=True):
+    """
+    Start a Chrome WebDriver tuned for server use.
+    """
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1366,900")
+    return webdriver.Chrome(options=options)
+
+
+class BrowserWorker:
+    """A pooled WebDriver and its usage statistics."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+
+    def is_healthy(self):
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def reset(self):
+        """
+        Bring the session back to a blank state: extra windows closed, cookies, storage and
+        cache cleared, about:blank loaded. Uses the Chrome DevTools protocol when available;
+        DevTools clears storage per origin, so every origin in the windows' history is cleared.
+        """
+        driver = self.driver
+        cdp = hasattr(driver, "execute_cdp_cmd")
+        origins = set()
+        handles = driver.window_handles
+        for handle in reversed(handles):
+            driver.switch_to.window(handle)
+            if cdp:
+                origins.update(self._visited_origins())
+            if handle != handles[0]:
+                driver.close()
+        driver.switch_to.window(handles[0])
+        if cdp:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            for origin in sorted(origins):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        else:
+            # Only the current origin can be cleared without DevTools
+            driver.delete_all_cookies()
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        driver.get("about:blank")
+        if cdp:
+            # The next lease starts with an empty history, so it only clears what it visits
+            driver.execute_cdp_cmd("Page.resetNavigationHistory", {})
+
+    def _visited_origins(self):
+        """Web origins in the navigation history of the current window."""
+        history = self.driver.execute_cdp_cmd("Page.getNavigationHistory", {}) or {}
+        origins = set()
+        for entry in history.get("entries", []):
+            url = urlsplit(entry.get("url", ""))
+            if url.scheme in ("http", "https") and url.netloc:
+                origins.add(f"{url.scheme}://{url.netloc}")
+        return origins
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error while quitting browser: {e}")
+
+
+class BrowserPool:
+    """
+    Fixed-size pool of pre-warmed browser workers shared by the test executions of this process.
+
+    acquire() hands out an idle worker, starting a new one while the pool is below its size,
+    or waits for a release. Workers are health-checked on checkout and reset on release
+    (cookies/storage cleared instead of a process restart); unhealthy workers, workers that
+    fail to reset and workers past max_uses are replaced.
+    """
+
+    def __init__(self, size=2, factory=None, lease_timeout=300, max_uses=50):
+        self.size = max(1, size)
+        self.factory = factory or chrome_factory
+        self.lease_timeout = lease_timeout
+        self.max_uses = max_uses
+        self._idle = []
+        self._total = 0  # Idle + leased + being started
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def warm_up(self, count=None):
+        """
+        Start workers ahead of the first lease (count defaults to the pool size).
+        """
+        count = self.size if count is None else min(count, self.size)
+        started = []
+        for _ in range(count):
+            with self._condition:
+                if self._total >= self.size:
+                    break
+                self._total += 1
+            try:
+                started.append(BrowserWorker(self.factory()))
+            except Exception:
+                with self._condition:
+                    self._total -= 1
+                raise
+        with self._condition:
+            self._idle.extend(started)
+            self._condition.notify_all()
+        logger.info(f"Browser pool warmed up with {len(started)} workers")
+
+    def acquire(self, timeout=None):
+        timeout = self.lease_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            worker = None
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Browser pool is closed")
+                    if self._idle:
+                        worker = self._idle.pop()
+                        break
+                    if self._total < self.size:
+                        self._total += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolExhausted(f"No browser available within {timeout}s")
+                    self._condition.wait(remaining)
+
+            if worker is None:
+                try:
+                    worker = BrowserWorker(self.factory())
+                except Exception:
+                    self._discard(None)
+                    raise
+            elif not worker.is_healthy():
+                logger.warning("Discarding unhealthy browser worker")
+                self._discard(worker)
+                continue
+            worker.uses += 1
+            return worker
+
+    def release(self, worker):
+        if worker is None:
+            return
+        if self._closed or worker.uses >= self.max_uses:
+            self._discard(worker)
+            return
+        try:
+            worker.reset()
+        except Exception as e:
+            logger.warning(f"Browser reset failed, discarding worker: {e}")
+            self._discard(worker)
+            return
+        with self._condition:
+            self._idle.append(worker)
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout=None):
+        worker = self.acquire(timeout)
+        try:
+            yield worker.driver
+        finally:
+            self.release(worker)
+
+    def _discard(self, worker):
+        if worker is not None:
+            worker.quit()
+        with self._condition:
+            self._total -= 1
+            self._condition.notify()
+
+    def stats(self):
+        with self._condition:
+            return {"size": self.size, "started": self._total, "idle": len(self._idle)}
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._condition.notify_all()
+        for worker in idle:
+            worker.quit()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _pool_settings():
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return getattr(settings, "BROWSER_POOL", {})
+    except ImportError:
+        pass
+    return {}
+
+
+def get_browser_pool():
+    """
+    Return the process-wide browser pool configured from settings.BROWSER_POOL.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            config = _pool_settings()
+            headless = config.get("HEADLESS", True)
+            _pool = BrowserPool(
+                size=config.get("SIZE", 2),
+                factory=lambda: chrome_factory(headless=headless),
+                lease_timeout=config.get("LEASE_TIMEOUT_SECONDS", 300),
+                max_uses=config.get("MAX_USES", 50)
+            )
+            atexit.register(_pool.close)
+        return _pool
+
+
+def warm_up_from_settings():
+    """
+    Start settings.BROWSER_POOL['PREWARM'] browsers in a background thread. Called once at server start (wsgi/asgi).
+    """
+    count = _pool_settings().get("PREWARM", 0)
+    if not count:
+        return None
+
+    def warm_up():
+        try:
+            get_browser_pool().warm_up(count)
+        except Exception as e:
+            logger.error(f"Browser pool warm-up failed: {e}")
+
+    thread = threading.Thread(target=warm_up, name="browser-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,106 @@
+import hashlib
+
+import numpy as np
+import torch
+from django.db import transaction
+
+from ..models import CatalogPage, CatalogElement
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _to_bytes(embedding):
+    if isinstance(embedding, torch.Tensor):
+        embedding = embedding.detach().cpu().numpy()
+    return np.asarray(embedding, dtype=np.float32).reshape(-1).tobytes()
+
+
+def _to_tensor(blob):
+    return torch.from_numpy(np.frombuffer(bytes(blob), dtype=np.float32).copy())[None, :]
+
+
+class ElementCatalog:
+    """
+    Persistent per-project catalog of page elements with their attributes, descriptions
+    and embeddings, so unchanged pages are neither re-parsed nor re-embedded.
+    Pages are upserted by URL: a changed body (content hash) replaces the page's elements.
+    """
+
+    def __init__(self, project, embedding_model):
+        self.project = project
+        self.embedding_model = embedding_model
+
+    def get_page(self, url, page_hash, summarized=True):
+        """
+        Return the processed page (same shape as a process_html page) if the catalog holds
+        this exact body embedded with the current model, else None.
+        """
+        page = CatalogPage.objects.filter(
+            project=self.project,
+            url=url,
+            content_hash=page_hash,
+            embedding_model=self.embedding_model,
+            summarized=summarized
+        ).first()
+        if page is None:
+            return None
+        elements = page.elements.order_by('position').values_list('content', 'attributes', 'description', 'embedding')
+        return {
+            "elements": [
+                {
+                    "content": content,
+                    "attributes": attributes,
+                    "embedding": _to_tensor(embedding),
+                    "description": description
+                }
+                for content, attributes, description, embedding in elements
+            ],
+            "embedding": _to_tensor(page.embedding),
+            "description": page.description
+        }
+
+    @transaction.atomic
+    def upsert_page(self, url, page_hash, page, summarized=True):
+        """
+        Insert or replace a processed page and its elements.
+        """
+        catalog_page, created = CatalogPage.objects.update_or_create(
+            project=self.project,
+            url=url,
+            defaults={
+                "content_hash": page_hash,
+                "embedding_model": self.embedding_model,
+                "summarized": summarized,
+                "embedding": _to_bytes(page["embedding"]),
+                "description": page.get("description") or ""
+            }
+        )
+        if not created:
+            catalog_page.elements.all().delete()
+        CatalogElement.objects.bulk_create([
+            CatalogElement(
+                page=catalog_page,
+                position=position,
+                role=element["attributes"].get("role") or "",
+                content=element["content"],
+                attributes=element["attributes"],
+                description=element.get("description") or "",
+                embedding=_to_bytes(element["embedding"])
+            )
+            for position, element in enumerate(page["elements"])
+        ], batch_size=500)
+        return catalog_page
+
+    def remove_page(self, url):
+        CatalogPage.objects.filter(project=self.project, url=url).delete()
+
+
+def get_element_catalog(project):
+    """
+    Catalog of a project for the shared E5 embedding service.
+    """
+    from .shared import embedding_service
+
+    return ElementCatalog(project, f"{embedding_service.model_name}@{embedding_service.revision}")
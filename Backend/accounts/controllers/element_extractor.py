@@ -0,0 +1,163 @@
+import threading
+
+from lxml import etree, html as lxml_html
+from lxml.etree import ParserError
+
+# Interactive HTML elements extracted from each page
+INTERACTIVE_ELEMENTS = [
+    "input",  # Includes text, password, checkbox, radio, etc.
+    "select",  # Dropdowns
+    "button",  # Buttons
+    "textarea",  # Multi-line text input
+    "a",  # Links (if they are interactive)
+    "label",  # Labels (if they are associated with inputs)
+    "option",  # Options within a select element
+    "datalist",  # Data list for input suggestions
+    "fieldset",  # Grouping related elements
+    "legend",  # Caption for fieldset
+    "output",  # Output of a calculation
+    "progress",  # Progress bar
+    "meter",  # Scalar measurement
+]
+
+# Number of preceding sibling tag names kept as context for each element (nearest first)
+SIBLING_CONTEXT = 10
+
+
+_parsers = threading.local()
+
+
+def _parser():
+    # lxml parsers must not be shared between threads; huge_tree lifts libxml2's default
+    # nesting limit (256) so deeply nested pages keep their innermost elements
+    if not hasattr(_parsers, "parser"):
+        _parsers.parser = lxml_html.HTMLParser(huge_tree=True)
+    return _parsers.parser
+
+
+def parse_html(page_html):
+    """
+    Parse a page with lxml's HTML parser. Returns None for an empty document.
+    """
+    try:
+        return lxml_html.document_fromstring(page_html, parser=_parser())
+    except ValueError:
+        # Unicode input with an XML encoding declaration must be parsed from bytes
+        return lxml_html.document_fromstring(page_html.encode("utf-8"), parser=_parser())
+    except ParserError:
+        return None
+
+
+def css_selector(tag, attributes):
+    """
+    CSS selector of an element: tag#id, else tag.class1.class2, else the tag name.
+    """
+    selector = tag
+    if attributes.get("id"):
+        selector += f"#{attributes['id']}"
+    elif attributes.get("class"):
+        selector += "." + ".".join(attributes["class"])
+    return selector
+
+
+def extract_page(page_html, tags=INTERACTIVE_ELEMENTS):
+    """
+    Parse a page once and return (interactive elements, visible page text).
+    """
+    root = parse_html(page_html)
+    if root is None:
+        return [], ""
+    return extract_elements(root, tags), page_text(root)
+
+
+def page_text(root):
+    """
+    Text content of a page, leaving out <script> and <style> bodies.
+    """
+    return "".join(root.xpath("//text()[not(ancestor::script) and not(ancestor::style)]"))
+
+
+def extract_elements(root, tags=INTERACTIVE_ELEMENTS):
+    """
+    Extract the interactive elements of a parsed page, in document order, in a single walk of the tree.
+
+    Each parent keeps a running count of its children per tag name, so the XPath index of
+    every element is known when it is visited and its XPath is its parent's XPath plus one
+    step; the preceding siblings are the tail of the parent's child list seen so far and
+    the enclosing <select> of an option is carried down the walk. Nothing walks back up
+    the tree or rescans siblings, so the cost is linear in the size of the document.
+
+    Returns a list of {"content", "attributes"} dicts with the attributes used by the mapping
+    stage (role, id, name, type, value, class, text, placeholder, parent, siblings, option
+    details, xpath_absolute, xpath_relative, css_selector).
+    """
+    wanted = set(tags)
+    elements = []
+
+    # Stack entries: (element, xpath, parent tag, preceding sibling tags, enclosing select)
+    stack = [(root, f"/{root.tag}[1]", None, [], None)]
+    while stack:
+        element, xpath, parent_tag, siblings, parent_select = stack.pop()
+        tag = element.tag
+
+        if tag in wanted:
+            elements.append(_element_record(element, tag, xpath, parent_tag, siblings, parent_select))
+
+        # Index the children: per-tag positions and the sibling context seen before each child
+        child_select = element if tag == "select" else parent_select
+        counts = {}
+        seen = []
+        children = []
+        for child in element:
+            if not isinstance(child.tag, str):
+                continue  # Comments and processing instructions
+            counts[child.tag] = counts.get(child.tag, 0) + 1
+            children.append((
+                child,
+                f"{xpath}/{child.tag}[{counts[child.tag]}]",
+                tag,
+                seen[-1:-SIBLING_CONTEXT - 1:-1],
+                child_select
+            ))
+            seen.append(child.tag)
+        # Reverse so the first child is visited next (document order)
+        stack.extend(reversed(children))
+
+    return elements
+
+
+def _element_record(element, tag, xpath, parent_tag, siblings, parent_select):
+    class_value = element.get("class")
+    attributes = {
+        "role": tag,
+        "id": element.get("id"),
+        "name": element.get("name"),
+        "type": element.get("type"),
+        "value": element.get("value"),
+        "class": class_value.split() if class_value is not None else None,
+        "text": element.text_content().strip(),
+        "placeholder": element.get("placeholder", ""),
+        "parent": parent_tag,
+        "siblings": siblings
+    }
+
+    if tag == "option" and parent_select is not None:
+        attributes.update({
+            "parent_select_id": parent_select.get("id"),
+            "parent_select_name": parent_select.get("name"),
+            "option_value": element.get("value"),
+            "option_text": attributes["text"]
+        })
+
+    attributes["xpath_absolute"] = xpath
+    attributes["xpath_relative"] = "." + xpath
+    attributes["css_selector"] = (
+        f"select#{parent_select.get('id')} option[value='{element.get('value')}']"
+        if (tag == "option" and parent_select is not None)
+        else css_selector(tag, attributes)
+    )
+
+    return {
+        "content": etree.tostring(element, method="html", encoding="unicode", with_tail=False),
+        "attributes": attributes
+    }
@@ -0,0 +1,434 @@
+import os
+import json
+import hashlib
+import logging
+import shutil
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+import torch
+from filelock import FileLock
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'embeddings')
+DEFAULT_MAX_ENTRIES = 200_000
+INITIAL_CAPACITY = 1024
+# The journal is folded into the index snapshot once it holds this many records per indexed entry
+COMPACT_RATIO = 2
+
+
+def normalize_text(text):
+    """
+    Normalize a text before hashing so insignificant differences (unicode form,
+    runs of whitespace) map to the same cache entry.
+    """
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+def text_key(text):
+    """
+    Content address of a text inside a model namespace.
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def model_revision(model_name_or_path, model=None):
+    """
+    Resolve the revision of a model.
+    Local (fine-tuned) models are identified by their fine-tuning metadata, falling back to
+    the newest file modification time, so saving a new fine-tuned version changes the revision.
+    Hub models use the commit hash recorded in their config when available.
+    """
+    if model_name_or_path and os.path.isdir(model_name_or_path):
+        metadata_path = os.path.join(model_name_or_path, "fine_tune_metadata.json")
+        if os.path.exists(metadata_path):
+            try:
+                with open(metadata_path) as f:
+                    metadata = json.load(f)
+                if metadata.get("fine_tuned_date"):
+                    return metadata["fine_tuned_date"]
+            except (OSError, ValueError):
+                pass
+        latest = 0.0
+        for root, _, files in os.walk(model_name_or_path):
+            for name in files:
+                latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+        return f"mtime-{latest:.0f}"
+
+    config = getattr(model, "config", None)
+    commit_hash = getattr(config, "_commit_hash", None)
+    return commit_hash or "main"
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed embedding cache for one model.
+    Vectors are stored as float16 rows of a memory-mapped file, and an LRU index maps
+    normalized-text hashes to rows. The index is bounded by max_entries; the least recently
+    used rows are reused once the cap is reached. The whole namespace is dropped when the
+    model revision changes.
+
+    The index is persisted as a snapshot (index.json) plus an append-only journal (index.log)
+    of stores, evictions and lookup hits, so a store or lookup writes only its own records.
+    The journal is folded into a new snapshot once it outgrows the index, which keeps the
+    cost of persisting each record constant. Other processes replay the journal from where
+    they last read it.
+    """
+
+    def __init__(self, model_name, revision, dim, cache_dir=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.model_name = model_name
+        self.revision = str(revision)
+        self.dim = int(dim)
+        self.max_entries = max(1, int(max_entries))
+        namespace = hashlib.sha256(str(model_name).encode("utf-8")).hexdigest()[:16]
+        self.directory = os.path.join(cache_dir or DEFAULT_CACHE_DIR, namespace)
+        self.meta_path = os.path.join(self.directory, "meta.json")
+        self.index_path = os.path.join(self.directory, "index.json")
+        self.log_path = os.path.join(self.directory, "index.log")
+        self.vectors_path = os.path.join(self.directory, "vectors.f16")
+        self.file_lock = FileLock(os.path.join(os.path.dirname(self.directory), f"{namespace}.lock"))
+        self.lock = threading.RLock()
+
+        self.index = OrderedDict()
+        self.free_slots = []
+        self.capacity = 0
+        self.vectors = None
+        self.stamp = None
+        self.log_offset = 0
+        self.log_records = 0
+        self.stale = False
+
+        os.makedirs(os.path.dirname(self.directory), exist_ok=True)
+        with self.file_lock:
+            self._open()
+
+    def lookup(self, texts):
+        """
+        Return a list with the cached vector (float32 numpy array) of each text, or None on a miss.
+        """
+        with self.lock, self.file_lock:
+            self._reload_if_changed()
+            if self.stale:
+                return [None] * len(texts)
+            results = []
+            touched = []
+            for text in texts:
+                key = text_key(text)
+                slot = self.index.get(key)
+                if slot is None:
+                    results.append(None)
+                    continue
+                self.index.move_to_end(key)
+                touched.append(f"t {key}")
+                results.append(np.asarray(self.vectors[slot], dtype=np.float32))
+            # Hits move entries in the LRU order other processes evict by
+            self._append_log(touched)
+            return results
+
+    def store(self, texts, vectors):
+        """
+        Store vectors for texts and return them as they will be read back (float16 precision),
+        so cached and freshly computed embeddings compare identically.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+        rounded = vectors.astype(np.float16)
+        with self.lock, self.file_lock:
+            self._reload_if_changed()
+            if self.stale:
+                return rounded.astype(np.float32)
+            records = []
+            for text, vector in zip(texts, rounded):
+                key = text_key(text)
+                slot = self.index.get(key)
+                if slot is None:
+                    slot = self._allocate_slot(records)
+                self.index[key] = slot
+                self.index.move_to_end(key)
+                self.vectors[slot] = vector
+                records.append(f"+ {key} {slot}")
+            self.vectors.flush()
+            self._append_log(records)
+        return rounded.astype(np.float32)
+
+    def clear(self):
+        """
+        Drop every cached vector of this model.
+        """
+        with self.lock, self.file_lock:
+            self._reset()
+
+    def __len__(self):
+        return len(self.index)
+
+    def _open(self, reset_on_mismatch=True):
+        meta = None
+        if os.path.exists(self.meta_path):
+            try:
+                with open(self.meta_path) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = None
+
+        if (
+            not meta
+            or meta.get("revision") != self.revision
+            or meta.get("dim") != self.dim
+            or not os.path.exists(self.vectors_path)
+        ):
+            if meta and not reset_on_mismatch and meta.get("revision") != self.revision:
+                # Another process already moved the namespace to a different model revision;
+                # stop reading and writing instead of wiping its entries.
+                self.stale = True
+                return
+            if meta:
+                logger.info(f"Invalidating embedding cache for {self.model_name} (revision {meta.get('revision')} -> {self.revision})")
+            self._reset()
+            return
+
+        self.stale = False
+        self.capacity = meta["capacity"]
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float16, mode="r+", shape=(self.capacity, self.dim))
+        self._read_index()
+        self.stamp = self._stamp()
+
+    def _reset(self):
+        if os.path.exists(self.directory):
+            shutil.rmtree(self.directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.index = OrderedDict()
+        self.free_slots = []
+        self.capacity = 0
+        self.vectors = None
+        self.stale = False
+        self._grow(min(INITIAL_CAPACITY, self.max_entries))
+        self._write_index()
+        self.stamp = self._stamp()
+
+    def _grow(self, capacity):
+        capacity = min(max(capacity, 1), self.max_entries)
+        if self.vectors is not None:
+            self.vectors.flush()
+            del self.vectors
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim * np.dtype(np.float16).itemsize)
+        self.free_slots.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float16, mode="r+", shape=(self.capacity, self.dim))
+        with open(self.meta_path, "w") as f:
+            json.dump({
+                "model": self.model_name,
+                "revision": self.revision,
+                "dim": self.dim,
+                "capacity": self.capacity
+            }, f)
+
+    def _allocate_slot(self, records):
+        if not self.free_slots and self.capacity < self.max_entries:
+            self._grow(self.capacity * 2)
+        if self.free_slots:
+            return self.free_slots.pop()
+        # Cache is full: reuse the least recently used row
+        key, slot = self.index.popitem(last=False)
+        records.append(f"- {key}")
+        return slot
+
+    def _read_index(self):
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            self.index = OrderedDict((key, slot) for key, slot in data.get("entries", []))
+        except (OSError, ValueError):
+            self.index = OrderedDict()
+        self.log_offset = 0
+        self.log_records = 0
+        self._replay_log()
+        self._rebuild_free_slots()
+
+    def _rebuild_free_slots(self):
+        used = set(self.index.values())
+        self.free_slots = [slot for slot in range(self.capacity - 1, -1, -1) if slot not in used]
+
+    def _replay_log(self):
+        """
+        Apply the journal records written since log_offset; returns whether any row was stored.
+        """
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self.log_offset)
+                data = f.read()
+        except OSError:
+            return False
+        # A record cut short by a crashed writer is skipped, later records still apply
+        end = data.rfind(b"\n") + 1
+        stored = False
+        for line in data[:end].decode("utf-8", "replace").splitlines():
+            parts = line.split()
+            if len(parts) == 3 and parts[0] == "+" and parts[2].isdigit() and int(parts[2]) < self.capacity:
+                self.index[parts[1]] = int(parts[2])
+                self.index.move_to_end(parts[1])
+                stored = True
+            elif len(parts) == 2 and parts[0] == "-":
+                self.index.pop(parts[1], None)
+            elif len(parts) == 2 and parts[0] == "t" and parts[1] in self.index:
+                self.index.move_to_end(parts[1])
+            else:
+                continue
+            self.log_records += 1
+        self.log_offset += end
+        return stored
+
+    def _append_log(self, records):
+        if not records:
+            return
+        with open(self.log_path, "ab") as f:
+            f.write(("\n".join(records) + "\n").encode("utf-8"))
+            self.log_offset = f.tell()
+        self.log_records += len(records)
+        if self.log_records > COMPACT_RATIO * max(len(self.index), INITIAL_CAPACITY):
+            self._write_index()
+        self.stamp = self._stamp()
+
+    def _write_index(self):
+        # Snapshot first, then empty the journal: a crash in between only replays records already applied
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"entries": list(self.index.items())}, f)
+        os.replace(tmp_path, self.index_path)
+        with open(self.log_path, "wb"):
+            pass
+        self.log_offset = 0
+        self.log_records = 0
+
+    def _stamp(self):
+        # Identity of the snapshot and metadata files: a change means a compaction, a grown file or a reset
+        stamp = []
+        for path in (self.meta_path, self.index_path):
+            try:
+                stat = os.stat(path)
+                stamp.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _reload_if_changed(self):
+        # Another process may have written entries, grown the file or invalidated the namespace
+        if not os.path.exists(self.meta_path):
+            self._open()
+            return
+        if self._stamp() != self.stamp:
+            self._open(reset_on_mismatch=False)
+            return
+        try:
+            size = os.stat(self.log_path).st_size
+        except OSError:
+            size = 0
+        if size < self.log_offset:
+            self._open(reset_on_mismatch=False)
+        elif size > self.log_offset and self._replay_log():
+            self._rebuild_free_slots()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _cache_settings():
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return getattr(settings, "EMBEDDING_CACHE", {})
+    except ImportError:
+        pass
+    return {}
+
+
+def get_embedding_cache(model_name, revision, dim):
+    """
+    Return the shared cache of a model in this process, reopening it when the revision changed.
+    Returns None when caching is disabled in settings.
+    """
+    config = _cache_settings()
+    if not config.get("ENABLED", True):
+        return None
+    with _caches_lock:
+        cache = _caches.get(model_name)
+        if cache is None or cache.revision != str(revision) or cache.dim != int(dim):
+            cache = EmbeddingCache(
+                model_name,
+                revision,
+                dim,
+                cache_dir=config.get("DIR", DEFAULT_CACHE_DIR),
+                max_entries=config.get("MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+            )
+            _caches[model_name] = cache
+        return cache
+
+
+def invalidate_embedding_cache(model_name):
+    """
+    Drop the cached vectors of a model, e.g. after it has been fine-tuned.
+    """
+    with _caches_lock:
+        cache = _caches.pop(model_name, None)
+    if cache is not None:
+        cache.clear()
+        return
+    config = _cache_settings()
+    namespace = hashlib.sha256(str(model_name).encode("utf-8")).hexdigest()[:16]
+    directory = os.path.join(config.get("DIR", DEFAULT_CACHE_DIR), namespace)
+    if os.path.exists(directory):
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class CachedSentenceEncoder:
+    """
+    Wraps a SentenceTransformer so encode() checks the embedding cache first and only
+    runs the model on cache misses. Any other attribute is delegated to the wrapped model.
+    """
+
+    def __init__(self, model, model_name_or_path, backend=None):
+        from .inference_backend import revision_suffix
+
+        self.model = model
+        self.model_name_or_path = model_name_or_path
+        self.backend = backend
+        # Quantized/ONNX vectors are cached apart from the fp32 ones
+        self.revision = model_revision(model_name_or_path, model) + revision_suffix(backend)
+
+    @property
+    def cache(self):
+        return get_embedding_cache(
+            self.model_name_or_path,
+            self.revision,
+            self.model.get_sentence_embedding_dimension()
+        )
+
+    def encode(self, sentences, convert_to_tensor=False, **kwargs):
+        """
+        Same contract as SentenceTransformer.encode for str or list inputs.
+        """
+        cache = self.cache
+        if cache is None:
+            return self.model.encode(sentences, convert_to_tensor=convert_to_tensor, **kwargs)
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        vectors = cache.lookup(texts)
+        misses = [index for index, vector in enumerate(vectors) if vector is None]
+        if misses:
+            kwargs.pop("convert_to_numpy", None)
+            fresh = self.model.encode([texts[index] for index in misses], convert_to_numpy=True, **kwargs)
+            stored = cache.store([texts[index] for index in misses], fresh)
+            for index, vector in zip(misses, stored):
+                vectors[index] = vector
+
+        result = np.stack(vectors) if vectors else np.empty((0, cache.dim), dtype=np.float32)
+        if single:
+            result = result[0]
+        return torch.from_numpy(result) if convert_to_tensor else result
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
@@ -0,0 +1,94 @@
+import torch
+from .embedding_cache import get_embedding_cache, model_revision
+from .inference_backend import FP32, revision_suffix
+
+
+class EmbeddingService:
+    """
+    Shared embedding service for the E5 mapping pipeline.
+    Takes a list of texts, groups them into length buckets so each forward pass
+    pads as little as possible, and returns a single (len(texts), hidden_size) tensor
+    in the same order as the input.
+    When a model name is given, texts already present in the persistent embedding
+    cache are not re-embedded. The inference backend (fp32/int8/onnx) is part of the
+    cache revision, since quantized models produce slightly different vectors.
+    """
+
+    def __init__(self, tokenizer, model, batch_size=32, max_length=512, model_name=None, backend=FP32):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.model_name = model_name
+        self.backend = backend
+        self.revision = model_revision(model_name, model) + revision_suffix(backend) if model_name else None
+
+    @property
+    def cache(self):
+        if not self.model_name:
+            return None
+        return get_embedding_cache(self.model_name, self.revision, self.model.config.hidden_size)
+
+    def encode(self, texts, batch_size=None):
+        """
+        Generate embeddings for a list of texts using the E5 model.
+        Texts are sorted by token length, batched, mean pooled over the attention
+        mask and scattered back to their original positions.
+        """
+        texts = [text if isinstance(text, str) else str(text) for text in texts]
+        cache = self.cache
+        if cache is None:
+            return self._encode(texts, batch_size)
+
+        vectors = cache.lookup(texts)
+        misses = [index for index, vector in enumerate(vectors) if vector is None]
+        if misses:
+            fresh = self._encode([texts[index] for index in misses], batch_size)
+            stored = cache.store([texts[index] for index in misses], fresh.numpy())
+            for index, vector in zip(misses, stored):
+                vectors[index] = vector
+        if not vectors:
+            return torch.empty((0, self.model.config.hidden_size))
+        return torch.stack([torch.from_numpy(vector) for vector in vectors])
+
+    def _encode(self, texts, batch_size=None):
+        batch_size = batch_size or self.batch_size
+        hidden_size = self.model.config.hidden_size
+        if not texts:
+            return torch.empty((0, hidden_size))
+
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        input_ids = encoded["input_ids"]
+
+        # Length bucketing: neighbouring texts in a batch have similar lengths
+        order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+        embeddings = torch.empty((len(texts), hidden_size))
+
+        if hasattr(self.model, "eval"):
+            self.model.eval()  # ONNX Runtime models have no train/eval modes
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            features = [{key: encoded[key][i] for key in encoded.keys()} for i in batch_indices]
+            batch = self.tokenizer.pad(features, padding=True, return_tensors="pt")
+            with torch.no_grad():
+                outputs = self.model(**batch)
+            embeddings[batch_indices] = self._mean_pool(outputs.last_hidden_state, batch["attention_mask"])
+
+        return embeddings
+
+    def encode_one(self, text):
+        """
+        Generate the embedding of a single text, shaped (1, hidden_size).
+        """
+        return self.encode([text])
+
+    @staticmethod
+    def _mean_pool(last_hidden_state, attention_mask):
+        """
+        Average pooling that ignores padding tokens, so a padded text gets the
+        same embedding it would get when encoded on its own.
+        """
+        mask = attention_mask.unsqueeze(-1).to(last_hidden_state.dtype)
+        summed = (last_hidden_state * mask).sum(dim=1)
+        counts = mask.sum(dim=1).clamp(min=1e-9)
+        return summed / counts
@@ -0,0 +1,62 @@
+import numpy as np
+from rapidfuzz.distance import Indel, Levenshtein
+
+
+def partial_ratio(s1, s2):
+    """
+    fuzzywuzzy's fuzz.partial_ratio (with python-Levenshtein), score for score, built on
+    rapidfuzz's C edit operations. Like fuzzywuzzy it only tries the windows of the longer
+    string that line up with a matching block of the shorter one, so it can score lower than
+    rapidfuzz's fuzz.partial_ratio, which searches for the optimal alignment.
+    """
+    if s1 is None or s2 is None:
+        return 0
+    if s1 == s2:
+        return 100
+    if not s1 or not s2:
+        return 0
+
+    shorter, longer = (s1, s2) if len(s1) <= len(s2) else (s2, s1)
+    best = 0.0
+    for block in Levenshtein.opcodes(shorter, longer).as_matching_blocks():
+        long_start = max(block.b - block.a, 0)
+        ratio = Indel.normalized_similarity(shorter, longer[long_start:long_start + len(shorter)])
+        if ratio > .995:
+            return 100
+        best = max(best, ratio)
+    return int(round(100 * best))
+
+
+def attribute_column(elements, attribute):
+    """
+    Lower-cased values of one attribute for every element ("" when missing).
+    """
+    return [(element.get("attributes", {}).get(attribute, "") or "").lower() for element in elements]
+
+
+def attribute_scores(steps, elements, attributes, candidates=None):
+    """
+    Sum of the partial_ratio scores of every step against each attribute of the elements.
+
+    Without candidates the result is a (len(steps), len(elements)) matrix. With candidates,
+    an (len(steps), k) array of element positions, only those pairs are scored and the
+    result has the shape of candidates. Each distinct (step, value) pair is scored once:
+    attribute values repeat a lot ("", "text", "submit", ...).
+    """
+    queries = [step.lower() for step in steps]
+    if candidates is None:
+        candidates = np.broadcast_to(np.arange(len(elements)), (len(steps), len(elements)))
+    candidates = np.asarray(candidates, dtype=np.int64).reshape(len(steps), -1)
+
+    scores = np.zeros(candidates.shape)
+    for attribute in attributes:
+        column = attribute_column(elements, attribute)
+        for row, query in enumerate(queries):
+            seen = {}
+            for position, element_index in enumerate(candidates[row]):
+                value = column[element_index]
+                score = seen.get(value)
+                if score is None:
+                    score = seen[value] = partial_ratio(query, value)
+                scores[row, position] += score
+    return scores
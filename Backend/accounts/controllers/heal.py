@@ -13,32 +13,18 @@ import numpy as np
 from concurrent.futures import ThreadPoolExecutor
 from sentence_transformers import SentenceTransformer, util
 from symspellpy import SymSpell
+from .shared import get_sentence_model
+from .browser_pool import get_browser_pool
+from .self_healing_framework.dom_snapshot import DomSnapshot, resolve_element
+from .self_healing_framework.candidate_ranker import CandidateRanker
+from .self_healing_framework.locator_resolver import LocatorResolver
+from .self_healing_framework.readiness import ReadinessWaiter
+from .self_healing_framework.locator_cache import LocatorCache
+from .self_healing_framework.rl_healing_agent import RLHealingAgent
 import os
 import os
 
 
-class RLHealingAgent:
-    """Reinforcement learning agent for strategy selection."""
-    def __init__(self, strategies):
-        self.strategies = strategies
-        self.q_table = np.zeros((len(strategies), 1))  # Q-table for strategy selection
-        self.learning_rate = 0.1
-        self.discount_factor = 0.9
-        self.epsilon = 0.1  # Exploration rate
-
-    def choose_strategy(self):
-        """Choose a strategy using epsilon-greedy policy."""
-        if np.random.uniform(0, 1) < self.epsilon:
-            return np.random.choice(self.strategies)  # Explore
-        else:
-            return self.strategies[np.argmax(self.q_table)]  # Exploit
-
-    def update_q_table(self, strategy, reward):
-        """Update Q-table based on the reward."""
-        strategy_index = self.strategies.index(strategy)
-        self.q_table[strategy_index] += self.learning_rate * (reward - self.q_table[strategy_index])
-
-
 class ElementLocator:
     """Handles element location strategies."""
     def __init__(self, driver):
@@ -56,8 +42,11 @@ class ElementLocator:
 
 class ElementHealer:
     """Handles element healing using ML and other strategies."""
+    threshold = 0.3  # Minimum cosine similarity for a match
+
     def __init__(self, similarity_model, sym_spell):
         self.similarity_model = similarity_model
+        self.ranker = CandidateRanker(similarity_model)
         self.sym_spell = sym_spell
         self.logger = logging.getLogger(__name__)
         self.logger.info(f"ElementHealer initialized with model: {type(similarity_model).__name__}")
@@ -72,31 +61,21 @@ class ElementHealer:
         self.logger.warning("No suitable match found for healing")
         return None
 
-    def _find_best_match(self, original_attributes, page_elements):
-        """Find the most similar element on the page using ML."""
-        best_match = None
-        best_score = 0
-        threshold = 0.3
-
+    def find_top_matches(self, original_attributes, page_elements, k=5):
+        """Rank the page elements against the broken element; top-k matches above the threshold, best first."""
         original_text = self._attributes_to_text(original_attributes)
         self.logger.debug(f"Original element text representation: {original_text}")
-        
+
+        candidate_texts = [self._attributes_to_text(element_data['attributes']) for element_data in page_elements]
+        ranked = self.ranker.rank(original_text, candidate_texts, k=k, threshold=self.threshold)
+        # Add the score to the match data for logging
+        return [{**page_elements[index], 'score': score} for index, score in ranked]
+
+    def _find_best_match(self, original_attributes, page_elements):
+        """Find the most similar element on the page using ML."""
         try:
-            original_embedding = self.similarity_model.encode(original_text, convert_to_tensor=True)
-            
-            for element_data in page_elements:
-                current_text = self._attributes_to_text(element_data['attributes'])
-                current_embedding = self.similarity_model.encode(current_text, convert_to_tensor=True)
-                
-                similarity = util.pytorch_cos_sim(original_embedding, current_embedding).item()
-                
-                if similarity > best_score and similarity > threshold:
-                    best_score = similarity
-                    best_match = element_data
-                    # Add the score to the match data for logging
-                    best_match['score'] = similarity
-            
-            return best_match
+            matches = self.find_top_matches(original_attributes, page_elements, k=1)
+            return matches[0] if matches else None
         except Exception as e:
             self.logger.error(f"Error during similarity calculation: {str(e)}")
             return None
@@ -111,8 +90,9 @@ class ElementHealer:
 
 class MappingLoader:
     """Handles loading and processing BDD step mappings."""
-    def __init__(self, mapping):
+    def __init__(self, mapping, locator_memory=None):
         self.mapping = mapping
+        self.locator_memory = locator_memory
 
     def load_mappings(self):
         """Load BDD step to element ID mappings from CSV."""
@@ -132,6 +112,9 @@ class MappingLoader:
                 'Page': link,
                 'locator_strategies': self._generate_locator_strategies(element_id, css, xpath, full_xpath)
             }
+            if self.locator_memory is not None:
+                # Start from the remembered heal instead of rediscovering it
+                self.locator_memory.apply(mappings[bdd_step])
         return mappings
 
     def _generate_locator_strategies(self, element_id, css, xpath, full_xpath):
@@ -174,9 +157,14 @@ class ActionExecutor:
 
 
 class SelfHealingFramework:
-    def __init__(self, mapping: str):
+    def __init__(self, mapping: str, locator_mode: str = "race", locator_memory=None, rl_agent=None):
         self.driver = None
-        self.mapping_loader = MappingLoader(mapping)
+        self.browser_worker = None
+        # "race": all strategies in one in-page script per poll tick; "parallel": one WebDriverWait per strategy
+        self.locator_mode = locator_mode
+        # Per-project healed locators (controllers/locator_memory.py), consulted before healing
+        self.locator_memory = locator_memory
+        self.mapping_loader = MappingLoader(mapping, locator_memory)
         self.mappings = self.mapping_loader.load_mappings()
         self.scenario_count = 0  
         self.healing_history = {}
@@ -192,42 +180,55 @@ class SelfHealingFramework:
         try:
             if os.path.exists(model_dir):
                 self.logger.info(f"Loading fine-tuned model from {model_dir}")
-                self.similarity_model = SentenceTransformer(model_dir)
+                model_path = model_dir
             elif os.path.exists(fallback_model_path):
                 self.logger.info(f"Loading fine-tuned model from fallback path {fallback_model_path}")
-                self.similarity_model = SentenceTransformer(fallback_model_path)
+                model_path = fallback_model_path
             else:
                 self.logger.warning("Fine-tuned model not found, using default model")
-                self.similarity_model = SentenceTransformer('all-MiniLM-L6-v2')
+                model_path = 'all-MiniLM-L6-v2'
+            # Shared instance from the model registry, wrapped with the persistent embedding cache
+            self.similarity_model = get_sentence_model(model_path)
         except Exception as e:
             self.logger.error(f"Error loading fine-tuned model: {str(e)}. Using default model.")
-            self.similarity_model = SentenceTransformer('all-MiniLM-L6-v2')
+            model_path = 'all-MiniLM-L6-v2'
+            self.similarity_model = get_sentence_model(model_path)
         
         # Initialize other components
-        self.rl_agent = RLHealingAgent(['id', 'CSS Selector', 'XPath (Absolute)', 'xpath_contains'])
-        self.element_cache = {}
+        # Orders locator strategies; pass a project's agent (controllers/strategy_stats.py) to reuse its statistics
+        self.rl_agent = rl_agent if rl_agent is not None else RLHealingAgent(['id', 'CSS Selector', 'XPath (Absolute)'])
+        # Entries are per project: projects may share step texts and URLs
+        self.locator_cache = LocatorCache(self.driver, locator_memory.project.pk if locator_memory is not None else None)
         self.sym_spell = SymSpell()
         self.retry_attempts = 1
         self.element_locator = ElementLocator(self.driver)
+        self.locator_resolver = LocatorResolver(self.driver)
+        self.readiness = ReadinessWaiter(self.driver)
         self.element_healer = ElementHealer(self.similarity_model, self.sym_spell)
         self.action_executor = ActionExecutor(self.driver)
         self.broken_elements = {}
         self.scenario_count = len(self.mappings)  # Track total number of scenarios
 
-    def execute_all_steps(self, delay=1.5):
-        """Automatically execute all BDD steps from the CSV."""
+    def execute_all_steps(self, max_wait=10.0):
+        """Automatically execute all BDD steps from the CSV, waiting at most max_wait seconds per readiness check."""
         for bdd_step, element_info in self.mappings.items():
+            page_wait = locate = element_wait = 0.0
             current_url = self.driver.current_url
             if current_url != element_info['Page']:
                 self.driver.get(element_info['Page'])
-                time.sleep(delay)
+                page_wait = self.readiness.wait_for_page(max_wait)
             action, value = self._determine_action(bdd_step)
             try:
+                start = time.monotonic()
                 element = self.find_element(bdd_step)
-                time.sleep(delay)
+                locate = time.monotonic() - start
+                if element is not None:
+                    element_wait = self.readiness.wait_for_element(element, action != "verify", max_wait)
                 self.action_executor.execute_action(element, action, value)
             except Exception as e:
                 None
+            finally:
+                self.readiness.record(bdd_step, page_wait=page_wait, locate=locate, element_wait=element_wait)
 
     def _determine_action(self, bdd_step: str) -> tuple:
         """Determine the action and value from the BDD step description."""
@@ -288,9 +289,13 @@ class SelfHealingFramework:
             return False, 0.0, {"error": str(e)}
     
     def start_browser(self):
-        """Initialize the WebDriver."""
-        self.driver = webdriver.Chrome()
+        """Lease a WebDriver from the shared browser pool."""
+        self.browser_worker = get_browser_pool().acquire()
+        self.driver = self.browser_worker.driver
         self.element_locator = ElementLocator(self.driver)
+        self.locator_resolver = LocatorResolver(self.driver)
+        self.locator_cache.driver = self.driver
+        self.readiness = ReadinessWaiter(self.driver)
         self.action_executor = ActionExecutor(self.driver)
         
         # Verify the model is working
@@ -301,12 +306,18 @@ class SelfHealingFramework:
         if bdd_step not in self.mappings:
             return None
 
-        # Check cache first
-        if bdd_step in self.element_cache:
-            return self.element_cache[bdd_step]
-
         element_info = self.mappings[bdd_step]
-        element = None
+
+        # Check the locator cache first: one in-page check re-resolves a known locator
+        page_url = self.driver.current_url
+        element, fingerprint = self.locator_cache.lookup(page_url, bdd_step, element_info)
+        if element is not None:
+            strategy = element_info.get('resolved_strategy')
+            if strategy:
+                # The cached strategy hit without trying the others
+                self.rl_agent.observe(self.rl_agent.context(element_info), [strategy], strategy)
+            self._record_memory_hit(element_info)
+            return element
 
         for attempt in range(self.retry_attempts):
             try:
@@ -318,7 +329,8 @@ class SelfHealingFramework:
 
         if element:
             self._record_successful_find(bdd_step, element_info)
-            self.element_cache[bdd_step] = element  # Add to cache
+            self._record_memory_hit(element_info)
+            self.locator_cache.store(page_url, fingerprint, bdd_step, element_info)
         else:
             self._record_failed_find(bdd_step, element_info)
 
@@ -326,30 +338,75 @@ class SelfHealingFramework:
 
     def _find_with_healing(self, element_info: dict, timeout: int):
         """Find element with multiple strategies and self-healing."""
+        element_info.pop('resolved_strategy', None)
+        # Try the strategies in the order learned for this page and tag type
+        context = self.rl_agent.context(element_info)
+        strategies = self.rl_agent.order(element_info['locator_strategies'], context)
+        if self.locator_mode == "race":
+            result = self.locator_resolver.resolve(strategies, timeout)
+            tried, _ = self.locator_resolver.locators(strategies)
+            self.rl_agent.observe(context, tried, result.strategy if result else None)
+            if result:
+                element_info['resolved_strategy'] = result.strategy
+                return result.element
+            return self._heal_element(element_info)
+
         with ThreadPoolExecutor() as executor:
             futures = {
                 executor.submit(self.element_locator.find_element, strategy, locator, timeout): strategy
-                for strategy, locator in element_info['locator_strategies'].items()
+                for strategy, locator in strategies.items()
             }
 
             for future in futures:
                 element = future.result()
                 if element:
+                    element_info['resolved_strategy'] = futures[future]
+                    self.rl_agent.observe(context, list(futures.values()), futures[future])
                     return element
+            self.rl_agent.observe(context, list(futures.values()), None)
 
         # If all strategies fail, attempt healing
         return self._heal_element(element_info)
 
+    def _recall_healed_element(self, element_info: dict):
+        """Try the heal remembered for this element's original locators (one resolver tick)."""
+        original_strategies = element_info.get('original_strategies', element_info['locator_strategies'])
+        remembered = self.locator_memory.lookup(original_strategies)
+        if not remembered or remembered == element_info['locator_strategies']:
+            return None
+        result = self.locator_resolver.resolve(remembered, timeout=0)
+        if not result:
+            return None
+        element_info['original_strategies'] = dict(original_strategies)
+        element_info['locator_strategies'] = remembered
+        element_info['resolved_strategy'] = result.strategy
+        return result.element
+
+    def _record_memory_hit(self, element_info: dict):
+        """Count a run that reused a remembered heal."""
+        if self.locator_memory is not None and 'original_strategies' in element_info and element_info.get('resolved_strategy'):
+            self.locator_memory.record_hit(element_info['original_strategies'])
+
     def _heal_element(self, element_info: dict):
         """Attempt to heal a broken element locator."""
         try:
+            if self.locator_memory is not None:
+                element = self._recall_healed_element(element_info)
+                if element is not None:
+                    return element
+
             original_attributes = self._get_original_attributes(element_info)
             page_elements = self._get_all_page_elements()
 
             best_match = self.element_healer.heal_element(original_attributes, page_elements)
             if best_match:
+                original_strategies = element_info.get('original_strategies', element_info['locator_strategies'])
                 self._update_locator_strategies(element_info, best_match)
-                return best_match['element']
+                if self.locator_memory is not None:
+                    self.locator_memory.remember(
+                        original_strategies, element_info['locator_strategies'], best_match.get('score', 0.0)
+                    )
+                return resolve_element(best_match['element'])
 
         except Exception as e:
             None
@@ -381,7 +438,9 @@ class SelfHealingFramework:
 
         self.healing_history[element_info['ID']] = {
             'timestamp': datetime.now().isoformat(),
-            'original_strategies': element_info['locator_strategies'].copy(),
+            # The mapped strategies, also when a remembered heal was tried first: they key the
+            # locator memory entry that rejecting this heal removes
+            'original_strategies': element_info.get('original_strategies', element_info['locator_strategies']).copy(),
             'new_strategies': new_strategies,
             'matched_attributes': new_element['attributes'],
             'note': "This element was not found in the latest BDD mapping and was healed."
@@ -423,7 +482,9 @@ class SelfHealingFramework:
                 "total_scenarios": 0,
                 "healed_count": 0,
                 "broken_count": 0
-            }
+            },
+            # Seconds spent waiting for page and element readiness, per step
+            "step_timings": self.readiness.timings
         }
 
         # Case 1: No healing or broken elements
@@ -492,53 +553,16 @@ class SelfHealingFramework:
 
     def close(self):
         """Clean up resources."""
-        if self.driver:
+        if self.browser_worker is not None:
+            # Reset and return the browser to the pool instead of quitting it
+            get_browser_pool().release(self.browser_worker)
+            self.browser_worker = None
+            self.driver = None
+        elif self.driver:
             self.driver.quit()
 
     def _get_all_page_elements(self) -> list:
         """Get all elements from the current page with their attributes, excluding labels and divs."""
-        elements = []
-        for element in self.driver.find_elements(By.XPATH, "//*"):
-            try:
-                # Skip elements with the tag name 'label' or 'div'
-                tag_name = element.tag_name.lower()
-                if tag_name == 'label' or tag_name == 'div':
-                    continue
-
-                # Generate the XPath of the element
-                xpath = self._get_xpath(element)
-
-                element_data = {
-                    'element': element,
-                    'attributes': {
-                        'id': element.get_attribute('id'),
-                        'tag_name': element.tag_name,
-                        'class_name': element.get_attribute('class'),
-                        'text': element.text,
-                        'type': element.get_attribute('type'),
-                        'name': element.get_attribute('name'),
-                        'XPath (Absolute)': xpath  # Add XPath to the attributes
-                    }
-                }
-                elements.append(element_data)
-            except Exception as e:
-                continue
-        return elements
-
-    def _get_xpath(self, element) -> str:
-        """Generate the XPath of the given element."""
-        xpath = ""
-        current_element = element
-        while current_element.tag_name.lower() != "html":
-            tag_name = current_element.tag_name.lower()
-            parent = current_element.find_element(By.XPATH, "..")
-            siblings = parent.find_elements(By.XPATH, f"./{tag_name}")
-
-            if len(siblings) == 1:
-                xpath = f"/{tag_name}{xpath}"
-            else:
-                index = siblings.index(current_element) + 1
-                xpath = f"/{tag_name}[{index}]{xpath}"
-
-            current_element = parent
-        return f"/html{xpath}"
+        # One execute_script round-trip; the WebElement of the chosen match is resolved lazily
+        snapshot = DomSnapshot.capture(self.driver, skip_tags=['label', 'div'])
+        return snapshot.page_elements(xpath_key='XPath (Absolute)')
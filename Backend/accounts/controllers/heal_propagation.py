@@ -0,0 +1,67 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from ..models import HealedElements, MappingRow, Project, Scenarios
+
+
+def apply_heals(healed_elements, scenarios):
+    """
+    Apply every heal of a run to the mapping rows of the scenarios and return the changed,
+    unsaved rows. Only rows that use a healed ID are loaded (one indexed query). Heals are
+    applied in report order: a row healed from A to B is healed again by a later B to C heal.
+    """
+    heals = []
+    for healed_element in healed_elements:
+        new_strategies = healed_element['new_strategies']
+        new_id = new_strategies.get('id', '')
+        new_css = new_strategies.get('CSS Selector', '')
+        new_xpath = new_strategies.get('XPath (Absolute)', '')
+        old_id = healed_element['original_element_id']
+        if new_id and new_css and new_xpath and old_id != new_id:
+            heals.append((old_id, new_id, new_css, new_xpath))
+    if not heals:
+        return []
+
+    rows_by_id = defaultdict(list)
+    for row in MappingRow.objects.filter(scenario__in=list(scenarios), element_id__in={heal[0] for heal in heals}):
+        rows_by_id[row.element_id].append(row)
+
+    changed = {}
+    for old_id, new_id, new_css, new_xpath in heals:
+        rows = rows_by_id.pop(old_id, [])
+        for row in rows:
+            row.element_id = new_id
+            row.css_selector = new_css
+            row.xpath_absolute = new_xpath
+            changed[row.pk] = row
+        rows_by_id[new_id].extend(rows)
+    return list(changed.values())
+
+
+def propagate_heals(execution, healed_elements, scenarios):
+    """
+    Store the healed elements of an execution and rewrite the mapping rows that used them:
+    one bulk insert and one bulk update of the changed rows, in a single transaction. Bulk
+    writes send no signals, so the data versions of the project and the changed scenarios
+    are bumped here. Returns the number of scenarios updated.
+    """
+    with transaction.atomic():
+        HealedElements.objects.bulk_create([
+            HealedElements(
+                execution=execution,
+                past_element_attribute=element['original_element_id'],
+                new_element_attribute=element['new_strategies'].get('id', ''),
+                label=True,
+                created_at=element.get('timestamp'),
+            )
+            for element in healed_elements
+        ])
+        changed = apply_heals(healed_elements, scenarios)
+        MappingRow.objects.bulk_update(changed, ['element_id', 'css_selector', 'xpath_absolute'])
+        scenario_ids = {row.scenario_id for row in changed}
+        if scenario_ids:
+            Scenarios.bump_versions(scenario_ids)
+        if healed_elements:
+            Project.bump_data_version(project_id=execution.project_id)
+    return len(scenario_ids)
@@ -1,79 +1,37 @@
-from bs4 import BeautifulSoup
-from .shared import tokenizer, model
-import torch
-from transformers import pipeline
-import requests
+from .shared import embedding_service
+from .summarizer import summarize
+from .page_fetcher import get_page_fetcher
+from .element_extractor import INTERACTIVE_ELEMENTS, extract_page
+from .element_catalog import content_hash
 
-def process_html(links):
+def process_html(links, enable_summarization=True, catalog=None):
     """
     Process HTML files in a directory, extract elements, and generate embeddings and semantic descriptions.
     Includes all possible identifiers for each element (e.g., id, class, name, XPath, CSS selector, etc.).
+    Descriptions come from the cached summarization stage and can be switched off per project.
+    With a project element catalog, unchanged pages are reused from it and processed pages are upserted into it.
     """
     html_pages = {}
-    try:
-        summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-    except Exception as e:
-        print(f"Failed to load summarization model: {e}")
-        summarizer = None  # Fallback to no summarization
 
-    # List of interactive HTML elements to include
-    interactive_elements = [
-        "input",  # Includes text, password, checkbox, radio, etc.
-        "select",  # Dropdowns
-        "button",  # Buttons
-        "textarea",  # Multi-line text input
-        "a",  # Links (if they are interactive)
-        "label",  # Labels (if they are associated with inputs)
-        "option",  # Options within a select element
-        "datalist",  # Data list for input suggestions
-        "fieldset",  # Grouping related elements
-        "legend",  # Caption for fieldset
-        "output",  # Output of a calculation
-        "progress",  # Progress bar
-        "meter",  # Scalar measurement
-    ]
+    # Download every page concurrently; unchanged pages come from the local page cache
+    pages = get_page_fetcher().fetch_all(links)
 
     for link in links:
-        response = requests.get(link)
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Extract interactive elements of interest
-        elements = []
-        for tag in soup.find_all(interactive_elements):
-            # Extract basic attributes
-            attributes = {
-                "role": tag.name,
-                "id": tag.get("id"),
-                "name": tag.get("name"),
-                "type": tag.get("type"),
-                "value": tag.get("value"),  # Add value attribute
-                "class": tag.get("class"),
-                "text": tag.text.strip(),
-                "placeholder": tag.get("placeholder", ""),  # Include placeholder
-                "parent": tag.parent.name if tag.parent else None,
-                "siblings": [sibling.name for sibling in tag.find_previous_siblings()]
-            }
+        response = pages[link]
+        page_hash = content_hash(response.text)
+        if catalog is not None:
+            catalogued = catalog.get_page(link, page_hash, enable_summarization)
+            if catalogued is not None:
+                html_pages[link] = catalogued
+                continue
 
-            # Handle <option> elements
-            parent_select = None
-            if tag.name == "option":
-                parent_select = tag.find_parent("select")
-                if parent_select:
-                    attributes.update({
-                        "parent_select_id": parent_select.get("id"),
-                        "parent_select_name": parent_select.get("name"),
-                        "option_value": tag.get("value"),
-                        "option_text": tag.text.strip()
-                    })
+        # Parse the page once and collect the interactive elements in a single pass
+        extracted, page_text = extract_page(response.text, INTERACTIVE_ELEMENTS)
 
-            # Generate XPath and CSS selector for the element
-            attributes["xpath_absolute"] = get_xpath(tag, absolute=True)
-            attributes["xpath_relative"] = get_xpath(tag, absolute=False)
-            attributes["css_selector"] = (
-                f"select#{parent_select.get('id')} option[value='{tag.get('value')}']" 
-                if (tag.name == "option" and parent_select) 
-                else get_css_selector(tag)
-            )
+        elements = []
+        element_texts = []
+        for element in extracted:
+            attributes = element["attributes"]
 
             # Create a text representation of the element
             element_text = (
@@ -90,31 +48,39 @@ def process_html(links):
                 f"xpath_relative={attributes['xpath_relative']} "
                 f"css_selector={attributes['css_selector']} "
             )
-            if tag.name == "option":
+            if attributes["role"] == "option":
                 element_text += (
                     f"option_value={attributes.get('option_value', '')} "
                     f"parent_select={attributes.get('parent_select_id', '')} "
                 )
 
-            # Generate embedding for the element
-            embedding = get_embedding(element_text)
-            description = generate_semantic_description(element_text, summarizer)  # Generate semantic description
+            # Embeddings and descriptions are generated for all elements of the page in one batch below
+            element_texts.append(element_text)
             elements.append({
-                "content": str(tag),
+                "content": element["content"],
                 "attributes": attributes,
-                "embedding": embedding,
-                "description": description
+                "embedding": None,
+                "description": None
             })
-            
-            # Generate embedding for the entire HTML page
-            page_text = soup.get_text()
-            page_embedding = get_embedding(page_text)
-            page_description = generate_semantic_description(page_text, summarizer)  # Generate semantic description
-            html_pages[link] = {
-                "elements": elements,
-                "embedding": page_embedding,
-                "description": page_description
-            }
+
+        if not elements:
+            continue
+
+        # Generate embeddings for every element and the entire HTML page in a single batched call
+        embeddings = embedding_service.encode(element_texts + [page_text])
+        # Summarize the unique element texts and the page once through the summarization stage
+        descriptions = summarize(element_texts + [page_text], enabled=enable_summarization)
+        for index, element in enumerate(elements):
+            element["embedding"] = embeddings[index:index + 1]
+            element["description"] = descriptions[index]
+
+        html_pages[link] = {
+            "elements": elements,
+            "embedding": embeddings[-1:],
+            "description": descriptions[-1]
+        }
+        if catalog is not None:
+            catalog.upsert_page(link, page_hash, html_pages[link], enable_summarization)
     
     return html_pages
 
@@ -122,55 +88,4 @@ def get_embedding(text):
     """
     Generate embeddings for a given text using the E5 model.
     """
-    inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True)
-    with torch.no_grad():
-        outputs = model(**inputs)
-    return outputs.last_hidden_state.mean(dim=1)  # Average pooling
-
-def generate_semantic_description(text, summarizer):
-    """
-    Generate a semantic description of a text using a summarization model.
-    """
-    if summarizer:
-        input_length = len(text.split())
-        max_length = min(50, input_length)
-        min_length = min(25, max_length // 2)
-        description = summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)[0]['summary_text']
-        return description
-    else:
-        return "No description available"
-
-def get_xpath(tag, absolute=True):
-    """
-    Generate XPath for a given tag.
-    If absolute=True, returns the absolute XPath.
-    If absolute=False, returns the relative XPath.
-    """
-    path = []
-    current = tag
-    while current:
-        if current.name:
-            # Get the tag name
-            tag_name = current.name
-            # Get the index of the current tag among its siblings
-            siblings = [sibling for sibling in current.parent.find_all(tag_name, recursive=False)] if current.parent else []
-            index = siblings.index(current) + 1 if siblings else 1
-            # Append the tag name and index to the path
-            path.append(f"{tag_name}[{index}]")
-        current = current.parent
-    # Reverse the path to get the correct order
-    path.reverse()
-    # Join the path with '/' for absolute XPath or './' for relative XPath
-    xpath = "/" + "/".join(path) if absolute else "./" + "/".join(path)
-    return xpath
-
-def get_css_selector(tag):
-    """
-    Generate a CSS selector for a given tag.
-    """
-    selector = tag.name
-    if tag.get("id"):
-        selector += f"#{tag.get('id')}"
-    elif tag.get("class"):
-        selector += "." + ".".join(tag.get("class"))
-    return selector
\ No newline at end of file
+    return embedding_service.encode_one(text)
@@ -0,0 +1,91 @@
+import logging
+import warnings
+
+logger = logging.getLogger(__name__)
+
+FP32 = "fp32"
+INT8 = "int8"
+ONNX = "onnx"
+BACKENDS = (FP32, INT8, ONNX)
+
+
+def get_inference_backend():
+    """
+    Inference backend configured in settings.INFERENCE_BACKEND ("fp32", "int8" or "onnx").
+    """
+    backend = FP32
+    try:
+        from django.conf import settings
+        if settings.configured:
+            backend = getattr(settings, "INFERENCE_BACKEND", FP32) or FP32
+    except ImportError:
+        pass
+    backend = str(backend).lower()
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown inference backend '{backend}', using {FP32}")
+        return FP32
+    return backend
+
+
+def revision_suffix(backend):
+    """
+    Suffix added to a model revision so embeddings from different backends never share cache entries.
+    """
+    return "" if backend in (None, FP32) else f"+{backend}"
+
+
+def quantize_int8(module):
+    """
+    Dynamic int8 quantization of every nn.Linear (weights int8, activations quantized per batch).
+    Attention and feed-forward projections dominate CPU time in BERT-style encoders.
+    """
+    import torch
+
+    module.eval()
+    with warnings.catch_warnings():
+        # torch.ao.quantization is deprecated in favour of torchao, but still ships with torch
+        warnings.simplefilter("ignore")
+        return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def load_transformer(model_name, backend=None):
+    """
+    Load a Hugging Face encoder (E5) for the given backend.
+    Returns (model, backend actually used); ONNX falls back to fp32 when optimum/onnxruntime are missing.
+    """
+    backend = backend or get_inference_backend()
+    if backend == ONNX:
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            return ORTModelForFeatureExtraction.from_pretrained(model_name, export=True), ONNX
+        except ImportError:
+            logger.warning("ONNX backend needs optimum[onnxruntime]; falling back to fp32")
+            backend = FP32
+
+    from transformers import AutoModel
+
+    model = AutoModel.from_pretrained(model_name)
+    if backend == INT8:
+        model = quantize_int8(model)
+    return model, backend
+
+
+def load_sentence_transformer(model_name_or_path, backend=None):
+    """
+    Load a SentenceTransformer (MiniLM / fine-tuned healing model) for the given backend.
+    Returns (model, backend actually used); ONNX falls back to fp32 when optimum/onnxruntime are missing.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    backend = backend or get_inference_backend()
+    if backend == ONNX:
+        try:
+            return SentenceTransformer(model_name_or_path, backend="onnx"), ONNX
+        except Exception as e:
+            logger.warning(f"ONNX backend unavailable for {model_name_or_path} ({e}); falling back to fp32")
+            backend = FP32
+
+    model = SentenceTransformer(model_name_or_path, device="cpu" if backend == INT8 else None)
+    if backend == INT8:
+        model = quantize_int8(model)
+    return model, backend
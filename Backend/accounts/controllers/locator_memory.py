@@ -0,0 +1,106 @@
+import hashlib
+import json
+from collections import Counter
+
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import HealedLocator
+
+
+def locator_key(strategies):
+    """
+    Signature of a set of locator strategies: sha256 of the non-empty strategies in a canonical
+    order, so every mapping row that points at the same element shares one memory entry.
+    """
+    canonical = {str(name): str(value) for name, value in (strategies or {}).items() if value}
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def forget_heals(project, healed_elements):
+    """
+    Drop the remembered heals of rejected healed elements (healing report entries, with their
+    original and new strategies), so later runs go back to the mapped locators. An entry that
+    has since been replaced by a different heal is kept. Returns the number of entries deleted.
+    """
+    rejected = {
+        locator_key(element['original_strategies']): locator_key(element.get('new_strategies'))
+        for element in healed_elements
+        if element.get('original_strategies')
+    }
+    if not rejected:
+        return 0
+    stale = [
+        entry.pk
+        for entry in HealedLocator.objects.filter(project=project, original_key__in=list(rejected))
+        if locator_key(entry.healed_strategies) == rejected[entry.original_key]
+    ]
+    deleted, _ = HealedLocator.objects.filter(pk__in=stale).delete()
+    return deleted
+
+
+class LocatorMemory:
+    """
+    Per-project memory of healed locators: original locator strategies -> healed strategies,
+    with the heal's confidence, how often it was reused and when it last resolved. The
+    project's entries are loaded with one query, so consulting the memory before healing
+    costs a dict lookup. Reuse counts are buffered and written by flush().
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self._entries = {
+            entry.original_key: entry
+            for entry in HealedLocator.objects.filter(project=project)
+        }
+        self._hits = Counter()
+
+    def lookup(self, strategies):
+        """Healed strategies remembered for these original strategies, or None."""
+        entry = self._entries.get(locator_key(strategies))
+        return dict(entry.healed_strategies) if entry is not None else None
+
+    def apply(self, element_info):
+        """
+        Swap the remembered heal into a mapping entry. The mapped strategies are kept in
+        element_info['original_strategies']. Returns True when a heal was applied.
+        """
+        original = element_info.get('original_strategies', element_info['locator_strategies'])
+        healed = self.lookup(original)
+        if healed is None:
+            return False
+        element_info['original_strategies'] = dict(original)
+        element_info['locator_strategies'] = healed
+        return True
+
+    def remember(self, original_strategies, healed_strategies, confidence=0.0):
+        """Store (or replace) the heal of an element right away, so later steps and runs reuse it."""
+        entry, _ = HealedLocator.objects.update_or_create(
+            project=self.project,
+            original_key=locator_key(original_strategies),
+            defaults={
+                'original_strategies': dict(original_strategies),
+                'healed_strategies': dict(healed_strategies),
+                'confidence': float(confidence or 0.0),
+                'last_validated_at': timezone.now(),
+            }
+        )
+        self._entries[entry.original_key] = entry
+        return entry
+
+    def record_hit(self, original_strategies):
+        """Count a reuse of the remembered heal; the healed locator has just resolved."""
+        key = locator_key(original_strategies)
+        if key in self._entries:
+            self._hits[key] += 1
+
+    def flush(self):
+        """Write the buffered reuse counts and validation times. Returns the number of entries updated."""
+        now = timezone.now()
+        for key, hits in self._hits.items():
+            HealedLocator.objects.filter(project=self.project, original_key=key).update(
+                hit_count=F('hit_count') + hits, last_validated_at=now
+            )
+        updated = len(self._hits)
+        self._hits.clear()
+        return updated
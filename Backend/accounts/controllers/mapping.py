@@ -4,12 +4,10 @@ import logging
 from abc import ABC, abstractmethod
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from sentence_transformers import SentenceTransformer, util
-from torch.nn.functional import cosine_similarity
-from .shared import tokenizer, model
-import torch
-from fuzzywuzzy import fuzz 
-from transformers import pipeline  
+from sentence_transformers import util
+from .shared import embedding_service, get_sentence_model
+from .summarizer import summarize
+from .mapping_scorer import score_steps
 
 
 class ElementLocators:
@@ -159,7 +157,7 @@ class WebScraper:
 
 class BDDToLocatorMapper:
     def __init__(self, model_name="all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+        self.model = get_sentence_model(model_name)
 
     def match(self, bdd_steps, locators_dict):
         pom_texts = list(locators_dict.keys())
@@ -278,13 +276,7 @@ class MappingProcessor:
 
 
 
-try:
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-except Exception as e:
-    print(f"Failed to load summarization model: {e}")
-    summarizer = None  # Fallback to no summarization
-
-def map_bdd_to_html(bdd_scenario, html_pages):
+def map_bdd_to_html(bdd_scenario, html_pages, enable_summarization=True):
     """
     Map a single BDD scenario to HTML elements across multiple pages based on semantic similarity.
     Uses fuzzy matching and semantic embeddings to handle any scenario and HTML structure.
@@ -317,95 +309,78 @@ def map_bdd_to_html(bdd_scenario, html_pages):
     ]
 
     # Split the scenario into steps
-    steps = bdd_scenario["scenario"].split("\n")
-    for step in steps:
-        step = step.strip()
-        # Only include "When" and "And" steps that contain action keywords
-        if step.lower().startswith(("when", "and")) and any(keyword in step.lower() for keyword in action_keywords):
-            step_embedding = get_embedding(step)
-            step_description = generate_semantic_description(step, summarizer) if summarizer else "No description"
-            step_description_embedding = get_embedding(step_description) if step_description != "No description" else None
-
-            best_match = None
-            best_similarity = -1  # Initialize with a low value
-
-            # Find the best matching element across all HTML pages
-            for page, page_data in html_pages.items():
-                for element in page_data["elements"]:
-                    element_embedding = element["embedding"]
-                    element_description_embedding = get_embedding(element["description"]) if element["description"] != "No description" else None
-
-                    # Combine step and element embeddings with their descriptions (if available)
-                    step_similarity = cosine_similarity(step_embedding, element_embedding).item()
-                    if step_description_embedding is not None and element_description_embedding is not None:
-                        description_similarity = cosine_similarity(step_description_embedding, element_description_embedding).item()
-                        combined_similarity = (step_similarity * 0.8) + (description_similarity * 0.2)  # Adjust weights
-                    else:
-                        combined_similarity = step_similarity  # Skip descriptions if they are generic
-
-                    # Add fuzzy matching for label text, id, name, placeholder, and type
-                    attributes = element.get("attributes", {})
-                    label_text = attributes.get("text", "") or ""
-                    element_id = attributes.get("id", "") or ""
-                    element_name = attributes.get("name", "") or ""
-                    placeholder = attributes.get("placeholder", "") or ""
-                    element_type = attributes.get("type", "") or ""
-                    option_value = attributes.get("option_value", "") or ""  # For <option> elements
-                    option_text = attributes.get("option_text", "") or ""  # For <option> elements
-
-                    # Calculate fuzzy match scores
-                    label_match_score = fuzz.partial_ratio(step.lower(), label_text.lower())
-                    id_match_score = fuzz.partial_ratio(step.lower(), element_id.lower())
-                    name_match_score = fuzz.partial_ratio(step.lower(), element_name.lower())
-                    placeholder_match_score = fuzz.partial_ratio(step.lower(), placeholder.lower())
-                    type_match_score = fuzz.partial_ratio(step.lower(), element_type.lower())
-                    option_value_match_score = fuzz.partial_ratio(step.lower(), option_value.lower())
-                    option_text_match_score = fuzz.partial_ratio(step.lower(), option_text.lower())
-
-                    # Combine semantic similarity with fuzzy match scores
-                    combined_similarity += (
-                        (label_match_score + id_match_score + name_match_score + placeholder_match_score + type_match_score) / 500 * 0.2  # Fuzzy match (20% weight)
-                    )
-
-                    # Add bonus for dropdown selection steps
-                    if "select" in step.lower() and "from" in step.lower() and "dropdown" in step.lower():
-                        if element["attributes"]["role"] == "option":
-                            # Prioritize option text/value matches
-                            combined_similarity += (option_value_match_score + option_text_match_score) / 200 * 0.3  # 30% bonus
-                        elif element["attributes"]["role"] == "select":
-                            # Penalize parent <select> elements for dropdown steps
-                            combined_similarity *= 0.5  # Reduce similarity for parent dropdowns
-
-                    # Update best match if this one is better
-                    if combined_similarity > best_similarity:
-                        best_similarity = combined_similarity
-                        best_match = {
-                            "step": step,
-                            "page": page,
-                            "element": {
-                                **element,  # Include all element attributes
-                                "similarity": combined_similarity  # Add similarity to the element
-                            }
-                        }
-
-            # Only include the match if similarity exceeds the threshold
-            if best_similarity > 0.3:  # Threshold for matching
-                # Extract all identifiers from the element
-                element_attributes = best_match["element"]["attributes"]
-                identifiers = {
-                    "id": element_attributes.get("id"),
-                    "class": element_attributes.get("class"),
-                    "name": element_attributes.get("name"),
-                    "xpath_absolute": element_attributes.get("xpath_absolute"),
-                    "xpath_relative": element_attributes.get("xpath_relative"),
-                    "css_selector": element_attributes.get("css_selector")
+    # Only include "When" and "And" steps that contain action keywords
+    steps = [
+        step.strip() for step in bdd_scenario["scenario"].split("\n")
+        if step.strip().lower().startswith(("when", "and"))
+        and any(keyword in step.strip().lower() for keyword in action_keywords)
+    ]
+    # Cached summaries: these steps were usually summarized by process_bdd already
+    step_descriptions = summarize(steps, enabled=enable_summarization, fallback="No description")
+
+    # Embed every step and every available step description in a single batched call
+    step_has_description = [description != "No description" for description in step_descriptions]
+    described = [index for index, has_description in enumerate(step_has_description) if has_description]
+    embeddings = embedding_service.encode(steps + [step_descriptions[index] for index in described])
+    step_embeddings = embeddings[:len(steps)]
+    step_description_embeddings = torch.zeros_like(step_embeddings)
+    step_description_embeddings[described] = embeddings[len(steps):]
+
+    # Flatten the elements of all pages; each element description is embedded once
+    candidates = [(page, element) for page, page_data in html_pages.items() for element in page_data["elements"]]
+    elements = [element for _, element in candidates]
+    if not steps or not elements:
+        return mappings
+    element_embeddings = torch.cat([element["embedding"] for element in elements])
+    element_has_description = [element["description"] != "No description" for element in elements]
+    unique_descriptions = list(dict.fromkeys(
+        element["description"] for element, has_description in zip(elements, element_has_description) if has_description
+    ))
+    description_embeddings = embedding_service.encode(unique_descriptions)
+    description_positions = {description: position for position, description in enumerate(unique_descriptions)}
+    element_description_embeddings = torch.zeros_like(element_embeddings)
+    for index, element in enumerate(elements):
+        if element_has_description[index]:
+            element_description_embeddings[index] = description_embeddings[description_positions[element["description"]]]
+
+    # One steps x elements similarity matrix; fuzzy and dropdown bonuses are applied to each step's best candidates
+    best_indices, best_scores = score_steps(
+        steps, step_embeddings, step_description_embeddings, step_has_description,
+        elements, element_embeddings, element_description_embeddings, element_has_description
+    )
+
+    for step_index, step in enumerate(steps):
+        best_index = int(best_indices[step_index])
+        best_similarity = float(best_scores[step_index])
+
+        # Only include the match if similarity exceeds the threshold
+        if best_similarity > 0.3:  # Threshold for matching
+            page, element = candidates[best_index]
+            best_match = {
+                "step": step,
+                "page": page,
+                "element": {
+                    **element,  # Include all element attributes
+                    "similarity": best_similarity  # Add similarity to the element
                 }
+            }
+
+            # Extract all identifiers from the element
+            element_attributes = best_match["element"]["attributes"]
+            identifiers = {
+                "id": element_attributes.get("id"),
+                "class": element_attributes.get("class"),
+                "name": element_attributes.get("name"),
+                "xpath_absolute": element_attributes.get("xpath_absolute"),
+                "xpath_relative": element_attributes.get("xpath_relative"),
+                "css_selector": element_attributes.get("css_selector")
+            }
 
-                # Add identifiers to the match
-                best_match["identifiers"] = identifiers
+            # Add identifiers to the match
+            best_match["identifiers"] = identifiers
 
-                # Add the match to the mappings
-                mappings.append(best_match)
+            # Add the match to the mappings
+            mappings.append(best_match)
 
     # Do NOT sort the mappings by similarity. Keep them in the original order.
     return mappings
@@ -414,20 +389,5 @@ def get_embedding(text):
     """
     Generate embeddings for a given text using the E5 model.
     """
-    inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True)
-    with torch.no_grad():
-        outputs = model(**inputs)
-    return outputs.last_hidden_state.mean(dim=1)  
+    return embedding_service.encode_one(text)
 
-def generate_semantic_description(text, summarizer):
-    """
-    Generate a semantic description of a text using a summarization model.
-    """
-    if summarizer:
-        input_length = len(text.split())
-        max_length = min(50, input_length)
-        min_length = min(25, max_length // 2)
-        description = summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)[0]['summary_text']
-        return description
-    else:
-        return "No description available"
\ No newline at end of file
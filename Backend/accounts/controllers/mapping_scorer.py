@@ -0,0 +1,123 @@
+import numpy as np
+import torch
+from .fuzzy_scorer import attribute_scores
+
+# Attributes whose fuzzy match against the step adds to the semantic similarity (20% weight)
+FUZZY_ATTRIBUTES = ["text", "id", "name", "placeholder", "type"]
+# Attributes of <option> elements that earn the dropdown bonus (30% weight)
+OPTION_ATTRIBUTES = ["option_value", "option_text"]
+# Elements per step whose attributes are fuzzy matched against the step
+FUZZY_CANDIDATES = 64
+
+
+def cosine_matrix(a, b):
+    """
+    Cosine similarity between every row of a (n, d) and every row of b (m, d), as a float64 (n, m) array.
+    """
+    if a.shape[0] == 0 or b.shape[0] == 0:
+        return np.zeros((a.shape[0], b.shape[0]))
+    a = torch.nn.functional.normalize(a.float(), p=2, dim=1)
+    b = torch.nn.functional.normalize(b.float(), p=2, dim=1)
+    return (a @ b.T).double().numpy()
+
+
+def is_dropdown_step(step):
+    step_lower = step.lower()
+    return "select" in step_lower and "from" in step_lower and "dropdown" in step_lower
+
+
+def score_matrix(step_embeddings, element_embeddings,
+                 step_description_embeddings=None, element_description_embeddings=None,
+                 step_has_description=None, element_has_description=None,
+                 fuzzy_scores=None, option_scores=None,
+                 dropdown_steps=None, element_roles=None):
+    """
+    Combined steps x elements similarity matrix.
+
+    - cosine(step, element), blended 80/20 with cosine(step description, element description)
+      where both descriptions are available
+    - + sum of attribute fuzzy scores / 500 * 0.2
+    - dropdown steps: + option fuzzy scores / 200 * 0.3 on <option> elements,
+      and x0.5 on parent <select> elements
+    """
+    combined = cosine_matrix(step_embeddings, element_embeddings)
+    n_steps, n_elements = combined.shape
+
+    if step_description_embeddings is not None and element_description_embeddings is not None:
+        description_similarity = cosine_matrix(step_description_embeddings, element_description_embeddings)
+        both = np.outer(np.asarray(step_has_description, dtype=bool), np.asarray(element_has_description, dtype=bool))
+        combined = np.where(both, combined * 0.8 + description_similarity * 0.2, combined)
+
+    if fuzzy_scores is not None:
+        combined = combined + fuzzy_scores / 500 * 0.2
+
+    if dropdown_steps is not None and element_roles is not None:
+        roles = np.asarray(element_roles, dtype=object)
+        dropdown = np.asarray(dropdown_steps, dtype=bool)[:, None]
+        option_mask = dropdown & (roles == "option")[None, :]
+        select_mask = dropdown & (roles == "select")[None, :]
+        if option_scores is not None:
+            combined = combined + np.where(option_mask, option_scores / 200 * 0.3, 0.0)
+        combined = np.where(select_mask, combined * 0.5, combined)
+
+    return combined.reshape(n_steps, n_elements)
+
+
+def score_steps(steps, step_embeddings, step_description_embeddings, step_has_description,
+                elements, element_embeddings, element_description_embeddings, element_has_description):
+    """
+    Scoring stage of map_bdd_to_html: the best element of every step and its combined score
+    (score_matrix's formula).
+
+    The embedding similarity is computed for every element. Fuzzy matching, the expensive part,
+    only scores the FUZZY_CANDIDATES elements per step with the highest reachable score: their
+    similarity plus the largest bonus their non-empty attributes could earn. An element left
+    out can only have been the best one if its fuzzy bonus beats every candidate's by more
+    than the similarity gap between them. Ties go to the first element, as with argmax.
+    Returns (best element index per step, its score) as numpy arrays.
+    """
+    similarity = score_matrix(
+        step_embeddings, element_embeddings,
+        step_description_embeddings, element_description_embeddings,
+        step_has_description, element_has_description
+    )
+    n_steps, n_elements = similarity.shape
+    if n_steps == 0 or n_elements == 0:
+        return np.zeros(n_steps, dtype=np.int64), np.zeros(n_steps)
+
+    roles = np.asarray([element.get("attributes", {}).get("role") for element in elements], dtype=object)
+    dropdown_steps = np.asarray([is_dropdown_step(step) for step in steps], dtype=bool)
+    option_mask = dropdown_steps[:, None] & (roles == "option")[None, :]
+    select_mask = dropdown_steps[:, None] & (roles == "select")[None, :]
+
+    # Largest bonus of each element: a perfect match on every non-empty attribute
+    def filled(attributes):
+        return np.array([
+            sum(bool(element.get("attributes", {}).get(attribute)) for attribute in attributes)
+            for element in elements
+        ])
+    reachable = similarity + filled(FUZZY_ATTRIBUTES) * 100 / 500 * 0.2
+    reachable = reachable + np.where(option_mask, filled(OPTION_ATTRIBUTES) * 100 / 200 * 0.3, 0.0)
+    reachable = np.where(select_mask, reachable * 0.5, reachable)
+
+    k = min(FUZZY_CANDIDATES, n_elements)
+    # Sorted so the first of equal scores is the first element
+    candidates = np.sort(np.argpartition(-reachable, k - 1, axis=1)[:, :k], axis=1)
+
+    def gather(matrix):
+        return np.take_along_axis(matrix, candidates, axis=1)
+
+    combined = gather(similarity) + attribute_scores(steps, elements, FUZZY_ATTRIBUTES, candidates) / 500 * 0.2
+    dropdown_indices = np.flatnonzero(dropdown_steps)
+    if len(dropdown_indices):
+        # Option columns only matter for dropdown steps
+        option_scores = np.zeros(candidates.shape)
+        option_scores[dropdown_indices] = attribute_scores(
+            [steps[i] for i in dropdown_indices], elements, OPTION_ATTRIBUTES, candidates[dropdown_indices]
+        )
+        combined = combined + np.where(gather(option_mask), option_scores / 200 * 0.3, 0.0)
+    combined = np.where(gather(select_mask), combined * 0.5, combined)
+
+    best = combined.argmax(axis=1)
+    rows = np.arange(n_steps)
+    return candidates[rows, best], combined[rows, best]
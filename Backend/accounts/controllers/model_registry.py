@@ -0,0 +1,292 @@
+import gc
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size_mb(obj):
+    """
+    Approximate resident size of a loaded model in MB, from the parameters and buffers
+    of the torch module it holds (pipelines, services and wrappers expose it as .model).
+    """
+    module = obj
+    for _ in range(3):
+        if hasattr(module, "parameters") and hasattr(module, "buffers"):
+            break
+        module = getattr(module, "model", None)
+        if module is None:
+            return 0.0
+    try:
+        total = sum(p.numel() * p.element_size() for p in module.parameters())
+        total += sum(b.numel() * b.element_size() for b in module.buffers())
+    except Exception:
+        return 0.0
+    return total / (1024 * 1024)
+
+
+class _Entry:
+    def __init__(self, loader, version=None):
+        self.loader = loader
+        self.version = version
+        self.model = None
+        self.size_mb = 0.0
+        self.last_used = 0.0
+        self.leases = 0
+        self.error = None
+        self.failed_at = 0.0
+        self.load_lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of ML models.
+    Models are registered with a loader and only loaded on first use. Loaded models are kept
+    in least-recently-used order; when the configured memory budget is exceeded, or a model
+    has been idle longer than the idle timeout, idle models are evicted and reloaded on
+    their next use. A loader that fails is not retried before the failure backoff elapses,
+    so an unreachable model hub doesn't stall every request.
+    """
+
+    def __init__(self, memory_budget_mb=0, idle_timeout_seconds=0, failure_backoff_seconds=300):
+        self.memory_budget_mb = memory_budget_mb or 0
+        self.idle_timeout_seconds = idle_timeout_seconds or 0
+        self.failure_backoff_seconds = failure_backoff_seconds or 0
+        self.entries = {}
+        self.loaded = OrderedDict()
+        self.lock = threading.RLock()
+
+    def register(self, name, loader, version=None):
+        """
+        Register (or replace) the loader of a model. A different version unloads the current instance.
+        """
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is not None and entry.version == version:
+                entry.loader = loader
+                return
+            if entry is not None:
+                self._unload(name)
+            self.entries[name] = _Entry(loader, version)
+
+    def is_registered(self, name):
+        return name in self.entries
+
+    def is_loaded(self, name):
+        with self.lock:
+            return name in self.loaded
+
+    def get(self, name, loader=None, version=None):
+        """
+        Return the model registered under name, loading it on first use.
+        When a loader is given the model is registered on the fly; a changed version
+        (e.g. a newly fine-tuned model) replaces the loaded instance.
+        """
+        with self.lock:
+            entry = self.entries.get(name)
+            if loader is not None and (entry is None or entry.version != version):
+                self.register(name, loader, version)
+                entry = self.entries[name]
+            if entry is None:
+                raise KeyError(f"Model '{name}' is not registered")
+            self._evict_idle(exclude=name)
+            if entry.model is not None:
+                return self._touch(name, entry)
+
+        # Load outside the registry lock so other models stay available meanwhile
+        with entry.load_lock:
+            if entry.model is None:
+                if entry.error is not None and time.monotonic() - entry.failed_at < self.failure_backoff_seconds:
+                    raise entry.error
+                start = time.perf_counter()
+                try:
+                    model = entry.loader()
+                except Exception as e:
+                    entry.error = e
+                    entry.failed_at = time.monotonic()
+                    raise
+                entry.error = None
+                size_mb = estimate_size_mb(model)
+                logger.info(f"Loaded model '{name}' ({size_mb:.0f} MB) in {time.perf_counter() - start:.1f}s")
+                with self.lock:
+                    entry.model = model
+                    entry.size_mb = size_mb
+                    self._touch(name, entry)
+                    self._enforce_budget(exclude=name)
+
+        with self.lock:
+            return self._touch(name, entry)
+
+    def lease(self, name, loader=None, version=None):
+        """
+        Context manager that keeps a model from being evicted while it is in use.
+        """
+        registry = self
+
+        class _Lease:
+            def __enter__(self_):
+                while True:
+                    model = registry.get(name, loader, version)
+                    with registry.lock:
+                        # Unless it was evicted or replaced since get() returned
+                        entry = registry.entries.get(name)
+                        if entry is not None and entry.model is model:
+                            entry.leases += 1
+                            return model
+
+            def __exit__(self_, *exc):
+                with registry.lock:
+                    entry = registry.entries.get(name)
+                    if entry is not None:
+                        entry.leases -= 1
+                        entry.last_used = time.monotonic()
+                    # Models loaded while this one was leased may have left the budget exceeded
+                    registry._enforce_budget()
+                return False
+
+        return _Lease()
+
+    def proxy(self, name, loader=None, version=None):
+        """
+        Stand-in for a registered model that loads it on first attribute access, so modules
+        can keep a module-level handle without loading at import time. Callers that keep a
+        model for a long time (a test run, a mapping job) should hold a proxy, not the model:
+        see LazyModel.
+        """
+        return LazyModel(self, name, loader, version)
+
+    def warm_up(self, names=None):
+        """
+        Load the given (or all registered) models ahead of the first request.
+        """
+        for name in names if names is not None else list(self.entries):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Failed to warm up model '{name}': {e}")
+
+    def unload(self, name):
+        with self.lock:
+            self._unload(name)
+
+    def loaded_size_mb(self):
+        with self.lock:
+            return sum(self.entries[name].size_mb for name in self.loaded)
+
+    def _touch(self, name, entry):
+        entry.last_used = time.monotonic()
+        self.loaded[name] = True
+        self.loaded.move_to_end(name)
+        return entry.model
+
+    def _unload(self, name):
+        entry = self.entries.get(name)
+        self.loaded.pop(name, None)
+        if entry is not None and entry.model is not None:
+            entry.model = None
+            entry.size_mb = 0.0
+            logger.info(f"Unloaded model '{name}'")
+            gc.collect()
+
+    def _evictable(self, exclude):
+        return [
+            name for name in self.loaded
+            if name != exclude and self.entries[name].leases == 0
+        ]
+
+    def _evict_idle(self, exclude=None):
+        if not self.idle_timeout_seconds:
+            return
+        now = time.monotonic()
+        for name in self._evictable(exclude):
+            if now - self.entries[name].last_used > self.idle_timeout_seconds:
+                self._unload(name)
+
+    def _enforce_budget(self, exclude=None):
+        if not self.memory_budget_mb:
+            return
+        # Least recently used models go first
+        for name in self._evictable(exclude):
+            if self.loaded_size_mb() <= self.memory_budget_mb:
+                break
+            self._unload(name)
+        if self.loaded_size_mb() > self.memory_budget_mb:
+            logger.warning(
+                f"Loaded models use {self.loaded_size_mb():.0f} MB, above the "
+                f"{self.memory_budget_mb} MB budget, and none of them can be evicted"
+            )
+
+
+class LazyModel:
+    """
+    Handle on a registered model that holds no reference to the loaded instance. Attributes
+    are read from the current instance, and every method call, or call of the model itself,
+    runs under a lease: the model can't be evicted in the middle of a call, and once evicted
+    it isn't kept alive by its users, so the memory budget really bounds memory.
+    """
+
+    def __init__(self, registry, name, loader=None, version=None):
+        self._registry = registry
+        self._name = name
+        self._loader = loader
+        self._version = version
+
+    def _lease(self):
+        return self._registry.lease(self._name, self._loader, self._version)
+
+    def __getattr__(self, attribute):
+        value = getattr(self._registry.get(self._name, self._loader, self._version), attribute)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            with self._lease() as model:
+                return getattr(model, attribute)(*args, **kwargs)
+        return call
+
+    def __call__(self, *args, **kwargs):
+        with self._lease() as model:
+            return model(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<LazyModel '{self._name}'>"
+
+
+def _registry_settings():
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return getattr(settings, "MODEL_REGISTRY", {})
+    except ImportError:
+        pass
+    return {}
+
+
+_config = _registry_settings()
+registry = ModelRegistry(
+    memory_budget_mb=_config.get("MEMORY_BUDGET_MB", 0),
+    idle_timeout_seconds=_config.get("IDLE_TIMEOUT_SECONDS", 0),
+    failure_backoff_seconds=_config.get("FAILURE_BACKOFF_SECONDS", 300)
+)
+
+
+def warm_up_from_settings():
+    """
+    Warm up the models listed in settings.MODEL_REGISTRY['WARMUP'], in a background
+    thread unless WARMUP_BLOCKING is set. Called once at server start (wsgi/asgi).
+    """
+    names = _registry_settings().get("WARMUP") or []
+    if not names:
+        return None
+
+    # Importing shared registers the pipeline models
+    from . import shared  # noqa: F401
+
+    if _registry_settings().get("WARMUP_BLOCKING", False):
+        registry.warm_up(names)
+        return None
+    thread = threading.Thread(target=registry.warm_up, args=(names,), name="model-warmup", daemon=True)
+    thread.start()
+    return thread
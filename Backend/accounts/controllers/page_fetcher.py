@@ -0,0 +1,227 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'pages')
+
+
+class FetchedPage:
+    """
+    Body of a fetched page and how it was obtained:
+    "network" (full download), "revalidated" (304 Not Modified, body from the cache),
+    "cache" (fresh cached copy, no request made) or "stale" (cached copy served because the request failed).
+    """
+
+    def __init__(self, url, text, status_code, source):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        self.source = source
+
+    @property
+    def from_cache(self):
+        return self.source != "network"
+
+
+class PageCache:
+    """
+    On-disk cache of page bodies with the validators (ETag / Last-Modified) and
+    freshness lifetime needed to revalidate them. One body file and one metadata file per URL.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json"), os.path.join(self.cache_dir, f"{key}.html")
+
+    def get(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, encoding="utf-8") as f:
+                meta["text"] = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    def put(self, url, text, etag=None, last_modified=None, max_age=None):
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "max_age": max_age,
+            "fetched_at": time.time()
+        }
+        # Write to temporary files and rename so concurrent readers never see a partial entry
+        for path, content in ((body_path, text), (meta_path, json.dumps(meta))):
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+    def touch(self, url, meta, max_age=None):
+        """
+        Mark a revalidated entry as fresh again.
+        """
+        meta_path, _ = self._paths(url)
+        meta = {key: value for key, value in meta.items() if key != "text"}
+        meta["fetched_at"] = time.time()
+        if max_age is not None:
+            meta["max_age"] = max_age
+        tmp_path = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+
+def parse_max_age(headers):
+    """
+    Freshness lifetime from Cache-Control (None when absent, 0 for no-cache/no-store).
+    """
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return int(match.group(1)) if match else None
+
+
+class PageFetcher:
+    """
+    Page acquisition layer of the mapping pipeline.
+    Pages are downloaded concurrently through one pooled requests.Session, with at most
+    per_host concurrent requests to the same host. Bodies are kept in a PageCache:
+    a page still fresh (server max-age, or ttl_seconds when the server sends none) is
+    served without a network round-trip, and an expired one is revalidated with
+    If-None-Match / If-Modified-Since so unchanged pages are not downloaded again.
+    """
+
+    def __init__(self, max_workers=8, per_host=4, timeout=10, cache=None, ttl_seconds=0, session=None):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.session = session or self._make_session(max_workers)
+        self.host_limits = {}
+        self.host_limits_lock = threading.Lock()
+
+    @staticmethod
+    def _make_session(pool_size):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        with self.host_limits_lock:
+            if host not in self.host_limits:
+                self.host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_limits[host]
+
+    def _is_fresh(self, entry):
+        max_age = entry.get("max_age")
+        if max_age is None:
+            max_age = self.ttl_seconds
+        return time.time() - entry.get("fetched_at", 0) < max_age
+
+    def fetch(self, url):
+        """
+        Return the FetchedPage of a URL.
+        """
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and self._is_fresh(entry):
+            return FetchedPage(url, entry["text"], 200, "cache")
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            with self._host_limit(url):
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            if entry is None:
+                raise
+            logger.warning(f"Fetching {url} failed ({e}), using the cached copy")
+            return FetchedPage(url, entry["text"], 200, "stale")
+
+        max_age = parse_max_age(response.headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url, entry, max_age)
+            return FetchedPage(url, entry["text"], 200, "revalidated")
+
+        if response.status_code == 200 and self.cache is not None and max_age != 0:
+            self.cache.put(
+                url,
+                response.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                max_age=max_age
+            )
+        return FetchedPage(url, response.text, response.status_code, "network")
+
+    def fetch_all(self, urls):
+        """
+        Fetch several URLs concurrently. Returns {url: FetchedPage} in input order;
+        the first error is raised once every fetch has finished.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_urls))) as executor:
+            futures = {url: executor.submit(self.fetch, url) for url in unique_urls}
+        return {url: future.result() for url, future in futures.items()}
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def _fetcher_settings():
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return getattr(settings, "PAGE_FETCHER", {})
+    except ImportError:
+        pass
+    return {}
+
+
+def get_page_fetcher():
+    """
+    Return the process-wide page fetcher configured from settings.PAGE_FETCHER.
+    """
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            config = _fetcher_settings()
+            cache = PageCache(config.get("CACHE_DIR", DEFAULT_CACHE_DIR)) if config.get("CACHE_ENABLED", True) else None
+            _fetcher = PageFetcher(
+                max_workers=config.get("MAX_WORKERS", 8),
+                per_host=config.get("PER_HOST", 4),
+                timeout=config.get("TIMEOUT_SECONDS", 10),
+                cache=cache,
+                ttl_seconds=config.get("TTL_SECONDS", 0)
+            )
+        return _fetcher
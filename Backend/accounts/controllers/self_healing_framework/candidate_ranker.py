@@ -0,0 +1,84 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+
+import torch
+from sentence_transformers import util
+
+# Number of distinct page states whose candidate embeddings are kept per process
+MAX_CACHED_PAGES = 64
+
+_page_embeddings = OrderedDict()
+_page_embeddings_lock = threading.Lock()
+
+
+def dom_fingerprint(candidate_texts: Sequence[str]) -> str:
+    """
+    Fingerprint of a page state: the ordered text representation of its candidate elements.
+    The same page with the same elements always yields the same fingerprint.
+    """
+    digest = hashlib.sha256()
+    for text in candidate_texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _model_key(similarity_model) -> tuple:
+    name = getattr(similarity_model, "model_name_or_path", None)
+    if name is None:
+        return ("instance", id(similarity_model))
+    return (name, getattr(similarity_model, "revision", None))
+
+
+def clear_page_embeddings():
+    with _page_embeddings_lock:
+        _page_embeddings.clear()
+
+
+class CandidateRanker:
+    """
+    Ranks page elements against a broken element: every candidate is encoded in one
+    batched call and scored with a single cosine similarity matrix product. Candidate
+    embeddings are cached per (model, DOM fingerprint), so repeated heals on the same
+    unchanged page only encode the broken element.
+    """
+
+    def __init__(self, similarity_model, batch_size: int = 64):
+        self.similarity_model = similarity_model
+        self.batch_size = batch_size
+
+    def candidate_embeddings(self, candidate_texts: List[str]) -> torch.Tensor:
+        key = (_model_key(self.similarity_model), dom_fingerprint(candidate_texts))
+        with _page_embeddings_lock:
+            embeddings = _page_embeddings.get(key)
+            if embeddings is not None:
+                _page_embeddings.move_to_end(key)
+                return embeddings
+
+        embeddings = self.similarity_model.encode(
+            candidate_texts, convert_to_tensor=True, batch_size=self.batch_size
+        )
+        with _page_embeddings_lock:
+            _page_embeddings[key] = embeddings
+            while len(_page_embeddings) > MAX_CACHED_PAGES:
+                _page_embeddings.popitem(last=False)
+        return embeddings
+
+    def rank(self, query_text: str, candidate_texts: List[str], k: int = 5,
+             threshold: float = 0.0) -> List[Tuple[int, float]]:
+        """
+        Top-k (candidate index, cosine similarity) pairs above threshold, best first.
+        """
+        if not candidate_texts or k <= 0:
+            return []
+        query_embedding = self.similarity_model.encode(query_text, convert_to_tensor=True)
+        candidates = self.candidate_embeddings(candidate_texts)
+        similarity = util.cos_sim(query_embedding, candidates.to(query_embedding.device))[0]
+        scores, indices = torch.topk(similarity, min(k, len(candidate_texts)))
+        return [
+            (int(index), float(score))
+            for score, index in zip(scores.tolist(), indices.tolist())
+            if score > threshold
+        ]
@@ -0,0 +1,171 @@
+import logging
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+logger = logging.getLogger(__name__)
+
+# Columns of every snapshot row, in order
+SNAPSHOT_FIELDS = ("tag_name", "id", "class_name", "name", "type", "text", "xpath", "css", "rect", "visible")
+
+# Maximum characters of visible text kept per element (long containers would dominate the payload)
+MAX_TEXT_LENGTH = 300
+
+# Walks the DOM once in the browser and returns one compact row per element. The elements
+# themselves are kept on window under a per-snapshot token so a chosen row can be turned
+# back into a WebElement with a single call, without re-querying the page.
+SNAPSHOT_SCRIPT = """
+var token = arguments[0], skip = {}, maxText = arguments[2];
+arguments[1].forEach(function (tag) { skip[tag] = true; });
+var rows = [], elements = [];
+var stack = [[document.documentElement, '/html', 'html']];
+while (stack.length) {
+    var entry = stack.pop(), el = entry[0], xpath = entry[1], css = entry[2];
+    var tag = el.localName;
+    if (!skip[tag]) {
+        var rect = el.getBoundingClientRect();
+        var text = el.innerText !== undefined ? el.innerText : el.textContent;
+        text = (text || '').trim();
+        if (text.length > maxText) { text = text.slice(0, maxText); }
+        var style = window.getComputedStyle(el);
+        elements.push(el);
+        rows.push([
+            tag,
+            el.getAttribute('id') || '',
+            el.getAttribute('class') || '',
+            el.getAttribute('name') || '',
+            el.getAttribute('type') || '',
+            text,
+            xpath,
+            css,
+            [Math.round(rect.x), Math.round(rect.y), Math.round(rect.width), Math.round(rect.height)],
+            rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none'
+        ]);
+    }
+    var children = el.children, counts = {}, seen = {}, i;
+    for (i = 0; i < children.length; i++) {
+        counts[children[i].localName] = (counts[children[i].localName] || 0) + 1;
+    }
+    var pending = [];
+    for (i = 0; i < children.length; i++) {
+        var child = children[i], name = child.localName;
+        seen[name] = (seen[name] || 0) + 1;
+        pending.push([
+            child,
+            xpath + '/' + name + (counts[name] > 1 ? '[' + seen[name] + ']' : ''),
+            css + ' > ' + name + ':nth-child(' + (i + 1) + ')'
+        ]);
+    }
+    // Push in reverse so elements come out in document order
+    for (i = pending.length - 1; i >= 0; i--) { stack.push(pending[i]); }
+}
+window.__selfHealingSnapshot = {token: token, elements: elements};
+return rows;
+"""
+
+RESOLVE_SCRIPT = """
+var snapshot = window.__selfHealingSnapshot;
+if (!snapshot || snapshot.token !== arguments[0]) { return null; }
+var el = snapshot.elements[arguments[1]];
+return el && el.isConnected ? el : null;
+"""
+
+
+class ElementHandle:
+    """
+    Lazy reference to an element of a DOM snapshot. resolve() re-acquires the WebElement:
+    first from the snapshot kept in the page, then by its absolute XPath if the page
+    was reloaded or the element was re-rendered since the snapshot.
+    """
+
+    def __init__(self, driver, token: str, index: int, xpath: str):
+        self.driver = driver
+        self.token = token
+        self.index = index
+        self.xpath = xpath
+        self._element = None
+
+    def resolve(self):
+        if self._element is not None:
+            return self._element
+        try:
+            self._element = self.driver.execute_script(RESOLVE_SCRIPT, self.token, self.index)
+        except WebDriverException as e:
+            logger.debug(f"Snapshot element {self.index} not resolvable from the page: {e}")
+        if self._element is None:
+            try:
+                self._element = self.driver.find_element(By.XPATH, self.xpath)
+            except WebDriverException:
+                logger.warning(f"Snapshot element {self.xpath} no longer exists")
+                return None
+        return self._element
+
+    def __repr__(self):
+        return f"ElementHandle({self.xpath!r})"
+
+
+class DomSnapshot:
+    """
+    Every element of the current page (attributes, visible text, absolute XPath, CSS path,
+    tag and bounding box) captured with a single execute_script round-trip.
+    """
+
+    def __init__(self, driver, rows: List[list], token: str):
+        self.driver = driver
+        self.rows = rows
+        self.token = token
+
+    @classmethod
+    def capture(cls, driver, skip_tags: Iterable[str] = ()) -> "DomSnapshot":
+        token = uuid.uuid4().hex
+        rows = driver.execute_script(SNAPSHOT_SCRIPT, token, [tag.lower() for tag in skip_tags], MAX_TEXT_LENGTH) or []
+        logger.info(f"Captured DOM snapshot of {len(rows)} elements")
+        return cls(driver, rows, token)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def records(self) -> List[Dict]:
+        """
+        Snapshot rows as dictionaries keyed by SNAPSHOT_FIELDS.
+        """
+        return [dict(zip(SNAPSHOT_FIELDS, row)) for row in self.rows]
+
+    def handle(self, index: int) -> ElementHandle:
+        return ElementHandle(self.driver, self.token, index, self.rows[index][SNAPSHOT_FIELDS.index("xpath")])
+
+    def page_elements(self, xpath_key: str = "xpath", visible_only: bool = False) -> List[Dict]:
+        """
+        Elements in the shape the element healers expect: {'element': ElementHandle, 'attributes': {...}}.
+        The XPath is stored under xpath_key so callers keep their attribute naming.
+        """
+        elements = []
+        for index, record in enumerate(self.records()):
+            if visible_only and not record["visible"]:
+                continue
+            elements.append({
+                'element': self.handle(index),
+                'attributes': {
+                    'id': record["id"],
+                    'tag_name': record["tag_name"],
+                    'class_name': record["class_name"],
+                    'text': record["text"],
+                    'type': record["type"],
+                    'name': record["name"],
+                    xpath_key: record["xpath"]
+                },
+                'css': record["css"],
+                'rect': record["rect"]
+            })
+        return elements
+
+
+def resolve_element(element: Optional[object]):
+    """
+    WebElement for a healed match, resolving snapshot handles.
+    """
+    if isinstance(element, ElementHandle):
+        return element.resolve()
+    return element
@@ -1,11 +1,14 @@
-from sentence_transformers import SentenceTransformer, util
 from symspellpy import SymSpell
 from typing import Dict, List, Optional, Any
 import logging
 import os
+from ..shared import get_sentence_model
+from .candidate_ranker import CandidateRanker
 
 class ElementHealer:
     """Handles element healing using ML and other strategies."""
+    threshold = 0.3  # Minimum cosine similarity for a match
+
     def __init__(self):
         try:
             # Check if fine-tuned model exists
@@ -13,11 +16,11 @@ class ElementHealer:
             fine_tuned_model_path = os.path.join(model_dir, 'fine_tuned_model')
             
             if os.path.exists(fine_tuned_model_path):
-                self.similarity_model = SentenceTransformer(fine_tuned_model_path)
+                self.similarity_model = get_sentence_model(fine_tuned_model_path)
                 self.logger = logging.getLogger(__name__)
                 self.logger.info("Using fine-tuned model for element healing")
             else:
-                self.similarity_model = SentenceTransformer('all-MiniLM-L6-v2')  # Default model
+                self.similarity_model = get_sentence_model('all-MiniLM-L6-v2')  # Default model
                 self.logger = logging.getLogger(__name__)
                 self.logger.info("Using default model for element healing")
                 
@@ -26,7 +29,8 @@ class ElementHealer:
             self.logger = logging.getLogger(__name__)
             self.logger.error(f"Failed to initialize ElementHealer: {str(e)}")
             # Fallback to default model
-            self.similarity_model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.similarity_model = get_sentence_model('all-MiniLM-L6-v2')
+        self.ranker = CandidateRanker(self.similarity_model)
 
     def heal_element(self, original_attributes: Dict, page_elements: List[Dict]) -> Optional[Dict]:
         """Attempt to heal a broken element locator."""
@@ -36,32 +40,26 @@ class ElementHealer:
             self.logger.error(f"Error during element healing: {str(e)}")
             return None
 
-    def _find_best_match(self, original_attributes: Dict, page_elements: List[Dict]) -> Optional[Dict]:
-        """Find the most similar element on the page using ML."""
-        best_match = None
-        best_score = 0.0
-        threshold = 0.3
-
+    def find_top_matches(self, original_attributes: Dict, page_elements: List[Dict], k: int = 5) -> List[Dict]:
+        """Rank the page elements against the broken element; top-k matches above the threshold, best first."""
         original_text = self._attributes_to_text(original_attributes)
         if not original_text.strip():
-            return None
+            return []
 
-        try:
-            original_embedding = self.similarity_model.encode(original_text, convert_to_tensor=True)
+        candidates = []
+        for element_data in page_elements:
+            current_text = self._attributes_to_text(element_data['attributes'])
+            if current_text.strip():
+                candidates.append((element_data, current_text))
 
-            for element_data in page_elements:
-                current_text = self._attributes_to_text(element_data['attributes'])
-                if not current_text.strip():
-                    continue
+        ranked = self.ranker.rank(original_text, [text for _, text in candidates], k=k, threshold=self.threshold)
+        return [{**candidates[index][0], 'score': score} for index, score in ranked]
 
-                current_embedding = self.similarity_model.encode(current_text, convert_to_tensor=True)
-                similarity = util.pytorch_cos_sim(original_embedding, current_embedding).item()
-
-                if similarity > best_score and similarity > threshold:
-                    best_score = similarity
-                    best_match = element_data
-
-            return best_match
+    def _find_best_match(self, original_attributes: Dict, page_elements: List[Dict]) -> Optional[Dict]:
+        """Find the most similar element on the page using ML."""
+        try:
+            matches = self.find_top_matches(original_attributes, page_elements, k=1)
+            return matches[0] if matches else None
         except Exception as e:
             self.logger.error(f"Error in similarity comparison: {str(e)}")
             return None
@@ -10,6 +10,8 @@ import torch
 from torch.utils.data import DataLoader
 from sentence_transformers import SentenceTransformer, InputExample, losses, util
 
+from ..embedding_cache import invalidate_embedding_cache
+
 class ModelFineTuner:
     """Handles fine-tuning of the element healing model."""
     
@@ -219,6 +221,9 @@ class ModelFineTuner:
             # Copy the new model to the standard location
             shutil.copytree(new_model_path, self.current_model_path)
             self.logger.info(f"Updated fine-tuned model at {self.current_model_path}")
+
+            # Embeddings of the previous model version must not be served for the new one
+            invalidate_embedding_cache(self.current_model_path)
             
             # Reload the model
             self._load_model()
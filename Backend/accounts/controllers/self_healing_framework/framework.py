@@ -11,55 +11,80 @@ from .element_healer import ElementHealer
 from .mapping_loader import MappingLoader
 from .action_executor import ActionExecutor
 from .rl_healing_agent import RLHealingAgent
-from .utils import determine_action, get_xpath
+from .utils import determine_action
+from .dom_snapshot import DomSnapshot, resolve_element
+from .locator_resolver import LocatorResolver
+from .readiness import ReadinessWaiter
+from .locator_cache import LocatorCache
+from ..browser_pool import get_browser_pool
 from .exceptions import ElementNotFoundError, HealingFailedError
 
 class SelfHealingFramework:
-    def __init__(self, mapping: str):
+    def __init__(self, mapping: str, locator_mode: str = "race", locator_memory=None, rl_agent=None):
         self.driver = None
-        self.mapping_loader = MappingLoader(mapping)
+        self.browser_worker = None
+        # "race": all strategies in one in-page script per poll tick; "parallel": one WebDriverWait per strategy
+        self.locator_mode = locator_mode
+        # Per-project healed locators (accounts/controllers/locator_memory.py), consulted before healing
+        self.locator_memory = locator_memory
+        self.mapping_loader = MappingLoader(mapping, locator_memory)
         self.mappings = self.mapping_loader.load_mappings()
         self.healing_history = {}
-        self.rl_agent = RLHealingAgent(['id', 'CSS Selector', 'XPath (Absolute)', 'xpath_contains'])
-        self.element_cache = {}
+        # Orders locator strategies; pass a project's agent (accounts/controllers/strategy_stats.py) to reuse its statistics
+        self.rl_agent = rl_agent if rl_agent is not None else RLHealingAgent(['id', 'CSS Selector', 'XPath (Absolute)'])
+        # Entries are per project: projects may share step texts and URLs
+        self.locator_cache = LocatorCache(self.driver, locator_memory.project.pk if locator_memory is not None else None)
         self.element_locator = ElementLocator(self.driver)
+        self.locator_resolver = LocatorResolver(self.driver)
+        self.readiness = ReadinessWaiter(self.driver)
         self.element_healer = ElementHealer()
         self.action_executor = ActionExecutor(self.driver)
         self.retry_attempts = 1
         self.logger = logging.getLogger(__name__)
 
-    def execute_all_steps(self, delay: float = 1.5) -> None:
-        """Automatically execute all BDD steps from the mapping."""
+    def execute_all_steps(self, max_wait: float = 10.0) -> None:
+        """Automatically execute all BDD steps from the mapping, waiting at most max_wait seconds per readiness check."""
         for bdd_step, element_info in self.mappings.items():
+            page_wait = locate = element_wait = 0.0
             try:
                 current_url = self.driver.current_url
                 if current_url != element_info['Page']:
                     self.driver.get(element_info['Page'])
-                    time.sleep(delay)
+                    page_wait = self.readiness.wait_for_page(max_wait)
                 
                 action, value = determine_action(bdd_step)
                 if action is None:
                     self.logger.warning(f"Could not determine action for step: {bdd_step}")
                     continue
                 
-                element = self.find_element(bdd_step)
-                time.sleep(delay)
+                start = time.monotonic()
+                try:
+                    element = self.find_element(bdd_step)
+                finally:
+                    locate = time.monotonic() - start
+                element_wait = self.readiness.wait_for_element(element, action != "verify", max_wait)
                 self.action_executor.execute_action(element, action, value)
                 
             except Exception as e:
                 self.logger.error(f"Error executing step '{bdd_step}': {str(e)}")
                 continue
+            finally:
+                self.readiness.record(bdd_step, page_wait=page_wait, locate=locate, element_wait=element_wait)
 
     def start_browser(self, browser: str = "chrome") -> None:
-        """Initialize the WebDriver."""
+        """Initialize the WebDriver; Chrome is leased from the shared browser pool."""
         if browser.lower() == "chrome":
-            self.driver = webdriver.Chrome()
+            self.browser_worker = get_browser_pool().acquire()
+            self.driver = self.browser_worker.driver
         elif browser.lower() == "firefox":
             self.driver = webdriver.Firefox()
         else:
             raise ValueError(f"Unsupported browser: {browser}")
         
         self.element_locator.driver = self.driver
+        self.locator_resolver.driver = self.driver
+        self.locator_cache.driver = self.driver
+        self.readiness.driver = self.driver
         self.action_executor.driver = self.driver
 
     def find_element(self, bdd_step: str, timeout: int = 10) -> Any:
@@ -67,12 +92,18 @@ class SelfHealingFramework:
         if bdd_step not in self.mappings:
             raise InvalidBDDStepError(f"BDD step '{bdd_step}' not found in mappings")
         
-        # Check cache first
-        if bdd_step in self.element_cache:
-            return self.element_cache[bdd_step]
-
         element_info = self.mappings[bdd_step]
-        element = None
+
+        # Check the locator cache first: one in-page check re-resolves a known locator
+        page_url = self.driver.current_url
+        element, fingerprint = self.locator_cache.lookup(page_url, bdd_step, element_info)
+        if element is not None:
+            strategy = element_info.get('resolved_strategy')
+            if strategy:
+                # The cached strategy hit without trying the others
+                self.rl_agent.observe(self.rl_agent.context(element_info), [strategy], strategy)
+            self._record_memory_hit(element_info)
+            return element
 
         for attempt in range(self.retry_attempts):
             try:
@@ -85,7 +116,8 @@ class SelfHealingFramework:
 
         if element:
             self._record_successful_find(bdd_step, element_info)
-            self.element_cache[bdd_step] = element
+            self._record_memory_hit(element_info)
+            self.locator_cache.store(page_url, fingerprint, bdd_step, element_info)
             return element
         else:
             self._record_failed_find(bdd_step, element_info)
@@ -93,6 +125,19 @@ class SelfHealingFramework:
 
     def _find_with_healing(self, element_info: Dict, timeout: int) -> Any:
         """Find element with multiple strategies and self-healing."""
+        element_info.pop('resolved_strategy', None)
+        # Try the strategies in the order learned for this page and tag type
+        context = self.rl_agent.context(element_info)
+        strategies = self.rl_agent.order(element_info['locator_strategies'], context)
+        if self.locator_mode == "race":
+            result = self.locator_resolver.resolve(strategies, timeout)
+            tried, _ = self.locator_resolver.locators(strategies)
+            self.rl_agent.observe(context, tried, result.strategy if result else None)
+            if result:
+                element_info['resolved_strategy'] = result.strategy
+                return result.element
+            return self._heal_element(element_info)
+
         with ThreadPoolExecutor() as executor:
             futures = {
                 executor.submit(
@@ -101,7 +146,7 @@ class SelfHealingFramework:
                     locator, 
                     timeout
                 ): strategy 
-                for strategy, locator in element_info['locator_strategies'].items() 
+                for strategy, locator in strategies.items() 
                 if locator
             }
 
@@ -109,22 +154,54 @@ class SelfHealingFramework:
                 element = future.result()
                 if element:
                     strategy_used = futures[future]
-                    self.rl_agent.update_q_table(strategy_used, 1)  # Reward successful strategy
+                    element_info['resolved_strategy'] = strategy_used
+                    self.rl_agent.observe(context, list(futures.values()), strategy_used)
                     return element
+            self.rl_agent.observe(context, list(futures.values()), None)
 
         # If all strategies fail, attempt healing
         return self._heal_element(element_info)
 
+    def _recall_healed_element(self, element_info: Dict) -> Any:
+        """Try the heal remembered for this element's original locators (one resolver tick)."""
+        original_strategies = element_info.get('original_strategies', element_info['locator_strategies'])
+        remembered = self.locator_memory.lookup(original_strategies)
+        if not remembered or remembered == element_info['locator_strategies']:
+            return None
+        result = self.locator_resolver.resolve(remembered, timeout=0)
+        if not result:
+            return None
+        element_info['original_strategies'] = dict(original_strategies)
+        element_info['locator_strategies'] = remembered
+        element_info['resolved_strategy'] = result.strategy
+        return result.element
+
+    def _record_memory_hit(self, element_info: Dict) -> None:
+        """Count a run that reused a remembered heal."""
+        if self.locator_memory is not None and 'original_strategies' in element_info and element_info.get('resolved_strategy'):
+            self.locator_memory.record_hit(element_info['original_strategies'])
+
     def _heal_element(self, element_info: Dict) -> Any:
         """Attempt to heal a broken element locator."""
         try:
+            if self.locator_memory is not None:
+                element = self._recall_healed_element(element_info)
+                if element is not None:
+                    self.logger.info("Reused a remembered heal")
+                    return element
+
             original_attributes = self._get_original_attributes(element_info)
             page_elements = self._get_all_page_elements()
 
             best_match = self.element_healer.heal_element(original_attributes, page_elements)
             if best_match:
+                original_strategies = element_info.get('original_strategies', element_info['locator_strategies'])
                 self._update_locator_strategies(element_info, best_match)
-                return best_match['element']
+                if self.locator_memory is not None:
+                    self.locator_memory.remember(
+                        original_strategies, element_info['locator_strategies'], best_match.get('score', 0.0)
+                    )
+                return resolve_element(best_match['element'])
             
             raise HealingFailedError("Element healing failed - no suitable match found")
         except Exception as e:
@@ -156,7 +233,8 @@ class SelfHealingFramework:
 
         self.healing_history[element_info['ID']] = {
             'timestamp': datetime.now().isoformat(),
-            'original_strategies': element_info['locator_strategies'].copy(),
+            # The mapped strategies: they key the locator memory entry a rejection removes
+            'original_strategies': element_info.get('original_strategies', element_info['locator_strategies']).copy(),
             'new_strategies': new_strategies,
             'matched_attributes': new_element['attributes'],
             'note': "Element was healed using semantic matching"
@@ -177,32 +255,9 @@ class SelfHealingFramework:
 
     def _get_all_page_elements(self) -> list:
         """Get all elements from the current page with their attributes."""
-        elements = []
-        for element in self.driver.find_elements(By.XPATH, "//*"):
-            try:
-                tag_name = element.tag_name.lower()
-                if tag_name in ['label', 'div', 'span']:  # Skip common non-interactive elements
-                    continue
-
-                xpath = get_xpath(element)
-
-                element_data = {
-                    'element': element,
-                    'attributes': {
-                        'id': element.get_attribute('id') or '',
-                        'tag_name': element.tag_name,
-                        'class_name': element.get_attribute('class') or '',
-                        'text': element.text or '',
-                        'type': element.get_attribute('type') or '',
-                        'name': element.get_attribute('name') or '',
-                        'xpath': xpath
-                    }
-                }
-                elements.append(element_data)
-            except Exception as e:
-                self.logger.warning(f"Could not get attributes for element: {str(e)}")
-                continue
-        return elements
+        # Skip common non-interactive elements; the snapshot is a single execute_script round-trip
+        snapshot = DomSnapshot.capture(self.driver, skip_tags=['label', 'div', 'span'])
+        return snapshot.page_elements(xpath_key='xpath')
 
     def get_healing_report(self) -> str:
         """Generate report of all healing actions."""
@@ -212,6 +267,11 @@ class SelfHealingFramework:
 
     def close(self) -> None:
         """Clean up resources."""
-        if self.driver:
+        if self.browser_worker is not None:
+            # Reset and return the browser to the pool instead of quitting it
+            get_browser_pool().release(self.browser_worker)
+            self.browser_worker = None
+            self.driver = None
+        elif self.driver:
             self.driver.quit()
             self.driver = None
\ No newline at end of file
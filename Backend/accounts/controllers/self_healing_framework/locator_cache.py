@@ -0,0 +1,175 @@
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from ..locator_memory import locator_key
+from .locator_resolver import LocatorResolver, RESOLVE_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+# Steps kept per process, and page structures remembered per step
+MAX_CACHED_STEPS = 1024
+MAX_FINGERPRINTS_PER_STEP = 4
+
+# Only the page skeleton counts: tag names and ids down to this depth under <body>, so text,
+# attribute and style updates keep the fingerprint while layout changes invalidate it.
+FINGERPRINT_DEPTH = 6
+FINGERPRINT_MAX_ELEMENTS = 3000
+
+# (project, URL pattern, step, mapped locators key) -> OrderedDict(fingerprint -> (strategy, [[kind, value], ...]))
+_locators = OrderedDict()
+_locators_lock = threading.Lock()
+
+# Path segments that identify a record rather than a page: numbers, UUIDs and long hex ids
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,})$")
+
+# Computes the structure fingerprint of the page and, when it matches one of the cached
+# fingerprints, resolves that entry's locators with RESOLVE_SCRIPT. Returns [fingerprint, element].
+LOOKUP_SCRIPT = """
+var fingerprints = arguments[0], entries = arguments[1], maxDepth = arguments[2], maxElements = arguments[3];
+var hash = 2166136261, seen = 0;
+var feed = function (text) {
+    for (var c = 0; c < text.length; c++) {
+        hash ^= text.charCodeAt(c);
+        hash = Math.imul(hash, 16777619) >>> 0;
+    }
+};
+var stack = document.body ? [[document.body, 0]] : [];
+while (stack.length && seen < maxElements) {
+    var item = stack.pop(), node = item[0], depth = item[1];
+    seen++;
+    feed(depth + node.tagName + (node.id ? '#' + node.id : '') + ';');
+    if (depth < maxDepth) {
+        for (var i = node.children.length - 1; i >= 0; i--) { stack.push([node.children[i], depth + 1]); }
+    }
+}
+var fingerprint = hash.toString(16) + ':' + seen;
+var index = fingerprints.indexOf(fingerprint);
+if (index < 0) { return [fingerprint, null]; }
+var hit = (function () {
+""" + RESOLVE_SCRIPT + """
+}).call(null, entries[index]);
+return [fingerprint, hit ? hit[1] : null];
+"""
+
+
+def url_pattern(url: str) -> str:
+    """
+    Page identity of a URL: scheme, host and path without query or fragment, with record ids
+    in the path replaced by ":id" so /orders/41 and /orders/42 share cached locators.
+    """
+    parts = urlsplit(url or "")
+    segments = [":id" if _ID_SEGMENT.match(segment) else segment for segment in parts.path.split("/")]
+    return f"{parts.scheme}://{parts.netloc}{'/'.join(segments)}"
+
+
+def clear_locator_cache():
+    with _locators_lock:
+        _locators.clear()
+
+
+class LocatorCache:
+    """
+    Process-wide cache of resolved locators (never WebElements), keyed by (project, page URL
+    pattern, step, mapped locator strategies) and DOM structure fingerprint. A lookup is a
+    single in-page script that fingerprints the page and re-resolves the cached locator, so
+    entries survive navigation and re-renders and are shared by every scenario of a run;
+    stale entries are dropped on the spot. Editing a step's mapping changes its key, so the
+    edited locators are used right away.
+    """
+
+    def __init__(self, driver, project_id=None):
+        self.driver = driver
+        self.project_id = project_id
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, url: str, step: str, element_info: Dict) -> Tuple:
+        # The mapped strategies, also when a remembered heal replaced them for this run
+        mapped = element_info.get('original_strategies', element_info.get('locator_strategies'))
+        return self.project_id, url_pattern(url), step, locator_key(mapped)
+
+    def lookup(self, url: str, step: str, element_info: Dict) -> Tuple[Any, Optional[str]]:
+        """
+        Return (element, fingerprint); element is None on a miss. The fingerprint is passed
+        back to store(). On a hit element_info['resolved_strategy'] names the cached strategy.
+        """
+        key = self._key(url, step, element_info)
+        with _locators_lock:
+            by_fingerprint = _locators.get(key)
+            if by_fingerprint is not None:
+                _locators.move_to_end(key)
+            fingerprints = list(by_fingerprint or ())
+            entries = [by_fingerprint[fingerprint] for fingerprint in fingerprints]
+
+        try:
+            fingerprint, element = self.driver.execute_script(
+                LOOKUP_SCRIPT, fingerprints, [locators for _, locators in entries],
+                FINGERPRINT_DEPTH, FINGERPRINT_MAX_ELEMENTS
+            )
+        except WebDriverException as e:
+            logger.debug(f"Locator cache lookup failed: {e}")
+            self.misses += 1
+            return None, None
+
+        if element is None:
+            self.misses += 1
+            if fingerprint in fingerprints:
+                # Same page structure but the locator no longer resolves
+                self._invalidate(key, fingerprint)
+            return None, fingerprint
+
+        self.hits += 1
+        strategy = entries[fingerprints.index(fingerprint)][0]
+        if strategy:
+            element_info['resolved_strategy'] = strategy
+        else:
+            element_info.pop('resolved_strategy', None)
+        return element, fingerprint
+
+    def store(self, url: str, fingerprint: Optional[str], step: str, element_info: Dict) -> None:
+        """Remember how the element of a step was found on this page structure."""
+        if fingerprint is None:
+            return
+        locators = self.locators_for(element_info)
+        if not locators:
+            return
+        strategy = element_info.get('resolved_strategy')
+        if strategy not in element_info.get('locator_strategies', {}):
+            strategy = None
+        key = self._key(url, step, element_info)
+        with _locators_lock:
+            by_fingerprint = _locators.setdefault(key, OrderedDict())
+            by_fingerprint[fingerprint] = (strategy, locators)
+            by_fingerprint.move_to_end(fingerprint)
+            while len(by_fingerprint) > MAX_FINGERPRINTS_PER_STEP:
+                by_fingerprint.popitem(last=False)
+            _locators.move_to_end(key)
+            while len(_locators) > MAX_CACHED_STEPS:
+                _locators.popitem(last=False)
+
+    @staticmethod
+    def _invalidate(key: Tuple, fingerprint: str) -> None:
+        with _locators_lock:
+            by_fingerprint = _locators.get(key)
+            if by_fingerprint is not None:
+                by_fingerprint.pop(fingerprint, None)
+                if not by_fingerprint:
+                    del _locators[key]
+
+    @staticmethod
+    def locators_for(element_info: Dict) -> List[List[str]]:
+        """The winning locator when the resolver recorded one, otherwise every locator in priority order."""
+        strategies = element_info.get('locator_strategies', {})
+        resolved = element_info.get('resolved_strategy')
+        if resolved in strategies:
+            _, locators = LocatorResolver.locators({resolved: strategies[resolved]})
+            if locators:
+                return locators
+        _, locators = LocatorResolver.locators(strategies)
+        return locators
@@ -0,0 +1,125 @@
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# Mapping strategy names (as stored in locator_strategies) -> lookup kind understood by RESOLVE_SCRIPT
+STRATEGY_KINDS = {
+    'id': 'id',
+    'name': 'name',
+    'css selector': 'css',
+    'css': 'css',
+    'xpath (absolute)': 'xpath',
+    'xpath': 'xpath',
+    'class name': 'class',
+    'tag name': 'tag',
+    'link text': 'link',
+}
+
+# Evaluates every locator in priority order and returns [position, element] of the first
+# that matches, or null. Invalid selectors only disqualify their own strategy.
+RESOLVE_SCRIPT = """
+var locators = arguments[0];
+for (var i = 0; i < locators.length; i++) {
+    var kind = locators[i][0], value = locators[i][1], el = null;
+    try {
+        if (kind === 'id') {
+            el = document.getElementById(value);
+        } else if (kind === 'name') {
+            el = document.getElementsByName(value)[0] || null;
+        } else if (kind === 'css') {
+            el = document.querySelector(value);
+        } else if (kind === 'xpath') {
+            el = document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        } else if (kind === 'class') {
+            el = document.getElementsByClassName(value)[0] || null;
+        } else if (kind === 'tag') {
+            el = document.getElementsByTagName(value)[0] || null;
+        } else if (kind === 'link') {
+            el = Array.prototype.find.call(document.links, function (a) { return a.innerText.trim() === value; }) || null;
+        }
+    } catch (e) {
+        el = null;
+    }
+    if (el && el.nodeType === 1) { return [i, el]; }
+}
+return null;
+"""
+
+
+class LocatorResult:
+    """Element found by the resolver, the strategy that won and how long resolution took."""
+
+    def __init__(self, element, strategy: str, elapsed: float, polls: int):
+        self.element = element
+        self.strategy = strategy
+        self.elapsed = elapsed
+        self.polls = polls
+
+    def __repr__(self):
+        return f"LocatorResult(strategy={self.strategy!r}, elapsed={self.elapsed:.3f}s, polls={self.polls})"
+
+
+class LocatorResolver:
+    """
+    Races all locator strategies of an element: one in-page script per poll tick evaluates
+    every strategy, and the first hit is returned at once. There are no per-strategy
+    waits to cancel, so a broken primary locator costs one tick instead of its timeout.
+    Winning strategies are counted in self.wins.
+    """
+
+    def __init__(self, driver, poll_interval: float = 0.1):
+        self.driver = driver
+        self.poll_interval = poll_interval
+        self.wins = Counter()
+
+    @staticmethod
+    def locators(strategies: Dict[str, str]) -> Tuple[List[str], List[List[str]]]:
+        """Strategy names and [kind, value] pairs for the strategies the script supports."""
+        names, locators = [], []
+        for strategy, value in strategies.items():
+            kind = STRATEGY_KINDS.get(str(strategy).lower())
+            if kind is None or not value:
+                continue
+            names.append(strategy)
+            locators.append([kind, str(value)])
+        return names, locators
+
+    def resolve(self, strategies: Dict[str, str], timeout: float = 10) -> Optional[LocatorResult]:
+        """Poll until one strategy matches or the timeout expires."""
+        if not self.driver:
+            raise ValueError("WebDriver not initialized")
+
+        names, locators = self.locators(strategies)
+        if not locators:
+            return None
+
+        start = time.monotonic()
+        deadline = start + timeout
+        polls = 0
+        while True:
+            polls += 1
+            hit = self._evaluate(locators)
+            if hit:
+                strategy = names[int(hit[0])]
+                self.wins[strategy] += 1
+                result = LocatorResult(hit[1], strategy, time.monotonic() - start, polls)
+                logger.debug(f"Resolved element with {result}")
+                return result
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.info(f"No locator strategy matched within {timeout}s: {names}")
+                return None
+            time.sleep(min(self.poll_interval, remaining))
+
+    def _evaluate(self, locators: List[List[str]]) -> Optional[List[Any]]:
+        try:
+            return self.driver.execute_script(RESOLVE_SCRIPT, locators)
+        except WebDriverException as e:
+            # The page may be navigating; try again on the next tick
+            logger.debug(f"Locator script failed: {e}")
+            return None
@@ -3,8 +3,9 @@ import logging
 
 class MappingLoader:
     """Handles loading and processing BDD step mappings."""
-    def __init__(self, mapping: List[Dict]):
+    def __init__(self, mapping: List[Dict], locator_memory=None):
         self.mapping = mapping
+        self.locator_memory = locator_memory
         self.logger = logging.getLogger(__name__)
 
     def load_mappings(self) -> Dict:
@@ -30,6 +31,9 @@ class MappingLoader:
                     'Page': link,
                     'locator_strategies': self._generate_locator_strategies(element_id, css, xpath, full_xpath)
                 }
+                if self.locator_memory is not None:
+                    # Start from the remembered heal instead of rediscovering it
+                    self.locator_memory.apply(mappings[bdd_step])
             except Exception as e:
                 self.logger.warning(f"Error processing mapping row: {str(e)}")
                 continue
@@ -0,0 +1,125 @@
+import logging
+import time
+from typing import Dict, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# Installed in every document (before page scripts when DevTools is available): counts in-flight
+# fetch/XHR requests and records the time of the last DOM mutation.
+HOOK_SCRIPT = """
+(function () {
+    if (window.__selfHealingReadiness) { return; }
+    var state = window.__selfHealingReadiness = {inflight: 0, lastMutation: performance.now()};
+    var done = function () { state.inflight = Math.max(0, state.inflight - 1); };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.inflight++;
+            return originalFetch.apply(this, arguments).then(
+                function (response) { done(); return response; },
+                function (error) { done(); throw error; }
+            );
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.inflight++;
+        this.addEventListener('loadend', done);
+        return originalSend.apply(this, arguments);
+    };
+    var observe = function () {
+        new MutationObserver(function () { state.lastMutation = performance.now(); })
+            .observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    };
+    if (document.documentElement) { observe(); } else { document.addEventListener('DOMContentLoaded', observe); }
+})();
+"""
+
+# [readyState, in-flight requests, milliseconds since the last DOM mutation]
+PAGE_STATE_SCRIPT = HOOK_SCRIPT + """
+var state = window.__selfHealingReadiness;
+return [document.readyState, state.inflight, performance.now() - state.lastMutation];
+"""
+
+# True once the element is attached, visible, enabled and not covered by another element
+INTERACTABLE_SCRIPT = """
+var el = arguments[0], requireEnabled = arguments[1];
+if (!el || !el.isConnected) { return false; }
+var rect = el.getBoundingClientRect(), style = window.getComputedStyle(el);
+if (rect.width <= 0 || rect.height <= 0 || style.visibility === 'hidden' || style.display === 'none') { return false; }
+if (!requireEnabled) { return true; }
+if (el.disabled || style.pointerEvents === 'none') { return false; }
+var x = rect.left + rect.width / 2, y = rect.top + rect.height / 2;
+if (x < 0 || y < 0 || x > window.innerWidth || y > window.innerHeight) {
+    el.scrollIntoView({block: 'center', inline: 'center'});
+    rect = el.getBoundingClientRect();
+    x = rect.left + rect.width / 2;
+    y = rect.top + rect.height / 2;
+}
+var top = document.elementFromPoint(x, y);
+return !!top && (top === el || el.contains(top) || top.contains(el) || (el.labels && Array.prototype.indexOf.call(el.labels, top) >= 0));
+"""
+
+
+class ReadinessWaiter:
+    """
+    Waits on concrete page signals instead of fixed sleeps and returns as soon as they hold:
+    document.readyState is "complete", no fetch/XHR request is in flight, the DOM has not
+    changed for quiet_ms, and (for a located element) the element is interactable.
+    Every wait is capped at max_wait seconds and the time spent is recorded per step.
+    """
+
+    def __init__(self, driver, max_wait: float = 10.0, quiet_ms: int = 300, poll_interval: float = 0.05):
+        self.driver = driver
+        self.max_wait = max_wait
+        self.quiet_ms = quiet_ms
+        self.poll_interval = poll_interval
+        self.timings: List[Dict] = []
+        self._hook_driver = None
+
+    def install(self) -> None:
+        """Register the request/mutation hook for every new document (Chrome DevTools only)."""
+        if self._hook_driver is self.driver or not hasattr(self.driver, "execute_cdp_cmd"):
+            return
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": HOOK_SCRIPT})
+            self._hook_driver = self.driver
+        except WebDriverException as e:
+            logger.debug(f"Could not register the readiness hook: {e}")
+
+    def wait_for_page(self, max_wait: Optional[float] = None) -> float:
+        """Wait until the page is loaded, the network is idle and the DOM is quiet. Returns the seconds waited."""
+        self.install()
+        return self._poll(self._page_ready, max_wait, "page")
+
+    def wait_for_element(self, element, require_enabled: bool = True, max_wait: Optional[float] = None) -> float:
+        """Wait until the element can be interacted with (or only seen, without require_enabled)."""
+        return self._poll(lambda: self.driver.execute_script(INTERACTABLE_SCRIPT, element, require_enabled),
+                          max_wait, "element")
+
+    def record(self, step: str, **waits: float) -> Dict:
+        timing = {"step": step, **{name: round(seconds, 3) for name, seconds in waits.items()}}
+        self.timings.append(timing)
+        return timing
+
+    def _page_ready(self) -> bool:
+        ready_state, inflight, quiet_for = self.driver.execute_script(PAGE_STATE_SCRIPT)
+        return ready_state == "complete" and inflight == 0 and quiet_for >= self.quiet_ms
+
+    def _poll(self, condition, max_wait: Optional[float], what: str) -> float:
+        max_wait = self.max_wait if max_wait is None else max_wait
+        start = time.monotonic()
+        while True:
+            try:
+                if condition():
+                    return time.monotonic() - start
+            except WebDriverException as e:
+                # Navigation in progress or a stale element; check again on the next tick
+                logger.debug(f"Readiness check failed: {e}")
+            elapsed = time.monotonic() - start
+            if elapsed >= max_wait:
+                logger.info(f"Gave up waiting for {what} readiness after {max_wait}s")
+                return elapsed
+            time.sleep(min(self.poll_interval, max_wait - elapsed))
@@ -1,35 +1,84 @@
-import numpy as np
-from typing import List
 import logging
+import random
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .locator_cache import url_pattern
+
+ANY = '*'
+
+# A context needs this many observations of a strategy before its own statistics are used;
+# until then the page-wide, then project-wide statistics of the strategy stand in.
+MIN_CONTEXT_OBSERVATIONS = 5
+
+_XPATH_TAG = re.compile(r"^\s*([A-Za-z][\w-]*)")
+
+
+def element_tag(element_info: Dict) -> str:
+    """Tag type of a mapped element, read from the last step of its absolute XPath."""
+    xpath = element_info.get('XPath (Absolute)') or element_info.get('locator_strategies', {}).get('XPath (Absolute)') or ''
+    match = _XPATH_TAG.match(str(xpath).rstrip('/').rsplit('/', 1)[-1])
+    return match.group(1).lower() if match else ANY
+
 
 class RLHealingAgent:
-    """Reinforcement learning agent for strategy selection."""
-    def __init__(self, strategies: List[str]):
+    """
+    Contextual Thompson-sampling bandit that orders locator strategies. Every (page URL
+    pattern, tag type, strategy) arm keeps success/failure counts under a Beta(1, 1) prior,
+    and order() tries the strategies by a sample of their success rate. Statistics are per
+    project: accounts/controllers/strategy_stats.py loads them from StrategyStat rows and
+    saves self.pending, the counts observed since the last save.
+    """
+
+    def __init__(self, strategies: List[str], stats: Optional[Iterable[Tuple[str, str, str, int, int]]] = None,
+                 rng: Optional[random.Random] = None):
         self.strategies = strategies
-        self.q_table = np.zeros(len(strategies))
-        self.learning_rate = 0.1
-        self.discount_factor = 0.9
-        self.epsilon = 0.1
+        self.rng = rng or random.Random()
         self.logger = logging.getLogger(__name__)
+        # (page, tag, strategy) -> [successes, failures], including the page-wide (page, ANY)
+        # and project-wide (ANY, ANY) sums used as a fallback for sparse contexts
+        self.totals = defaultdict(lambda: [0, 0])
+        # (page, tag, strategy) -> [successes, failures] not saved yet
+        self.pending = defaultdict(lambda: [0, 0])
+        for page, tag, strategy, successes, failures in stats or ():
+            self._count(page, tag, strategy, successes, failures)
+
+    @staticmethod
+    def context(element_info: Dict) -> Tuple[str, str]:
+        """(page URL pattern, tag type) of a mapped element."""
+        return url_pattern(element_info.get('Page', ''))[:255], element_tag(element_info)
+
+    def order(self, strategies: Dict[str, str], context: Tuple[str, str]) -> Dict[str, str]:
+        """The strategies, most likely to hit in this context first."""
+        samples = {name: self._sample(context, name) for name in strategies}
+        return {name: strategies[name] for name in sorted(strategies, key=samples.get, reverse=True)}
+
+    def observe(self, context: Tuple[str, str], tried: List[str], winner: Optional[str]) -> None:
+        """
+        Record one lookup over the strategies in the order they were tried: the ones before
+        the winner missed and the winner hit. Without a winner every strategy missed.
+        """
+        page, tag = context
+        for name in tried:
+            hit = name == winner
+            self._count(page, tag, name, int(hit), int(not hit))
+            pending = self.pending[(page, tag, name)]
+            pending[0] += int(hit)
+            pending[1] += int(not hit)
+            if hit:
+                break
+
+    def _sample(self, context: Tuple[str, str], strategy: str) -> float:
+        page, tag = context
+        for key in ((page, tag, strategy), (page, ANY, strategy), (ANY, ANY, strategy)):
+            successes, failures = self.totals.get(key, (0, 0))
+            if successes + failures >= MIN_CONTEXT_OBSERVATIONS:
+                break
+        return self.rng.betavariate(1 + successes, 1 + failures)
 
-    def choose_strategy(self) -> str:
-        """Choose a strategy using epsilon-greedy policy."""
-        try:
-            if np.random.uniform(0, 1) < self.epsilon:
-                return np.random.choice(self.strategies)
-            return self.strategies[np.argmax(self.q_table)]
-        except Exception as e:
-            self.logger.error(f"Error choosing strategy: {str(e)}")
-            return self.strategies[0]  # Fallback to first strategy
-
-    def update_q_table(self, strategy: str, reward: float) -> None:
-        """Update Q-table based on the reward."""
-        try:
-            if strategy not in self.strategies:
-                self.logger.warning(f"Unknown strategy: {strategy}")
-                return
-                
-            strategy_index = self.strategies.index(strategy)
-            self.q_table[strategy_index] += self.learning_rate * (reward - self.q_table[strategy_index])
-        except Exception as e:
-            self.logger.error(f"Error updating Q-table: {str(e)}")
\ No newline at end of file
+    def _count(self, page: str, tag: str, strategy: str, successes: int, failures: int) -> None:
+        for key in {(page, tag, strategy), (page, ANY, strategy), (ANY, ANY, strategy)}:
+            counts = self.totals[key]
+            counts[0] += successes
+            counts[1] += failures
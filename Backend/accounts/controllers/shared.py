@@ -1,6 +1,65 @@
-from transformers import AutoTokenizer, AutoModel
+from .model_registry import registry
 
-# Load E5 model
+# E5 embedding model and BART summarizer, loaded on first use (or at server start, see MODEL_REGISTRY['WARMUP'])
 model_name = "intfloat/e5-large-v2"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModel.from_pretrained(model_name)
\ No newline at end of file
+summarizer_model_name = "facebook/bart-large-cnn"
+
+
+def _load_embedding_service():
+    from transformers import AutoTokenizer
+    from .embedding_service import EmbeddingService
+    from .inference_backend import load_transformer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    # fp32, dynamic int8 or ONNX depending on settings.INFERENCE_BACKEND
+    model, backend = load_transformer(model_name)
+    return EmbeddingService(tokenizer, model, model_name=model_name, backend=backend)
+
+
+def _load_summarizer():
+    from transformers import pipeline
+
+    return pipeline("summarization", model=summarizer_model_name)
+
+
+registry.register("e5", _load_embedding_service)
+registry.register("summarizer", _load_summarizer)
+
+# Batched, cached embedding service shared by the BDD, HTML and mapping stages
+embedding_service = registry.proxy("e5")
+
+
+def get_summarizer():
+    """
+    Return the shared summarization pipeline (a leasing proxy, see LazyModel), or None when
+    it can't be loaded.
+    """
+    try:
+        registry.get("summarizer")
+    except Exception as e:
+        print(f"Failed to load summarization model: {e}")
+        return None
+    return registry.proxy("summarizer")
+
+
+def get_sentence_model(model_name_or_path):
+    """
+    Return the shared SentenceTransformer for a hub name or local (fine-tuned) path,
+    wrapped with the persistent embedding cache. A new fine-tuned revision on disk
+    replaces the loaded instance. The model is loaded here (so load errors surface to the
+    caller) and returned as a leasing proxy that the healing framework can hold for a run.
+    """
+    from .embedding_cache import model_revision
+    from .inference_backend import get_inference_backend
+
+    def load():
+        from .embedding_cache import CachedSentenceEncoder
+        from .inference_backend import load_sentence_transformer
+
+        model, backend = load_sentence_transformer(model_name_or_path)
+        return CachedSentenceEncoder(model, model_name_or_path, backend=backend)
+
+    version = f"{model_revision(model_name_or_path)}:{get_inference_backend()}"
+    name = f"sentence:{model_name_or_path}"
+    registry.get(name, load, version=version)
+    return registry.proxy(name, load, version=version)
@@ -0,0 +1,39 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from ..models import StrategyStat
+from .self_healing_framework.rl_healing_agent import RLHealingAgent
+
+STRATEGIES = ['id', 'CSS Selector', 'XPath (Absolute)']
+
+
+def load_strategy_agent(project, rng=None):
+    """
+    Strategy-ordering agent seeded with everything the project's runs have observed so far.
+    """
+    stats = StrategyStat.objects.filter(project=project).values_list(
+        'page_pattern', 'tag_name', 'strategy', 'successes', 'failures'
+    )
+    return RLHealingAgent(STRATEGIES, stats=stats, rng=rng)
+
+
+def save_strategy_stats(project, agent):
+    """
+    Add the agent's unsaved observations to the project's statistics. Counts are incremented
+    with F() expressions, so concurrent runs of the same project do not lose updates.
+    Returns the number of (page, tag, strategy) rows touched.
+    """
+    saved = 0
+    for (page, tag, strategy), (successes, failures) in agent.pending.items():
+        lookup = {'project': project, 'page_pattern': page, 'tag_name': tag, 'strategy': strategy}
+        increment = {'successes': F('successes') + successes, 'failures': F('failures') + failures}
+        if not StrategyStat.objects.filter(**lookup).update(**increment):
+            try:
+                with transaction.atomic():
+                    StrategyStat.objects.create(successes=successes, failures=failures, **lookup)
+            except IntegrityError:
+                # Another run created the row first
+                StrategyStat.objects.filter(**lookup).update(**increment)
+        saved += 1
+    agent.pending.clear()
+    return saved
@@ -0,0 +1,189 @@
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+
+from .embedding_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+NO_DESCRIPTION = "No description available"
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'summaries.sqlite3')
+
+
+def summary_lengths(text):
+    """
+    max_length/min_length passed to the pipeline for a text (summaries of at most 50 tokens, or as long as the text when shorter).
+    """
+    max_length = min(50, len(text.split()))
+    min_length = min(25, max_length // 2)
+    return max_length, min_length
+
+
+class SummaryCache:
+    """
+    Persistent summary cache in a small SQLite database, keyed by the model, the
+    generation lengths and the content hash of the normalized text.
+    SQLite handles locking between the worker processes sharing the file.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, summary TEXT NOT NULL)"
+            )
+
+    @staticmethod
+    def key(model_name, text, max_length, min_length):
+        payload = f"{model_name}\x00{max_length}\x00{min_length}\x00{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, keys):
+        """
+        Return {key: summary} for the keys present in the cache.
+        """
+        found = {}
+        keys = list(keys)
+        with self.lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self.connection.execute(
+                    f"SELECT key, summary FROM summaries WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def store(self, items):
+        """
+        Persist {key: summary} pairs.
+        """
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO summaries (key, summary) VALUES (?, ?)", list(items.items())
+            )
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM summaries")
+
+
+class SummarizationStage:
+    """
+    Semantic description stage of the mapping pipeline.
+    Every unique text is summarized once: cached summaries are reused and the remaining
+    texts go through the pipeline in batches of texts that share generation lengths.
+    When summarization is disabled, or the model is unavailable, every text gets the
+    fallback description.
+    """
+
+    def __init__(self, summarizer_getter, model_name, cache=None, batch_size=8):
+        self.summarizer_getter = summarizer_getter
+        self.model_name = model_name
+        self.cache = cache
+        self.batch_size = batch_size
+
+    def summarize(self, texts, enabled=True, fallback=NO_DESCRIPTION):
+        """
+        Return one description per text, in input order.
+        """
+        texts = [text if isinstance(text, str) else str(text) for text in texts]
+        if not enabled or not texts:
+            return [fallback] * len(texts)
+
+        # One entry per unique text
+        keys = {}
+        for text in texts:
+            if text not in keys:
+                keys[text] = SummaryCache.key(self.model_name, text, *summary_lengths(text))
+
+        summaries = {}
+        if self.cache is not None:
+            cached = self.cache.lookup(set(keys.values()))
+            summaries = {text: cached[key] for text, key in keys.items() if key in cached}
+
+        misses = [text for text in keys if text not in summaries]
+        if misses:
+            summarizer = self.summarizer_getter()
+            if summarizer is None:
+                return [summaries.get(text, fallback) for text in texts]
+            fresh = self._run(summarizer, misses)
+            summaries.update(fresh)
+            if self.cache is not None and fresh:
+                self.cache.store({keys[text]: summary for text, summary in fresh.items()})
+
+        return [summaries.get(text, fallback) for text in texts]
+
+    def _run(self, summarizer, texts):
+        # Texts sharing max_length/min_length can go through the pipeline in one call
+        groups = defaultdict(list)
+        for text in texts:
+            groups[summary_lengths(text)].append(text)
+
+        results = {}
+        for (max_length, min_length), group in groups.items():
+            try:
+                outputs = summarizer(
+                    group,
+                    max_length=max_length,
+                    min_length=min_length,
+                    do_sample=False,
+                    truncation=True,
+                    batch_size=self.batch_size
+                )
+            except Exception as e:
+                logger.error(f"Summarization failed for {len(group)} texts: {e}")
+                continue
+            for text, output in zip(group, outputs):
+                results[text] = output['summary_text']
+        return results
+
+
+_stage = None
+_stage_lock = threading.Lock()
+
+
+def _summary_settings():
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return getattr(settings, "SUMMARY_CACHE", {})
+    except ImportError:
+        pass
+    return {}
+
+
+def get_summarization_stage():
+    """
+    Return the process-wide summarization stage, backed by the shared summarizer model.
+    """
+    global _stage
+    with _stage_lock:
+        if _stage is None:
+            from .shared import get_summarizer, summarizer_model_name
+
+            config = _summary_settings()
+            cache = SummaryCache(config.get("PATH", DEFAULT_CACHE_PATH)) if config.get("ENABLED", True) else None
+            _stage = SummarizationStage(
+                get_summarizer,
+                summarizer_model_name,
+                cache=cache,
+                batch_size=config.get("BATCH_SIZE", 8)
+            )
+        return _stage
+
+
+def summarize(texts, enabled=True, fallback=NO_DESCRIPTION):
+    """
+    Semantic descriptions of texts through the shared, cached summarization stage.
+    """
+    if not enabled:
+        return [fallback] * len(texts)
+    return get_summarization_stage().summarize(texts, fallback=fallback)
@@ -0,0 +1,72 @@
+"""
+Conditional GETs and a small per-process response cache for the endpoints the dashboard polls.
+
+A cached view reads the version of the rows its body is built from (a scenario's version, a
+project's data_version and updated_at) with the row lookup it does anyway, and hands it to
+cached_response() with a function that builds the body:
+- the ETag and Last-Modified headers come from that version, so a client that sends them
+  back gets 304 Not Modified without any further query or serialization
+- other clients get the body this process last built for the same version
+- only a changed version builds the body again
+
+Writes bump the versions in the database (accounts/signals.py), so a cached body is never
+served after a write, whichever process made it.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+MAX_CACHED_RESPONSES = 256
+
+# (name, key) -> (etag, body), least recently used first
+_responses = OrderedDict()
+_lock = threading.Lock()
+
+
+def make_etag(name, key, version, last_modified):
+    # The timestamp keeps ETags distinct when a deleted row's id and version are reused
+    validator = f"{name}:{key}:{version}:{last_modified.isoformat() if last_modified else ''}"
+    return f'"{hashlib.sha1(validator.encode("utf-8")).hexdigest()}"'
+
+
+def cached_response(request, name, key, version, last_modified, build):
+    """
+    Response to a GET of `name` for `key` (a scenario or project id) whose rows are at
+    `version`, last modified at `last_modified`: 304 when the client's copy is current,
+    else the cached body of this version, else build() stored in the cache.
+    """
+    etag = make_etag(name, key, version, last_modified)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        body = None
+        with _lock:
+            entry = _responses.get((name, key))
+            if entry is not None and entry[0] == etag:
+                _responses.move_to_end((name, key))
+                body = entry[1]
+        if body is None:
+            body = build()
+            with _lock:
+                _responses[(name, key)] = (etag, body)
+                _responses.move_to_end((name, key))
+                while len(_responses) > MAX_CACHED_RESPONSES:
+                    _responses.popitem(last=False)
+        response = Response(body, status=200)
+
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    # Browsers keep the body but revalidate it on every poll
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def clear_response_cache():
+    with _lock:
+        _responses.clear()
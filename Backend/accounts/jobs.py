@@ -0,0 +1,264 @@
+"""
+Database-backed background job queue.
+
+Endpoints that run browsers, models or fine-tuning enqueue a Job and return its id at once;
+`python manage.py run_jobs` worker processes claim queued jobs (SELECT ... FOR UPDATE SKIP
+LOCKED where the database supports it), run the registered handler and store its response
+body and HTTP status on the job. No external broker is needed.
+
+With settings.JOBS['EAGER'] jobs run inside enqueue(), which keeps tests and single-process
+development setups working without a worker.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'PENDING'
+
+# kind -> (handler, max_attempts); handlers are registered with @job_handler in accounts/tasks.py
+_handlers = {}
+
+
+def job_settings():
+    return getattr(settings, 'JOBS', {})
+
+
+def job_handler(kind, max_attempts=1):
+    """
+    Register handler(ctx, payload) -> (response body, HTTP status) for a job kind.
+    """
+    def decorator(func):
+        _handlers[kind] = (func, max_attempts)
+        return func
+    return decorator
+
+
+def get_handler(kind):
+    from . import tasks  # noqa: F401  (registers the handlers)
+
+    if kind not in _handlers:
+        raise KeyError(f"No job handler registered for '{kind}'")
+    return _handlers[kind]
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+class JobContext:
+    """
+    Handed to job handlers to report per-step progress.
+    """
+
+    def __init__(self, job):
+        self.job = job
+
+    def plan(self, names):
+        """Declare the steps of the job up front so clients can show total progress."""
+        self.job.steps = [{"name": name, "status": PENDING} for name in names]
+        self._save()
+
+    @contextmanager
+    def step(self, name):
+        entry = next((step for step in self.job.steps if step["name"] == name), None)
+        if entry is None:
+            entry = {"name": name}
+            self.job.steps.append(entry)
+        entry.update(status=Job.RUNNING, started_at=timezone.now().isoformat())
+        self._save()
+        try:
+            yield
+        except Exception:
+            entry.update(status=Job.FAILED, finished_at=timezone.now().isoformat())
+            self._save()
+            raise
+        entry.update(status=Job.SUCCEEDED, finished_at=timezone.now().isoformat())
+        self._save()
+
+    def _save(self):
+        self.job.heartbeat_at = timezone.now()
+        Job.objects.filter(pk=self.job.pk).update(steps=self.job.steps, heartbeat_at=self.job.heartbeat_at)
+
+
+def enqueue(kind, payload, user=None, project=None):
+    """
+    Queue a job (or run it right away when JOBS['EAGER'] is set) and return it.
+    """
+    _, max_attempts = get_handler(kind)
+    job = Job.objects.create(
+        kind=kind,
+        payload=payload,
+        user=user if user is not None and user.is_authenticated else None,
+        project=project,
+        max_attempts=max_attempts
+    )
+    if job_settings().get('EAGER', False):
+        claimed = claim(job.pk, 'eager')
+        if claimed is not None:
+            run_job(claimed)
+        job.refresh_from_db()
+    return job
+
+
+def claim(job_id, worker):
+    """
+    Atomically move a queued job to RUNNING for this worker; None if another worker got it first.
+    """
+    now = timezone.now()
+    claimed = Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+        status=Job.RUNNING, locked_by=worker, started_at=now, heartbeat_at=now
+    )
+    return Job.objects.get(pk=job_id) if claimed else None
+
+
+def claim_next(worker, kinds=None):
+    """
+    Claim the oldest job that is due, or return None when the queue is empty.
+    """
+    with transaction.atomic():
+        queryset = Job.objects.filter(status=Job.QUEUED, available_at__lte=timezone.now())
+        if kinds:
+            queryset = queryset.filter(kind__in=kinds)
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        job_id = queryset.order_by('created_at', 'job_id').values_list('job_id', flat=True).first()
+        if job_id is None:
+            return None
+        # The conditional update also protects databases without row locks (SQLite)
+        return claim(job_id, worker)
+
+
+class _Heartbeat(threading.Thread):
+    """Touches heartbeat_at while a long step runs, so the job is not taken for a dead worker's."""
+
+    def __init__(self, job_id, interval):
+        super().__init__(name=f"job-{job_id}-heartbeat", daemon=True)
+        self.job_id = job_id
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                Job.objects.filter(pk=self.job_id, status=Job.RUNNING).update(heartbeat_at=timezone.now())
+        finally:
+            connection.close()
+
+
+def run_job(job):
+    """
+    Run a claimed job and record its result, scheduling a retry while attempts remain.
+    """
+    handler, _ = get_handler(job.kind)
+    job.attempts += 1
+    Job.objects.filter(pk=job.pk).update(attempts=job.attempts)
+
+    interval = job_settings().get('HEARTBEAT_SECONDS', 30)
+    heartbeat = _Heartbeat(job.pk, interval) if interval and not job_settings().get('EAGER', False) else None
+    if heartbeat:
+        heartbeat.start()
+    try:
+        body, status = handler(JobContext(job), job.payload)
+    except Exception as e:
+        logger.error(f"Job {job.pk} ({job.kind}) failed: {e}")
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            delay = job_settings().get('RETRY_DELAY_SECONDS', 30) * job.attempts
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.QUEUED, error=error, locked_by='',
+                available_at=timezone.now() + timedelta(seconds=delay)
+            )
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.FAILED, error=error, finished_at=timezone.now(),
+                result={"success": False, "message": f"{job.kind} failed: {e}"}, result_status=500
+            )
+    else:
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.SUCCEEDED, result=body, result_status=status, finished_at=timezone.now()
+        )
+    finally:
+        if heartbeat:
+            heartbeat.stopped.set()
+            heartbeat.join()
+
+
+def requeue_stale_jobs(stale_after=None):
+    """
+    Return RUNNING jobs whose worker stopped sending heartbeats to the queue (or fail them
+    when they have no attempts left). Returns the number of jobs recovered.
+    """
+    stale_after = stale_after or job_settings().get('STALE_AFTER_SECONDS', 600)
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    recovered = 0
+    for job in Job.objects.filter(status=Job.RUNNING, heartbeat_at__lt=cutoff):
+        if job.attempts < job.max_attempts:
+            updated = Job.objects.filter(pk=job.pk, status=Job.RUNNING, heartbeat_at__lt=cutoff).update(
+                status=Job.QUEUED, locked_by='', available_at=timezone.now()
+            )
+        else:
+            updated = Job.objects.filter(pk=job.pk, status=Job.RUNNING, heartbeat_at__lt=cutoff).update(
+                status=Job.FAILED, finished_at=timezone.now(), error=f"Worker {job.locked_by} stopped responding",
+                result={"success": False, "message": "The worker running this job stopped responding"},
+                result_status=500
+            )
+        recovered += updated
+    if recovered:
+        logger.warning(f"Recovered {recovered} stale jobs")
+    return recovered
+
+
+def run_worker(kinds=None, once=False, poll_interval=None, stop_event=None):
+    """
+    Worker loop used by the run_jobs management command.
+    """
+    poll_interval = poll_interval or job_settings().get('POLL_INTERVAL_SECONDS', 1)
+    worker = worker_id()
+    logger.info(f"Job worker {worker} started")
+    while stop_event is None or not stop_event.is_set():
+        close_old_connections()
+        requeue_stale_jobs()
+        job = claim_next(worker, kinds)
+        if job is None:
+            if once:
+                return
+            if stop_event is not None:
+                stop_event.wait(poll_interval)
+            else:
+                time.sleep(poll_interval)
+            continue
+        logger.info(f"Running job {job.pk} ({job.kind})")
+        run_job(job)
+
+
+def progress(job):
+    """
+    Status document of a job for the API.
+    """
+    completed = sum(1 for step in job.steps if step.get("status") == Job.SUCCEEDED)
+    current = next((step["name"] for step in job.steps if step.get("status") == Job.RUNNING), None)
+    return {
+        "job_id": job.job_id,
+        "kind": job.kind,
+        "status": job.status,
+        "steps": job.steps,
+        "progress": {"completed": completed, "total": len(job.steps), "current_step": current},
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "error": job.error.strip().splitlines()[-1] if job.status == Job.FAILED and job.error else None,
+    }
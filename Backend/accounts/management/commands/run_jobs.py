@@ -0,0 +1,38 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from accounts.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a background job worker for the execution, mapping and fine-tuning endpoints. "
+        "Start several processes to run jobs in parallel; each claims one job at a time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+        parser.add_argument('--kinds', nargs='+', help='Only run these job kinds (e.g. execute_tests)')
+        parser.add_argument('--poll-interval', type=float, default=None, help='Seconds between polls of an empty queue')
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def stop(signum, frame):
+            # Finish the current job, then exit
+            self.stdout.write("Stopping after the current job...")
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(f"Job worker started (kinds: {', '.join(options['kinds'] or ['all'])})")
+        run_worker(
+            kinds=options['kinds'],
+            once=options['once'],
+            poll_interval=options['poll_interval'],
+            stop_event=stop_event
+        )
+        self.stdout.write("Job worker stopped")
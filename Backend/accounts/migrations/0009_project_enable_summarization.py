@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_finetuningdata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='enable_summarization',
+            field=models.BooleanField(default=True),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_project_enable_summarization'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogPage',
+            fields=[
+                ('page_id', models.AutoField(primary_key=True, serialize=False)),
+                ('url', models.CharField(max_length=2048)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('embedding_model', models.CharField(max_length=255)),
+                ('summarized', models.BooleanField(default=True)),
+                ('embedding', models.BinaryField()),
+                ('description', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='catalog_pages', to='accounts.project')),
+            ],
+            options={
+                'db_table': 'catalog_page',
+                'ordering': ['-updated_at'],
+                'unique_together': {('project', 'url')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CatalogElement',
+            fields=[
+                ('element_id', models.AutoField(primary_key=True, serialize=False)),
+                ('position', models.PositiveIntegerField()),
+                ('role', models.CharField(max_length=50)),
+                ('content', models.TextField()),
+                ('attributes', models.JSONField()),
+                ('description', models.TextField(blank=True, default='')),
+                ('embedding', models.BinaryField()),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='elements', to='accounts.catalogpage')),
+            ],
+            options={
+                'db_table': 'catalog_element',
+                'ordering': ['page', 'position'],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HealedLocator',
+            fields=[
+                ('healed_locator_id', models.AutoField(primary_key=True, serialize=False)),
+                ('original_key', models.CharField(max_length=64)),
+                ('original_strategies', models.JSONField()),
+                ('healed_strategies', models.JSONField()),
+                ('confidence', models.FloatField(default=0.0)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('last_validated_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='healed_locators', to='accounts.project')),
+            ],
+            options={
+                'db_table': 'healed_locator',
+                'ordering': ['-updated_at'],
+                'unique_together': {('project', 'original_key')},
+            },
+        ),
+    ]
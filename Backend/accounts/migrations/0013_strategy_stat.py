@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_healed_locator'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StrategyStat',
+            fields=[
+                ('strategy_stat_id', models.AutoField(primary_key=True, serialize=False)),
+                ('page_pattern', models.CharField(max_length=255)),
+                ('tag_name', models.CharField(max_length=50)),
+                ('strategy', models.CharField(max_length=50)),
+                ('successes', models.PositiveIntegerField(default=0)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='strategy_stats', to='accounts.project')),
+            ],
+            options={
+                'db_table': 'strategy_stat',
+                'ordering': ['project', 'page_pattern', 'tag_name', 'strategy'],
+                'unique_together': {('project', 'page_pattern', 'tag_name', 'strategy')},
+            },
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+COLUMNS = (
+    ("Step", "step"),
+    ("Page", "page"),
+    ("ID", "element_id"),
+    ("Class", "class_name"),
+    ("Name", "name"),
+    ("Value", "value"),
+    ("XPath (Absolute)", "xpath_absolute"),
+    ("XPath (Relative)", "xpath_relative"),
+    ("CSS Selector", "css_selector"),
+)
+
+
+def copy_mapping_files(apps, schema_editor):
+    Scenarios = apps.get_model('accounts', 'Scenarios')
+    MappingRow = apps.get_model('accounts', 'MappingRow')
+    fields = dict(COLUMNS)
+    for scenario in Scenarios.objects.exclude(mapping_file=None).iterator():
+        mapping = scenario.mapping_file
+        if not isinstance(mapping, list) or not mapping:
+            continue
+        header = [str(column) for column in mapping[0]]
+        rows = []
+        for order, values in enumerate(mapping[1:], start=1):
+            row = MappingRow(scenario=scenario, order=order, extra={})
+            for column, value in zip(header, values):
+                if column in fields:
+                    setattr(row, fields[column], "" if value is None else str(value))
+                else:
+                    row.extra[column] = value
+            rows.append(row)
+        MappingRow.objects.bulk_create(rows)
+
+
+def restore_mapping_files(apps, schema_editor):
+    Scenarios = apps.get_model('accounts', 'Scenarios')
+    MappingRow = apps.get_model('accounts', 'MappingRow')
+    for scenario in Scenarios.objects.iterator():
+        rows = list(MappingRow.objects.filter(scenario=scenario).order_by('order'))
+        extra_columns = []
+        for row in rows:
+            extra_columns.extend(column for column in row.extra if column not in extra_columns)
+        scenario.mapping_file = [[column for column, _ in COLUMNS] + extra_columns] + [
+            [getattr(row, field) for _, field in COLUMNS] + [row.extra.get(column, "") for column in extra_columns]
+            for row in rows
+        ]
+        scenario.save(update_fields=['mapping_file'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_strategy_stat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MappingRow',
+            fields=[
+                ('mapping_row_id', models.AutoField(primary_key=True, serialize=False)),
+                ('order', models.PositiveIntegerField()),
+                ('step', models.TextField(blank=True, default='')),
+                ('page', models.TextField(blank=True, default='')),
+                ('element_id', models.CharField(blank=True, default='', max_length=512)),
+                ('class_name', models.TextField(blank=True, default='')),
+                ('name', models.TextField(blank=True, default='')),
+                ('value', models.TextField(blank=True, default='')),
+                ('xpath_absolute', models.TextField(blank=True, default='')),
+                ('xpath_relative', models.TextField(blank=True, default='')),
+                ('css_selector', models.TextField(blank=True, default='')),
+                ('extra', models.JSONField(blank=True, default=dict)),
+                ('scenario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mapping_rows', to='accounts.scenarios')),
+            ],
+            options={
+                'db_table': 'mapping_row',
+                'ordering': ['scenario', 'order'],
+                'indexes': [models.Index(fields=['element_id'], name='mapping_row_element_idx')],
+                'unique_together': {('scenario', 'order')},
+            },
+        ),
+        # Nullable first, so the column can be restored and refilled when migrating backwards
+        migrations.AlterField(
+            model_name='scenarios',
+            name='mapping_file',
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(copy_mapping_files, restore_mapping_files),
+        migrations.RemoveField(
+            model_name='scenarios',
+            name='mapping_file',
+        ),
+    ]
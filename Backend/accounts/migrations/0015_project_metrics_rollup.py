@@ -0,0 +1,51 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def backfill_rollups(apps, schema_editor):
+    Metrics = apps.get_model('accounts', 'Metrics')
+    ProjectMetricsRollup = apps.get_model('accounts', 'ProjectMetricsRollup')
+    totals = Metrics.objects.values('execution__project_id').annotate(
+        execution_count=Count('metrics_id'),
+        total_scenarios=Sum('number_of_scenarios'),
+        total_healed_elements=Sum('number_of_healed_elements'),
+        last_execution_at=Max('created_at'),
+    ).order_by()
+    ProjectMetricsRollup.objects.bulk_create([
+        ProjectMetricsRollup(
+            project_id=row['execution__project_id'],
+            execution_count=row['execution_count'],
+            total_scenarios=row['total_scenarios'] or 0,
+            total_healed_elements=row['total_healed_elements'] or 0,
+            last_execution_at=row['last_execution_at'],
+        )
+        for row in totals
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_mapping_row'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectMetricsRollup',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='metrics_rollup', serialize=False, to='accounts.project')),
+                ('execution_count', models.PositiveIntegerField(default=0)),
+                ('total_scenarios', models.PositiveIntegerField(default=0)),
+                ('total_healed_elements', models.PositiveIntegerField(default=0)),
+                ('last_execution_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'project_metrics_rollup',
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_project_metrics_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='execution',
+            index=models.Index(fields=['project', '-created_at'], name='execution_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='executionsequence',
+            index=models.Index(fields=['project', 'number'], name='exec_seq_project_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scenarios',
+            index=models.Index(fields=['project', '-created_at'], name='scenarios_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sequencescenario',
+            index=models.Index(fields=['execution_sequence', 'order'], name='seq_scenario_seq_order_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, full_name, password=None, **extra_fields):
@@ -33,6 +35,11 @@ class Project(models.Model):
     project_id = models.AutoField(primary_key=True)
     project_name = models.CharField(max_length=50, null=False)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=False, related_name='projects')
+    # Generate BART semantic descriptions while mapping (slow; mapping works without them)
+    enable_summarization = models.BooleanField(default=True)
+    # Bumped on every write to the project's executions, metrics, healed elements and
+    # sequences; the ETag of the cached project endpoints (accounts/http_cache.py)
+    data_version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -43,6 +50,11 @@ class Project(models.Model):
     def __str__(self):
         return self.project_name
 
+    @classmethod
+    def bump_data_version(cls, **lookup):
+        """Mark the data of the matching projects as changed (one UPDATE, safe under concurrency)."""
+        cls.objects.filter(**lookup).update(data_version=F('data_version') + 1, updated_at=timezone.now())
+
 class Execution(models.Model):
     execution_id = models.AutoField(primary_key=True)
     execution_name = models.CharField(max_length=25, null=False)
@@ -52,6 +64,9 @@ class Execution(models.Model):
     class Meta:
         db_table = 'execution'
         ordering = ['-created_at']
+        # A project's executions newest first; also the join path of the per-project
+        # Metrics and HealedElements reads (execution__project_id)
+        indexes = [models.Index(fields=['project', '-created_at'], name='execution_project_created_idx')]
 
     def __str__(self):
         return self.execution_name
@@ -60,24 +75,132 @@ class Scenarios(models.Model):
     scenario_id = models.AutoField(primary_key=True)
     scenarios_name = models.CharField(max_length=100, null=True)
     project = models.ForeignKey(Project, on_delete=models.CASCADE, null=False, related_name='scenarios')
-    mapping_file = models.JSONField()
+    # Incremented by every save and heal of the mapping; the ETag of get_scenario_mapping
+    version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def mapping_file(self):
+        """
+        The mapping in its list-of-lists shape (header row first), built from the scenario's
+        MappingRow rows. Prefetch 'mapping_rows' when reading many scenarios.
+        """
+        pending = getattr(self, '_pending_mapping', None)
+        if pending is not None:
+            return pending
+        if self.pk is None:
+            return []
+        return MappingRow.to_mapping(self.mapping_rows.all())
+
+    @mapping_file.setter
+    def mapping_file(self, mapping):
+        # Written to MappingRow by save()
+        self._pending_mapping = mapping
+
+    def save(self, *args, **kwargs):
+        pending = getattr(self, '_pending_mapping', None)
+        self.version += 1
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'version', 'updated_at'}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if pending is not None:
+                MappingRow.replace(self, pending)
+                self._pending_mapping = None
+
+    @classmethod
+    def bump_versions(cls, scenario_ids):
+        """Mark the mappings of these scenarios as changed after a bulk write to their rows."""
+        cls.objects.filter(scenario_id__in=scenario_ids).update(version=F('version') + 1, updated_at=timezone.now())
 
     class Meta:
         db_table = 'scenarios'
         ordering = ['-created_at']
         verbose_name_plural = 'Scenarios'
+        # A project's scenarios, newest first
+        indexes = [models.Index(fields=['project', '-created_at'], name='scenarios_project_created_idx')]
 
     def __str__(self):
         return f"Scenario {self.scenario_id} - {self.project.project_name}"
 
+class MappingRow(models.Model):
+    # Mapping header column -> field; any other column is kept in extra
+    COLUMNS = (
+        ("Step", "step"),
+        ("Page", "page"),
+        ("ID", "element_id"),
+        ("Class", "class_name"),
+        ("Name", "name"),
+        ("Value", "value"),
+        ("XPath (Absolute)", "xpath_absolute"),
+        ("XPath (Relative)", "xpath_relative"),
+        ("CSS Selector", "css_selector"),
+    )
+
+    mapping_row_id = models.AutoField(primary_key=True)
+    scenario = models.ForeignKey(Scenarios, on_delete=models.CASCADE, null=False, related_name='mapping_rows')
+    order = models.PositiveIntegerField(null=False)  # 1-based position below the header
+    step = models.TextField(blank=True, default='')
+    page = models.TextField(blank=True, default='')
+    element_id = models.CharField(max_length=512, blank=True, default='')
+    class_name = models.TextField(blank=True, default='')
+    name = models.TextField(blank=True, default='')
+    value = models.TextField(blank=True, default='')
+    xpath_absolute = models.TextField(blank=True, default='')
+    xpath_relative = models.TextField(blank=True, default='')
+    css_selector = models.TextField(blank=True, default='')
+    extra = models.JSONField(default=dict, blank=True)
+
     class Meta:
-        db_table = 'scenarios'
-        ordering = ['-created_at']
-        verbose_name_plural = 'Scenarios'
+        db_table = 'mapping_row'
+        ordering = ['scenario', 'order']
+        unique_together = ('scenario', 'order')
+        indexes = [models.Index(fields=['element_id'], name='mapping_row_element_idx')]
 
     def __str__(self):
-        return f"Scenario {self.scenario_id} - {self.project.project_name}"
+        return f"Mapping Row {self.order} - Scenario {self.scenario_id}"
+
+    @classmethod
+    def from_mapping(cls, scenario, mapping):
+        """Unsaved rows for a list-of-lists mapping (header row first)."""
+        if not mapping:
+            return []
+        header = [str(column) for column in mapping[0]]
+        fields = dict(cls.COLUMNS)
+        rows = []
+        for order, values in enumerate(mapping[1:], start=1):
+            row = cls(scenario=scenario, order=order)
+            for column, value in zip(header, values):
+                if column in fields:
+                    setattr(row, fields[column], "" if value is None else str(value))
+                else:
+                    row.extra[column] = value
+            rows.append(row)
+        return rows
+
+    @classmethod
+    def to_mapping(cls, rows):
+        """
+        Compatibility serializer: the rows in the list-of-lists shape with the standard header,
+        followed by any extra columns in the order they first appear.
+        """
+        rows = sorted(rows, key=lambda row: row.order)
+        extra_columns = []
+        for row in rows:
+            extra_columns.extend(column for column in row.extra if column not in extra_columns)
+        header = [column for column, _ in cls.COLUMNS] + extra_columns
+        return [header] + [
+            [getattr(row, field) for _, field in cls.COLUMNS] + [row.extra.get(column, "") for column in extra_columns]
+            for row in rows
+        ]
+
+    @classmethod
+    def replace(cls, scenario, mapping):
+        """Replace all rows of a scenario with the rows of a list-of-lists mapping."""
+        cls.objects.filter(scenario=scenario).delete()
+        cls.objects.bulk_create(cls.from_mapping(scenario, mapping))
+
 
 class Metrics(models.Model):
     metrics_id = models.AutoField(primary_key=True)
@@ -94,6 +217,50 @@ class Metrics(models.Model):
     def __str__(self):
         return f"Metrics {self.metrics_id} - {self.execution.execution_name}"
 
+class ProjectMetricsRollup(models.Model):
+    # Running totals of a project's execution metrics, updated whenever a Metrics row is written,
+    # so the dashboard summary is one row lookup whatever the length of the history
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='metrics_rollup')
+    execution_count = models.PositiveIntegerField(default=0)
+    total_scenarios = models.PositiveIntegerField(default=0)
+    total_healed_elements = models.PositiveIntegerField(default=0)
+    last_execution_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'project_metrics_rollup'
+
+    def __str__(self):
+        return f"Metrics Rollup - {self.project.project_name}"
+
+    @classmethod
+    def add(cls, metrics, project_id):
+        """
+        Add an execution's Metrics row to its project's totals. Call it in the transaction
+        that creates the row; the F() increments keep concurrent executions consistent.
+        """
+        increment = {
+            'execution_count': F('execution_count') + 1,
+            'total_scenarios': F('total_scenarios') + metrics.number_of_scenarios,
+            'total_healed_elements': F('total_healed_elements') + metrics.number_of_healed_elements,
+            'last_execution_at': metrics.created_at,
+        }
+        if cls.objects.filter(project_id=project_id).update(**increment):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    project_id=project_id,
+                    execution_count=1,
+                    total_scenarios=metrics.number_of_scenarios,
+                    total_healed_elements=metrics.number_of_healed_elements,
+                    last_execution_at=metrics.created_at
+                )
+        except IntegrityError:
+            # Another execution of the project created the row first
+            cls.objects.filter(project_id=project_id).update(**increment)
+
+
 class HealedElements(models.Model):
     healed_element_id = models.AutoField(primary_key=True)
     execution = models.ForeignKey(Execution, on_delete=models.CASCADE, null=False, related_name='healed_elements')
@@ -124,6 +291,8 @@ class ExecutionSequence(models.Model):
     class Meta:
         db_table = 'execution_sequence'
         ordering = ['-created_at']
+        # Sequences are looked up by (project, number)
+        indexes = [models.Index(fields=['project', 'number'], name='exec_seq_project_number_idx')]
 
     def __str__(self):
         return self.number
@@ -139,6 +308,8 @@ class SequenceScenario(models.Model):
         db_table = 'sequence_scenario'
         ordering = ['order']
         unique_together = ('execution_sequence', 'scenario')  # Prevents duplicate scenario-sequence pairs
+        # A sequence's scenarios in run order
+        indexes = [models.Index(fields=['execution_sequence', 'order'], name='seq_scenario_seq_order_idx')]
 
     def __str__(self):
         return f"{self.execution_sequence.name} - {self.scenario.scenario_id} (Order: {self.order})"
@@ -158,3 +329,131 @@ class FineTuningData(models.Model):
         
     def __str__(self):
         return f"Fine Tuning Data {self.data_id} - {self.execution.execution_name}"
+
+
+class CatalogPage(models.Model):
+    page_id = models.AutoField(primary_key=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, null=False, related_name='catalog_pages')
+    url = models.CharField(max_length=2048, null=False)
+    # sha256 of the page body; a changed body replaces the page's elements
+    content_hash = models.CharField(max_length=64, null=False)
+    # Embedding model and revision the vectors were computed with
+    embedding_model = models.CharField(max_length=255, null=False)
+    summarized = models.BooleanField(default=True)
+    embedding = models.BinaryField(null=False)
+    description = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'catalog_page'
+        ordering = ['-updated_at']
+        unique_together = ('project', 'url')
+
+    def __str__(self):
+        return f"{self.url} - {self.project.project_name}"
+
+class CatalogElement(models.Model):
+    element_id = models.AutoField(primary_key=True)
+    page = models.ForeignKey(CatalogPage, on_delete=models.CASCADE, null=False, related_name='elements')
+    position = models.PositiveIntegerField(null=False)  # Document order within the page
+    role = models.CharField(max_length=50, null=False)
+    content = models.TextField()
+    attributes = models.JSONField(null=False)
+    description = models.TextField(blank=True, default='')
+    embedding = models.BinaryField(null=False)  # float32 vector
+
+    class Meta:
+        db_table = 'catalog_element'
+        ordering = ['page', 'position']
+
+    def __str__(self):
+        return f"Catalog Element {self.element_id} - {self.role}"
+
+
+class Job(models.Model):
+    QUEUED = 'QUEUED'
+    RUNNING = 'RUNNING'
+    SUCCEEDED = 'SUCCEEDED'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    job_id = models.AutoField(primary_key=True)
+    kind = models.CharField(max_length=50, null=False)  # Handler name, e.g. "execute_tests"
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True, blank=True, related_name='jobs')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, null=True, blank=True, related_name='jobs')
+    payload = models.JSONField(default=dict)
+    # Response body and HTTP status the endpoint returns once the job has finished
+    result = models.JSONField(null=True, blank=True)
+    result_status = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    # Per-step progress: [{"name", "status", "started_at", "finished_at"}]
+    steps = models.JSONField(default=list)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=1)
+    available_at = models.DateTimeField(default=timezone.now)  # Not claimed before this time (retries)
+    locked_by = models.CharField(max_length=255, blank=True, default='')
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'job'
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['status', 'available_at'], name='job_status_available_idx')]
+
+    def __str__(self):
+        return f"Job {self.job_id} - {self.kind} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+
+class HealedLocator(models.Model):
+    healed_locator_id = models.AutoField(primary_key=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, null=False, related_name='healed_locators')
+    # sha256 of the original locator strategies (see controllers/locator_memory.py)
+    original_key = models.CharField(max_length=64, null=False)
+    original_strategies = models.JSONField(null=False)
+    healed_strategies = models.JSONField(null=False)
+    confidence = models.FloatField(default=0.0)  # Similarity score of the heal
+    hit_count = models.PositiveIntegerField(default=0)  # Runs that reused the heal instead of healing again
+    last_validated_at = models.DateTimeField(null=True, blank=True)  # Last time the healed locator resolved
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'healed_locator'
+        ordering = ['-updated_at']
+        unique_together = ('project', 'original_key')
+
+    def __str__(self):
+        return f"Healed Locator {self.healed_locator_id} - {self.project.project_name}"
+
+
+class StrategyStat(models.Model):
+    strategy_stat_id = models.AutoField(primary_key=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, null=False, related_name='strategy_stats')
+    # Context of the lookups: page URL pattern and tag type of the element
+    page_pattern = models.CharField(max_length=255, null=False)
+    tag_name = models.CharField(max_length=50, null=False)
+    strategy = models.CharField(max_length=50, null=False)  # Locator strategy name, e.g. "CSS Selector"
+    successes = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'strategy_stat'
+        ordering = ['project', 'page_pattern', 'tag_name', 'strategy']
+        unique_together = ('project', 'page_pattern', 'tag_name', 'strategy')
+
+    def __str__(self):
+        return f"{self.strategy} on {self.page_pattern} <{self.tag_name}>: {self.successes}/{self.successes + self.failures}"
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class HealedElementsCursorPagination(CursorPagination):
+    """
+    Newest-first cursor pages of a project's healed elements: each page is one indexed
+    range query, however deep the client pages into the history.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', '-healed_element_id')
@@ -37,6 +37,9 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 class ScenarioSerializer(serializers.ModelSerializer):
+    # Stored as MappingRow rows; read and written in the list-of-lists shape
+    mapping_file = serializers.JSONField()
+
     class Meta:
         model = Scenarios
         fields = '__all__'
@@ -70,6 +73,7 @@ class ProjectMetricsSerializer(serializers.Serializer):
     total_healed_elements = serializers.IntegerField()
     execution_data = MetricsSerializer(many=True)
     healed_elements = HealedElementsSerializer(many=True)
+    healed_elements_url = serializers.CharField()
 
 class FineTuningDataSerializer(serializers.ModelSerializer):
     class Meta:
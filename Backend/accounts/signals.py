@@ -0,0 +1,25 @@
+"""
+Data-version bumps behind the HTTP caching of the project endpoints (accounts/http_cache.py).
+
+Saving or deleting an execution, a sequence, a metrics row or a healed element bumps its
+project's data_version, so the next poll of the project's endpoints misses the cache in every
+process. Bulk writes send no signals; their callers bump the version themselves (see
+controllers/heal_propagation.py).
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Execution, ExecutionSequence, HealedElements, Metrics, Project
+
+
+@receiver([post_save, post_delete], sender=Execution)
+@receiver([post_save, post_delete], sender=ExecutionSequence)
+def bump_project_data_version(sender, instance, **kwargs):
+    Project.bump_data_version(project_id=instance.project_id)
+
+
+@receiver([post_save, post_delete], sender=Metrics)
+@receiver([post_save, post_delete], sender=HealedElements)
+def bump_execution_project_data_version(sender, instance, **kwargs):
+    # Filtered through the execution so a cascade delete doesn't have to load it
+    Project.bump_data_version(executions__execution_id=instance.execution_id)
@@ -0,0 +1,332 @@
+"""
+Background job handlers for the slow endpoints (browser runs, mapping, fine-tuning).
+
+Each handler receives the JobContext and the payload the view validated, and returns the
+response body and HTTP status the endpoint used to return synchronously.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from .jobs import job_handler
+from .models import (
+    Project, Scenarios, Execution, HealedElements, ExecutionSequence, SequenceScenario, Metrics, FineTuningData,
+    ProjectMetricsRollup
+)
+
+
+def get_attribute_simple(attributes, key):
+    value = attributes.get(key)
+    if value is None:
+        return "N/A"
+    if isinstance(value, list):
+        return ", ".join(value) if value else "N/A"
+    return str(value)
+
+
+@job_handler('scenario')
+def run_scenario(ctx, payload):
+    from .controllers.bdd_processor import process_bdd
+    from .controllers.html_processor import process_html
+    from .controllers.mapping import map_bdd_to_html
+    from .controllers.element_catalog import get_element_catalog
+
+    project = Project.objects.get(project_id=payload['project_id'])
+    ctx.plan(["process_bdd", "process_html", "map", "save"])
+
+    with ctx.step("process_bdd"):
+        bdd_scenario = process_bdd(payload['bdd'], enable_summarization=project.enable_summarization)
+
+    with ctx.step("process_html"):
+        clean_links = [link.strip() for link in payload['links'].split("\n") if link.strip()]
+        html_pages = process_html(
+            clean_links,
+            enable_summarization=project.enable_summarization,
+            catalog=get_element_catalog(project)
+        )
+
+    with ctx.step("map"):
+        mappings = map_bdd_to_html(bdd_scenario, html_pages, enable_summarization=project.enable_summarization)
+        response = [[
+            "Step", "Page", "ID", "Class", "Name", "Value",
+            "XPath (Absolute)", "XPath (Relative)", "CSS Selector"
+        ]]
+        for match in mappings:
+            response.append([
+                match["step"],
+                match["page"],
+                get_attribute_simple(match["element"]["attributes"], "id"),
+                get_attribute_simple(match["element"]["attributes"], "class"),
+                get_attribute_simple(match["element"]["attributes"], "name"),
+                get_attribute_simple(match["element"]["attributes"], "value"),
+                get_attribute_simple(match["element"]["attributes"], "xpath_absolute"),
+                get_attribute_simple(match["element"]["attributes"], "xpath_relative"),
+                get_attribute_simple(match["element"]["attributes"], "css_selector"),
+            ])
+
+    with ctx.step("save"):
+        execution_sequence_number = payload.get('execution_sequence_number')
+        order = payload.get('order')
+
+        # Get or create the execution sequence
+        if execution_sequence_number:
+            execution_sequence, _ = ExecutionSequence.objects.get_or_create(
+                project=project,
+                number=execution_sequence_number
+            )
+        else:
+            # Get the latest sequence number and add 1
+            last_sequence = ExecutionSequence.objects.filter(project=project).order_by('-number').first()
+            next_sequence_number = last_sequence.number + 1 if last_sequence else 1
+            execution_sequence = ExecutionSequence.objects.create(
+                project=project,
+                number=next_sequence_number
+            )
+
+        scenario_obj = Scenarios.objects.create(
+            project=project,
+            scenarios_name=payload['scenarios_name'],
+            mapping_file=response
+        )
+
+        # Determine the order and shift if necessary
+        if order:
+            order_value = int(order)
+            # Shift existing scenarios at or after this order
+            SequenceScenario.objects.filter(
+                execution_sequence=execution_sequence,
+                order__gte=order_value
+            ).update(order=F('order') + 1)
+        else:
+            last_order = SequenceScenario.objects.filter(
+                execution_sequence=execution_sequence
+            ).order_by('-order').first()
+            order_value = last_order.order + 1 if last_order else 1
+
+        SequenceScenario.objects.create(
+            execution_sequence=execution_sequence,
+            scenario=scenario_obj,
+            order=order_value
+        )
+
+    return {
+        "message": "Added Successfully",
+        "scenario_id": scenario_obj.scenario_id,
+        "execution_sequence_id": execution_sequence.execution_sequence_id,
+        "order": order_value
+    }, 201
+
+
+@job_handler('documents')
+def run_documents(ctx, payload):
+    from .controllers.mapping import MappingProcessor
+
+    execution_sequence = ExecutionSequence.objects.select_related('project').get(
+        execution_sequence_id=payload['execution_sequence_id']
+    )
+    ctx.plan(["map_documents", "save"])
+
+    with ctx.step("map_documents"):
+        processor = MappingProcessor()
+        bdd_files = [tuple(bdd_file) for bdd_file in payload['bdd_files']]
+        outputs = processor.process_all_features(bdd_files, payload['test_script_files'])
+
+    with ctx.step("save"):
+        for idx, output in enumerate(outputs):
+            scenario_obj = Scenarios.objects.create(
+                project=execution_sequence.project,
+                scenarios_name=payload['scenarios_name'],
+                mapping_file=output
+            )
+
+            # Add to SequenceScenario with order preserved
+            SequenceScenario.objects.create(
+                execution_sequence=execution_sequence,
+                scenario=scenario_obj,
+                order=idx + 1  # 1-based index
+            )
+
+    return {
+        "message": "Added Successfully",
+        "execution_sequence_id": execution_sequence.execution_sequence_id
+    }, 201
+
+
+@job_handler('execute_tests')
+def run_execute_tests(ctx, payload):
+    from .controllers.heal import SelfHealingFramework
+    from .controllers.heal_propagation import propagate_heals
+    from .controllers.locator_memory import LocatorMemory
+    from .controllers.strategy_stats import load_strategy_agent, save_strategy_stats
+
+    execution_sequence = ExecutionSequence.objects.select_related('project').get(
+        execution_sequence_id=payload['execution_sequence_id']
+    )
+    project_id = execution_sequence.project_id
+    ctx.plan(["start_browser", "execute_steps", "store_results"])
+
+    # Create execution record
+    execution = Execution.objects.create(
+        execution_name=payload['execution_name'],
+        project_id=project_id,
+    )
+
+    # Fetch the scenarios for that exact execution sequence
+    sequence_entries = SequenceScenario.objects.filter(
+        execution_sequence_id=execution_sequence.execution_sequence_id
+    ).select_related('scenario').prefetch_related('scenario__mapping_rows').order_by('order')
+
+    # Build the combined test steps and track scenarios
+    all_steps = []
+    scenario_mapping = {}  # Map scenario_id to scenario object for updates
+    for entry in sequence_entries:
+        scenario = entry.scenario
+        mapping = scenario.mapping_file
+        header = mapping[0]
+        test_steps = [dict(zip(header, row)) for row in mapping[1:]]
+        all_steps.extend(test_steps)
+        scenario_mapping[scenario.scenario_id] = scenario  # Store scenario reference
+
+    scenario_count = sum(1 for row in all_steps if row.get("Step", "").strip().startswith("When"))
+
+    # Initialize and run the test framework, starting from the project's remembered heals
+    locator_memory = LocatorMemory(execution_sequence.project)
+    rl_agent = load_strategy_agent(execution_sequence.project)
+    framework = SelfHealingFramework(all_steps, locator_memory=locator_memory, rl_agent=rl_agent)
+    framework.scenario_count = scenario_count
+
+    try:
+        with ctx.step("start_browser"):
+            framework.start_browser()
+        with ctx.step("execute_steps"):
+            framework.execute_all_steps()
+            report = framework.get_healing_report()
+
+        with ctx.step("store_results"):
+            locator_memory.flush()
+            save_strategy_stats(execution_sequence.project, rl_agent)
+
+            # Store healed elements and rewrite the mappings that used them
+            propagate_heals(execution, report['healed_elements'], scenario_mapping.values())
+
+            # Store metrics and add them to the project's running totals
+            with transaction.atomic():
+                metrics = Metrics.objects.create(
+                    execution=execution,
+                    number_of_scenarios=report['metrics']['total_scenarios'],
+                    number_of_healed_elements=report['metrics']['healed_count'],
+                )
+                ProjectMetricsRollup.add(metrics, project_id)
+
+        return {
+            "success": report['success'],
+            "message": report.get('message', 'Execution completed'),
+            "execution_id": execution.execution_id,
+            "healed_elements": report['healed_elements'],
+            "broken_elements": report['broken_elements'],
+            "metrics": report['metrics'],
+            "step_timings": report['step_timings']
+        }, 200
+
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Test execution failed: {str(e)}",
+            "execution_id": execution.execution_id,
+            "healed_elements": [],
+            "broken_elements": [],
+            "metrics": {
+                "total_scenarios": scenario_count,
+                "healed_count": 0,
+                "broken_count": 0
+            }
+        }, 500
+
+    finally:
+        framework.close()
+
+
+@job_handler('accept_healing')
+def run_accept_healing(ctx, payload):
+    from .controllers.self_healing_framework.fine_tuner import ModelFineTuner
+
+    execution = Execution.objects.get(execution_id=payload['execution_id'])
+    healed_elements = payload.get('healed_elements', [])
+    ctx.plan(["store_feedback", "fine_tune"])
+
+    with ctx.step("store_feedback"):
+        # Update the healed elements to mark them as accepted
+        HealedElements.objects.filter(execution=execution).update(label=True)
+
+        training_examples = []
+        for element in healed_elements:
+            training_examples.append({
+                'original_id': element.get('original_element_id', ''),
+                'new_strategies': element.get('new_strategies', {}),
+                'label': True  # Positive example
+            })
+            FineTuningData.objects.create(
+                execution=execution,
+                original_attributes={"id": element.get('original_element_id', '')},
+                matched_attributes=element.get('new_strategies', {}),
+                label=True
+            )
+
+    if not training_examples:
+        return {"message": "No healing examples to fine-tune with"}, 200
+
+    with ctx.step("fine_tune"):
+        success = ModelFineTuner().fine_tune(training_examples)
+
+    if success:
+        return {
+            "message": "Healing accepted and model fine-tuned successfully",
+            "examples_count": len(training_examples)
+        }, 200
+    return {
+        "message": "Healing accepted but model fine-tuning failed",
+        "examples_count": len(training_examples)
+    }, 500
+
+
+@job_handler('reject_healing')
+def run_reject_healing(ctx, payload):
+    from .controllers.locator_memory import forget_heals
+    from .controllers.self_healing_framework.fine_tuner import ModelFineTuner
+
+    execution = Execution.objects.get(execution_id=payload['execution_id'])
+    healed_elements = payload.get('healed_elements', [])
+    ctx.plan(["store_feedback", "fine_tune"])
+
+    with ctx.step("store_feedback"):
+        # Stop reusing the rejected heals in later runs
+        forget_heals(execution.project, healed_elements)
+
+        training_examples = []
+        for element in healed_elements:
+            fine_tuning_data = FineTuningData.objects.create(
+                execution=execution,
+                original_attributes={"id": element.get('original_element_id', ''), "other_attrs": element.get('original_attributes', {})},
+                matched_attributes={"id": element.get('new_strategies', {}).get('id', ''), "other_attrs": element.get('matched_attributes', {})},
+                label=False  # Negative example
+            )
+            training_examples.append({
+                'original_attributes': fine_tuning_data.original_attributes,
+                'matched_attributes': fine_tuning_data.matched_attributes,
+                'label': False
+            })
+
+    if not training_examples:
+        return {"message": "No healing examples to fine-tune with"}, 200
+
+    with ctx.step("fine_tune"):
+        success = ModelFineTuner().fine_tune(training_examples)
+
+    if success:
+        return {
+            "message": "Healing rejected and model fine-tuned successfully",
+            "examples_count": len(training_examples)
+        }, 200
+    return {
+        "message": "Healing rejected but model fine-tuning failed",
+        "examples_count": len(training_examples)
+    }, 500
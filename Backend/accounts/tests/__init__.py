@@ -2,4 +2,29 @@
 from .auth_test import *
 from .document_test import *
 from .project_test import *
-from .scenario_test import *
\ No newline at end of file
+from .scenario_test import *
+from .embedding_service_test import *
+from .embedding_cache_test import *
+from .mapping_scorer_test import *
+from .fuzzy_scorer_test import *
+from .model_registry_test import *
+from .summarizer_test import *
+from .page_fetcher_test import *
+from .element_extractor_test import *
+from .element_catalog_test import *
+from .inference_backend_test import *
+from .dom_snapshot_test import *
+from .candidate_ranker_test import *
+from .locator_resolver_test import *
+from .browser_pool_test import *
+from .job_queue_test import *
+from .readiness_test import *
+from .locator_cache_test import *
+from .locator_memory_test import *
+from .strategy_agent_test import *
+from .heal_propagation_test import *
+from .mapping_row_test import *
+from .project_metrics_test import *
+from .query_budget_test import *
+from .query_plan_test import *
+from .http_cache_test import *
@@ -0,0 +1,117 @@
+import threading
+from django.test import SimpleTestCase
+from accounts.controllers.browser_pool import BrowserPool, BrowserPoolExhausted
+
+
+class FakeDriver:
+    """Stands in for a Chrome WebDriver; records session resets and rejects origins Chrome rejects."""
+    started = 0
+
+    def __init__(self):
+        FakeDriver.started += 1
+        self.alive = True
+        self.quit_called = False
+        self.commands = []
+        self.cleared_origins = []
+        self.history = []
+        self.window_handles = ["main"]
+        self.switch_to = self
+
+    def window(self, handle):
+        pass
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        return 1
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append(command)
+        if command == "Page.getNavigationHistory":
+            return {"currentIndex": len(self.history) - 1, "entries": [{"url": url} for url in self.history]}
+        if command == "Page.resetNavigationHistory":
+            self.history = self.history[-1:]
+        if command == "Storage.clearDataForOrigin":
+            if "://" not in params["origin"]:
+                raise RuntimeError("invalid argument: Invalid origin")
+            self.cleared_origins.append(params["origin"])
+        return {}
+
+    def get(self, url):
+        self.commands.append(url)
+        self.history.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+### pre-requisite for this testcase : nothing (fake WebDriver factory)
+
+### goal : the browser pool reuses reset workers, respects its size, replaces unhealthy or worn-out browsers and pre-warms
+class BrowserPoolTestCase(SimpleTestCase):
+    def setUp(self):
+        FakeDriver.started = 0
+
+    def test_workers_are_reset_and_reused(self):
+        pool = BrowserPool(size=2, factory=FakeDriver)
+        with pool.lease() as driver:
+            first = driver
+        with pool.lease() as driver:
+            self.assertIs(driver, first)
+        self.assertEqual(FakeDriver.started, 1)
+        self.assertIn("Network.clearBrowserCookies", first.commands)
+        self.assertIn("about:blank", first.commands)
+
+    def test_reset_clears_every_visited_origin(self):
+        pool = BrowserPool(size=1, factory=FakeDriver)
+        with pool.lease() as driver:
+            first = driver
+            driver.get("https://shop.test/login")
+            driver.get("https://sso.test/authorize?client=shop")
+            driver.get("https://shop.test/cart")
+        self.assertEqual(sorted(first.cleared_origins), ["https://shop.test", "https://sso.test"])
+
+        # The next lease only clears what it visits itself
+        first.cleared_origins.clear()
+        with pool.lease() as driver:
+            self.assertIs(driver, first)
+            driver.get("http://localhost:3000/")
+        self.assertEqual(first.cleared_origins, ["http://localhost:3000"])
+        self.assertEqual(FakeDriver.started, 1)
+        self.assertFalse(first.quit_called)
+
+    def test_size_limit_and_waiting(self):
+        pool = BrowserPool(size=1, factory=FakeDriver)
+        worker = pool.acquire()
+        with self.assertRaises(BrowserPoolExhausted):
+            pool.acquire(timeout=0.05)
+
+        # A waiting lease gets the worker as soon as it is released
+        leased = []
+        waiter = threading.Thread(target=lambda: leased.append(pool.acquire(timeout=5)))
+        waiter.start()
+        pool.release(worker)
+        waiter.join(5)
+        self.assertIs(leased[0], worker)
+        self.assertEqual(FakeDriver.started, 1)
+
+    def test_unhealthy_and_worn_out_workers_are_replaced(self):
+        pool = BrowserPool(size=1, factory=FakeDriver, max_uses=2)
+        worker = pool.acquire()
+        pool.release(worker)
+        worker.driver.alive = False  # Browser crashed while idle
+        replacement = pool.acquire()
+        self.assertIsNot(replacement, worker)
+        self.assertTrue(worker.driver.quit_called)
+
+        pool.release(replacement)
+        pool.release(pool.acquire())  # Second use: recycled on release
+        self.assertTrue(replacement.driver.quit_called)
+        self.assertEqual(pool.stats(), {"size": 1, "started": 0, "idle": 0})
+
+    def test_warm_up(self):
+        pool = BrowserPool(size=3, factory=FakeDriver)
+        pool.warm_up(2)
+        self.assertEqual(pool.stats(), {"size": 3, "started": 2, "idle": 2})
+        pool.close()
+        self.assertEqual(pool.stats()["idle"], 0)
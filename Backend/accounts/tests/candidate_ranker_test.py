@@ -0,0 +1,61 @@
+import torch
+from django.test import SimpleTestCase
+from accounts.controllers.heal import ElementHealer
+from accounts.controllers.self_healing_framework.candidate_ranker import clear_page_embeddings
+
+
+class CountingModel:
+    """Bag-of-characters encoder recording how many texts each encode() call received."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, convert_to_tensor=False, batch_size=32):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        self.calls.append(len(texts))
+        vectors = torch.zeros((len(texts), 64))
+        for row, text in enumerate(texts):
+            for char in text.lower():
+                vectors[row, ord(char) % 64] += 1
+        return vectors[0] if single else vectors
+
+
+def page(*ids):
+    return [
+        {'element': f"element-{element_id}", 'attributes': {'id': element_id, 'tag_name': 'button'}}
+        for element_id in ids
+    ]
+
+
+### pre-requisite for this testcase : nothing (character-count encoder instead of a model)
+
+### goal : the healer encodes all candidates in one batch, returns the top-k best first and reuses them on an unchanged page
+class CandidateRankerTestCase(SimpleTestCase):
+    def setUp(self):
+        clear_page_embeddings()
+        self.model = CountingModel()
+        self.healer = ElementHealer(self.model, None)
+
+    def test_batched_top_k(self):
+        elements = page("login-button", "logout-link", "search-box", "login-btn")
+        matches = self.healer.find_top_matches({'id': 'login-button', 'tag_name': 'button'}, elements, k=2)
+
+        self.assertEqual(self.model.calls, [1, 4])  # The broken element, then every candidate in one call
+        self.assertEqual([match['element'] for match in matches], ["element-login-button", "element-login-btn"])
+        self.assertAlmostEqual(matches[0]['score'], 1.0, places=5)
+        self.assertGreater(matches[0]['score'], matches[1]['score'])
+        self.assertNotIn('score', elements[0])  # Page elements are not modified
+
+        best = self.healer.heal_element({'id': 'login-button', 'tag_name': 'button'}, elements)
+        self.assertEqual(best['element'], "element-login-button")
+
+    def test_unchanged_page_reuses_embeddings(self):
+        elements = page("login-button", "search-box")
+        self.healer.find_top_matches({'id': 'search'}, elements)
+        self.healer.find_top_matches({'id': 'login'}, page("login-button", "search-box"))
+        self.assertEqual(self.model.calls, [1, 2, 1])
+
+        # A changed page is encoded again
+        self.healer.find_top_matches({'id': 'login'}, page("login-button", "search-input"))
+        self.assertEqual(self.model.calls, [1, 2, 1, 1, 2])
@@ -0,0 +1,77 @@
+from django.test import SimpleTestCase
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from accounts.controllers.self_healing_framework.dom_snapshot import (
+    DomSnapshot, RESOLVE_SCRIPT, SNAPSHOT_SCRIPT, resolve_element
+)
+
+ROWS = [
+    ["html", "", "", "", "", "Sign in", "/html", "html", [0, 0, 800, 600], True],
+    ["input", "user", "field", "username", "text", "", "/html/body/form/input[1]",
+     "html > body:nth-child(2) > form:nth-child(1) > input:nth-child(1)", [10, 20, 200, 30], True],
+    ["button", "", "btn primary", "", "submit", "Sign in", "/html/body/form/button",
+     "html > body:nth-child(2) > form:nth-child(1) > button:nth-child(3)", [10, 60, 80, 30], False],
+]
+
+
+class FakeDriver:
+    """Records WebDriver calls; the page holds the snapshot until reload() is called."""
+
+    def __init__(self):
+        self.calls = []
+        self.token = None
+
+    def execute_script(self, script, *args):
+        self.calls.append(("execute_script", script))
+        if script == SNAPSHOT_SCRIPT:
+            self.token = args[0]
+            return ROWS
+        if script == RESOLVE_SCRIPT:
+            return f"snapshot-element-{args[1]}" if args[0] == self.token else None
+
+    def find_element(self, by, value):
+        self.calls.append(("find_element", value))
+        if by == By.XPATH and value in [row[6] for row in ROWS]:
+            return f"xpath-element-{value}"
+        raise NoSuchElementException(value)
+
+    def reload(self):
+        self.token = None
+
+
+### pre-requisite for this testcase : nothing (fake WebDriver)
+
+### goal : a snapshot costs one WebDriver call, keeps the healer's element shape and resolves the chosen element lazily
+class DomSnapshotTestCase(SimpleTestCase):
+    def test_single_round_trip(self):
+        driver = FakeDriver()
+        snapshot = DomSnapshot.capture(driver, skip_tags=["DIV", "label"])
+        elements = snapshot.page_elements(xpath_key="XPath (Absolute)")
+
+        self.assertEqual(len(driver.calls), 1)
+        self.assertEqual(len(elements), 3)
+        self.assertEqual(elements[1]["attributes"], {
+            "id": "user",
+            "tag_name": "input",
+            "class_name": "field",
+            "text": "",
+            "type": "text",
+            "name": "username",
+            "XPath (Absolute)": "/html/body/form/input[1]"
+        })
+        self.assertEqual(elements[2]["rect"], [10, 60, 80, 30])
+        self.assertEqual([element["attributes"]["tag_name"] for element in snapshot.page_elements(visible_only=True)],
+                         ["html", "input"])
+
+    def test_handles_resolve_lazily(self):
+        driver = FakeDriver()
+        elements = DomSnapshot.capture(driver).page_elements()
+
+        self.assertEqual(resolve_element(elements[1]["element"]), "snapshot-element-1")
+        self.assertEqual(resolve_element(elements[1]["element"]), "snapshot-element-1")  # Cached on the handle
+        self.assertEqual(len(driver.calls), 2)
+
+        # After a reload the snapshot is gone from the page; the absolute XPath is used instead
+        driver.reload()
+        self.assertEqual(resolve_element(elements[2]["element"]), "xpath-element-/html/body/form/button")
+        self.assertEqual(resolve_element("plain-element"), "plain-element")
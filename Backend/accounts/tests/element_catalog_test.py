@@ -0,0 +1,58 @@
+import numpy as np
+import torch
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from accounts.models import Project, CatalogPage, CatalogElement
+from accounts.controllers.element_catalog import ElementCatalog, content_hash
+
+User = get_user_model()
+
+
+def make_page(vectors, tag="button"):
+    return {
+        "elements": [
+            {
+                "content": f"<{tag} id='e{i}'></{tag}>",
+                "attributes": {"role": tag, "id": f"e{i}"},
+                "embedding": torch.tensor(vector, dtype=torch.float32)[None, :],
+                "description": f"element {i}"
+            }
+            for i, vector in enumerate(vectors)
+        ],
+        "embedding": torch.ones((1, len(vectors[0]))),
+        "description": "page"
+    }
+
+
+### pre-requisite for this testcase : need a user and a project to own the catalog
+
+### goal : processed pages are stored per project, reused while unchanged and replaced when changed
+class ElementCatalogTestCase(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="catalog@example.com", password="Test@1234", full_name="Catalog User")
+        self.project = Project.objects.create(project_name="Catalog", user=user)
+        self.catalog = ElementCatalog(self.project, "test-model@v1")
+        self.vectors = np.eye(4, dtype=np.float32)
+
+    def test_unchanged_page_is_reused(self):
+        html = "<button id='e0'></button>"
+        self.catalog.upsert_page("http://app/login", content_hash(html), make_page(self.vectors))
+
+        page = self.catalog.get_page("http://app/login", content_hash(html))
+        self.assertEqual(len(page["elements"]), 4)
+        self.assertEqual(page["elements"][2]["attributes"]["id"], "e2")
+        torch.testing.assert_close(page["elements"][2]["embedding"], torch.tensor(self.vectors[2])[None, :])
+
+        # A changed body, or vectors from another model, are not reused
+        self.assertIsNone(self.catalog.get_page("http://app/login", content_hash(html + " ")))
+        self.assertIsNone(ElementCatalog(self.project, "test-model@v2").get_page("http://app/login", content_hash(html)))
+
+    def test_upsert_replaces_changed_page(self):
+        self.catalog.upsert_page("http://app/login", "hash-1", make_page(self.vectors))
+        self.catalog.upsert_page("http://app/login", "hash-2", make_page(self.vectors[:2], tag="input"))
+
+        self.assertEqual(CatalogPage.objects.filter(project=self.project).count(), 1)
+        self.assertEqual(
+            list(CatalogElement.objects.filter(page__project=self.project).values_list("role", flat=True)),
+            ["input", "input"]
+        )
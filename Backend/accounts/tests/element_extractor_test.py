@@ -0,0 +1,119 @@
+import sys
+from lxml import html as lxml_html
+from django.test import SimpleTestCase
+from accounts.controllers import element_extractor
+from accounts.controllers.element_extractor import extract_page, SIBLING_CONTEXT
+
+PAGE = """
+<html>
+  <head><title>Login</title><style>.hidden { display: none }</style></head>
+  <body>
+    <!-- login form -->
+    <form id="login">
+      <label for="user">Username</label>
+      <input id="user" name="username" type="text" placeholder="Your name">
+      <input name="password" type="password" class="field secret">
+      <select id="country" name="country">
+        <option value="eg">Egypt</option>
+        <option value="fr">France</option>
+      </select>
+      <button type="submit">Sign in</button>
+    </form>
+    <script>var ignored = "script text";</script>
+  </body>
+</html>
+"""
+
+
+def traced_lines(function, *args):
+    """
+    Number of lines of the extractor module executed by a call: a deterministic measure of its work.
+    """
+    count = 0
+
+    def trace_lines(frame, event, arg):
+        nonlocal count
+        if event == "line":
+            count += 1
+        return trace_lines
+
+    def trace_calls(frame, event, arg):
+        return trace_lines if frame.f_code.co_filename == element_extractor.__file__ else None
+
+    previous = sys.gettrace()
+    sys.settrace(trace_calls)
+    try:
+        function(*args)
+    finally:
+        sys.settrace(previous)
+    return count
+
+
+### pre-requisite for this testcase : nothing (parses inline HTML)
+
+### goal : the single-pass extractor returns valid browser XPaths, sibling context and CSS selectors, and scales linearly
+class ElementExtractorTestCase(SimpleTestCase):
+    def test_attributes_and_locators(self):
+        elements, text = extract_page(PAGE)
+        by_role = {}
+        for element in elements:
+            by_role.setdefault(element["attributes"]["role"], []).append(element["attributes"])
+
+        self.assertEqual(
+            [element["attributes"]["role"] for element in elements],
+            ["label", "input", "input", "select", "option", "option", "button"]
+        )
+        username, password = by_role["input"]
+        self.assertEqual(username["xpath_absolute"], "/html[1]/body[1]/form[1]/input[1]")
+        self.assertEqual(username["xpath_relative"], "./html[1]/body[1]/form[1]/input[1]")
+        self.assertEqual(username["css_selector"], "input#user")
+        self.assertEqual(username["placeholder"], "Your name")
+        self.assertEqual(username["siblings"], ["label"])
+        self.assertEqual(username["parent"], "form")
+        self.assertEqual(password["class"], ["field", "secret"])
+        self.assertEqual(password["css_selector"], "input.field.secret")
+        self.assertEqual(password["siblings"], ["input", "label"])
+
+        france = by_role["option"][1]
+        self.assertEqual(france["parent_select_id"], "country")
+        self.assertEqual(france["option_text"], "France")
+        self.assertEqual(france["css_selector"], "select#country option[value='fr']")
+        self.assertEqual(by_role["button"][0]["text"], "Sign in")
+
+        self.assertIn("Sign in", text)
+        self.assertNotIn("script text", text)
+        self.assertNotIn("display: none", text)
+
+    def test_xpaths_resolve_to_the_extracted_element(self):
+        page = "<div>" + "<p><span>x</span><a href='#'>link</a></p>" * 30 + "<div><a id='last'>z</a></div></div>"
+        elements, _ = extract_page(page)
+        root = lxml_html.document_fromstring(page)
+        for element in elements:
+            matches = root.xpath(element["attributes"]["xpath_absolute"])
+            self.assertEqual(len(matches), 1)
+            self.assertEqual(lxml_html.tostring(matches[0], encoding="unicode", with_tail=False), element["content"])
+
+    def test_sibling_context_is_bounded(self):
+        elements, _ = extract_page("<body>" + "<button>b</button>" * 50 + "</body>")
+        self.assertEqual(len(elements), 50)
+        self.assertEqual(elements[0]["attributes"]["siblings"], [])
+        self.assertEqual(len(elements[-1]["attributes"]["siblings"]), SIBLING_CONTEXT)
+        self.assertEqual(elements[-1]["attributes"]["xpath_absolute"], "/html[1]/body[1]/button[50]")
+
+    def test_deep_and_wide_pages_scale_linearly(self):
+        deep = "<body>" + "<div>" * 1500 + "<input id='deep'>" + "</div>" * 1500 + "</body>"
+        elements, _ = extract_page(deep)
+        self.assertEqual(elements[0]["attributes"]["id"], "deep")
+        self.assertEqual(elements[0]["attributes"]["xpath_absolute"].count("/div[1]"), 1500)
+
+        def work(count):
+            page = "<body><form>" + "<input name='f'><span>s</span>" * count + "</form></body>"
+            elements, _ = extract_page(page)
+            output = sum(len(element["attributes"]["xpath_absolute"]) + len(element["attributes"]["siblings"]) for element in elements)
+            return traced_lines(extract_page, page), output
+
+        # 10x the elements must cost 10x the work, up to the per-page constant; wall-clock
+        # comparisons with the previous extractor live in benchmarks/html_extraction_benchmark.py
+        (small_lines, small_output), (large_lines, large_output) = work(200), work(2000)
+        self.assertLessEqual(large_lines, 10 * small_lines)
+        self.assertLessEqual(large_output, 11 * small_output)
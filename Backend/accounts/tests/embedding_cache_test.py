@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import numpy as np
+from django.test import SimpleTestCase
+from unittest import mock
+from accounts.controllers import embedding_cache
+from accounts.controllers.embedding_cache import EmbeddingCache, model_revision
+
+
+### pre-requisite for this testcase : nothing (works on a temporary cache directory)
+
+### goal : cached vectors survive reopening, are journaled rather than rewritten, are evicted LRU past the size cap and are dropped on a new model revision
+class EmbeddingCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_store_and_lookup_persist_across_instances(self):
+        cache = EmbeddingCache("test-model", "v1", 4, cache_dir=self.cache_dir)
+        vectors = np.arange(8, dtype=np.float32).reshape(2, 4)
+        cache.store(["login   button", "username field"], vectors)
+
+        reopened = EmbeddingCache("test-model", "v1", 4, cache_dir=self.cache_dir)
+        # Whitespace is normalized before hashing
+        hits = reopened.lookup(["login button", "username field", "password field"])
+        np.testing.assert_allclose(hits[0], vectors[0])
+        np.testing.assert_allclose(hits[1], vectors[1])
+        self.assertIsNone(hits[2])
+
+    def test_lru_eviction_respects_size_cap(self):
+        cache = EmbeddingCache("test-model", "v1", 2, cache_dir=self.cache_dir, max_entries=2)
+        cache.store(["a", "b"], np.ones((2, 2)))
+        cache.lookup(["a"])  # "b" is now the least recently used entry
+        cache.store(["c"], np.zeros((1, 2)))
+
+        self.assertEqual(len(cache), 2)
+        hits = cache.lookup(["a", "b", "c"])
+        self.assertIsNotNone(hits[0])
+        self.assertIsNone(hits[1])
+        self.assertIsNotNone(hits[2])
+
+    def test_store_appends_to_the_journal_instead_of_rewriting_the_index(self):
+        cache = EmbeddingCache("test-model", "v1", 2, cache_dir=self.cache_dir)
+        cache.store([f"text {i}" for i in range(100)], np.ones((100, 2)))
+        snapshot = os.stat(cache.index_path)
+
+        with mock.patch.object(cache, "_write_index", wraps=cache._write_index) as write_index:
+            cache.store(["one more"], np.zeros((1, 2)))
+            cache.lookup(["text 0", "missing"])
+        write_index.assert_not_called()
+        self.assertEqual(os.stat(cache.index_path).st_mtime_ns, snapshot.st_mtime_ns)
+        with open(cache.log_path) as f:
+            self.assertEqual(f.read().splitlines()[-2:], [
+                f"+ {embedding_cache.text_key('one more')} 100", f"t {embedding_cache.text_key('text 0')}"
+            ])
+
+    def test_other_instances_replay_stores_and_touches(self):
+        first = EmbeddingCache("test-model", "v1", 2, cache_dir=self.cache_dir, max_entries=2)
+        second = EmbeddingCache("test-model", "v1", 2, cache_dir=self.cache_dir, max_entries=2)
+        first.store(["a", "b"], np.ones((2, 2)))
+        # The touch made by one instance decides what the other one evicts
+        first.lookup(["a"])
+        second.store(["c"], np.zeros((1, 2)))
+
+        hits = first.lookup(["a", "b", "c"])
+        self.assertIsNotNone(hits[0])
+        self.assertIsNone(hits[1])
+        np.testing.assert_allclose(hits[2], [0, 0])
+
+    def test_journal_is_compacted_into_the_index(self):
+        cache = EmbeddingCache("test-model", "v1", 2, cache_dir=self.cache_dir, max_entries=4)
+        for _ in range(1000):
+            cache.store(["a", "b"], np.ones((2, 2)))
+            cache.lookup(["a", "b"])
+        # The journal stays bounded by the index size, not by the number of operations
+        with open(cache.log_path) as f:
+            self.assertLessEqual(len(f.read().splitlines()), 2 * embedding_cache.INITIAL_CAPACITY + 2)
+
+        reopened = EmbeddingCache("test-model", "v1", 2, cache_dir=self.cache_dir, max_entries=4)
+        self.assertEqual(len(reopened), 2)
+        self.assertIsNotNone(reopened.lookup(["b"])[0])
+
+    def test_new_revision_invalidates_cache(self):
+        cache = EmbeddingCache("test-model", "v1", 2, cache_dir=self.cache_dir)
+        cache.store(["a"], np.ones((1, 2)))
+
+        new_version = EmbeddingCache("test-model", "v2", 2, cache_dir=self.cache_dir)
+        self.assertEqual(new_version.lookup(["a"]), [None])
+
+    def test_fine_tuned_model_revision_follows_metadata(self):
+        model_dir = os.path.join(self.cache_dir, "fine_tuned_model")
+        os.makedirs(model_dir)
+        with open(os.path.join(model_dir, "fine_tune_metadata.json"), "w") as f:
+            json.dump({"fine_tuned_date": "2025-05-11T17:24:13"}, f)
+        first = model_revision(model_dir)
+
+        with open(os.path.join(model_dir, "fine_tune_metadata.json"), "w") as f:
+            json.dump({"fine_tuned_date": "2025-05-12T09:00:00"}, f)
+        self.assertNotEqual(first, model_revision(model_dir))
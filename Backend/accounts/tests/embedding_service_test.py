@@ -0,0 +1,42 @@
+import os
+import torch
+from django.test import SimpleTestCase
+from transformers import AutoTokenizer, BertConfig, BertModel
+from accounts.controllers.embedding_service import EmbeddingService
+
+
+### pre-requisite for this testcase : tokenizer/config of the bundled fine-tuned model (no download needed)
+
+### goal : batched, length-bucketed embeddings are identical to encoding each text on its own
+MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'controllers', 'models', 'fine_tuned_model'
+)
+
+class EmbeddingServiceTestCase(SimpleTestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
+        self.model = BertModel(BertConfig.from_pretrained(MODEL_DIR))
+        self.service = EmbeddingService(self.tokenizer, self.model, batch_size=2)
+
+    def test_batched_embeddings_match_single_embeddings(self):
+        texts = [
+            "When user clicks on the login button",
+            "input id=username name=username type=text placeholder=Enter your username",
+            "a",
+            "button id=submit text=Submit parent=form",
+            "select id=country name=country",
+        ]
+        embeddings = self.service.encode(texts)
+        self.assertEqual(embeddings.shape, (len(texts), self.model.config.hidden_size))
+
+        for index, text in enumerate(texts):
+            inputs = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True)
+            with torch.no_grad():
+                expected = self.model(**inputs).last_hidden_state.mean(dim=1)
+            self.assertTrue(torch.allclose(embeddings[index:index + 1], expected, atol=1e-5))
+
+    def test_empty_input(self):
+        embeddings = self.service.encode([])
+        self.assertEqual(embeddings.shape, (0, self.model.config.hidden_size))
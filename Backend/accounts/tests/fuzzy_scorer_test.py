@@ -0,0 +1,88 @@
+import json
+import os
+import random
+import numpy as np
+from django.conf import settings
+from django.test import SimpleTestCase
+from fuzzywuzzy import fuzz
+from accounts.controllers.fuzzy_scorer import partial_ratio, attribute_scores
+
+FIXTURES = os.path.join(settings.BASE_DIR, "benchmarks", "fixtures", "inference_fixtures.json")
+ATTRIBUTES = ["text", "id", "name", "placeholder", "type", "option_value", "option_text"]
+COUNTRIES = ["Egypt", "France", "Germany", "Brazil", "Japan", "Canada", "India", "Spain"]
+
+
+def realistic_elements(pages, count, seed=0):
+    """
+    count elements with unique ids, names and texts, derived from the fixture pages;
+    every fifth one is a dropdown <option>.
+    """
+    rng = random.Random(seed)
+    templates = [element for elements in pages.values() for element in elements]
+    elements = []
+    for i in range(count):
+        if i % 5 == 4:
+            country = rng.choice(COUNTRIES)
+            elements.append({"attributes": {
+                "role": "option", "text": f"{country} {i}",
+                "option_value": f"{country[:2].lower()}-{i}", "option_text": f"{country} {i}"
+            }})
+            continue
+        template = rng.choice(templates)
+        attributes = {"role": template.get("role"), "type": template.get("type")}
+        for attribute in ("id", "name"):
+            if template.get(attribute):
+                attributes[attribute] = f"{template[attribute]}-{i}"
+        for attribute in ("text", "placeholder"):
+            if template.get(attribute):
+                attributes[attribute] = f"{template[attribute]} {rng.choice(['', 'now', 'here', 'item'])} {i}".strip()
+        elements.append({"attributes": attributes})
+    return elements
+
+
+### pre-requisite for this testcase : the mapping fixtures in benchmarks/fixtures/inference_fixtures.json
+
+### goal : partial_ratio gives exactly fuzzywuzzy's scores, so the mapping weights and rankings are unchanged
+class FuzzyScorerTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with open(FIXTURES) as f:
+            cls.fixtures = json.load(f)
+        cls.steps = [case["step"].lower() for case in cls.fixtures["mapping"]]
+
+    def test_scores_match_fuzzywuzzy_on_the_mapping_fixtures(self):
+        elements = [element for elements in self.fixtures["pages"].values() for element in elements]
+        elements += realistic_elements(self.fixtures["pages"], 300)
+        values = {(element.get("attributes", element).get(attribute) or "").lower()
+                  for element in elements for attribute in ATTRIBUTES}
+
+        for step in self.steps:
+            for value in values:
+                self.assertEqual(partial_ratio(step, value), fuzz.partial_ratio(step, value), (step, value))
+
+    def test_block_alignment_is_kept(self):
+        # rapidfuzz's optimal alignment scores this pair 71
+        self.assertEqual(partial_ratio("login username the email user", "btn-login"), 22)
+        self.assertEqual(partial_ratio("when user enters username", ""), 0)
+        self.assertEqual(partial_ratio("", ""), 100)
+        self.assertEqual(partial_ratio("abc", None), 0)
+
+    def test_attribute_scores_sum_columns(self):
+        elements = [
+            {"attributes": {"id": "username", "name": "user", "text": None}},
+            {"attributes": {"id": "submit"}},
+        ]
+        scores = attribute_scores(["When user enters username"], elements, ["id", "name", "text"])
+        self.assertEqual(scores[0, 0], 200)
+        self.assertEqual(scores[0, 1], fuzz.partial_ratio("when user enters username", "submit"))
+
+    def test_candidates_score_only_their_pairs(self):
+        elements = realistic_elements(self.fixtures["pages"], 50)
+        steps = [case["step"] for case in self.fixtures["mapping"][:3]]
+        candidates = np.array([[4, 0, 7], [1, 1, 2], [49, 3, 0]])
+
+        full = attribute_scores(steps, elements, ATTRIBUTES)
+        scores = attribute_scores(steps, elements, ATTRIBUTES, candidates)
+        self.assertEqual(scores.shape, (3, 3))
+        np.testing.assert_array_equal(scores, np.take_along_axis(full, candidates, axis=1))
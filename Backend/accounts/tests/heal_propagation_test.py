@@ -0,0 +1,54 @@
+from django.test import TestCase
+from accounts.models import CustomUser, Project, Execution, Scenarios, HealedElements
+from accounts.controllers.heal_propagation import propagate_heals
+
+HEADER = ["Step", "Page", "ID", "Class", "Name", "Value", "XPath (Absolute)", "XPath (Relative)", "CSS Selector"]
+
+
+def row(step, element_id):
+    return [step, "https://shop.test/login", element_id, "N/A", "N/A", "N/A",
+            f"/html/body/{element_id}", "N/A", f"#{element_id}"]
+
+
+def heal(old_id, new_id):
+    return {
+        "original_element_id": old_id,
+        "new_strategies": {"id": new_id, "CSS Selector": f"#{new_id}", "XPath (Absolute)": f"/html/body/div/{new_id}"},
+        "timestamp": "2026-10-18T10:00:00",
+    }
+
+
+### pre-requisite for this testcase : need a user, a project, an execution and scenarios whose mappings share elements
+
+### goal : all heals are applied in memory and stored with one bulk insert and one bulk update of the changed mapping rows
+class HealPropagationTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="heal@example.com", password="Test@1234", full_name="Heal")
+        self.project = Project.objects.create(project_name="Heal", user=self.user)
+        self.execution = Execution.objects.create(execution_name="Run", project=self.project)
+        self.login = Scenarios.objects.create(project=self.project, scenarios_name="Login", mapping_file=[
+            HEADER, row("When I type the email", "email"), row("When I click login", "login")
+        ])
+        self.checkout = Scenarios.objects.create(project=self.project, scenarios_name="Checkout", mapping_file=[
+            HEADER, row("When I click login", "login"), row("When I click pay", "pay")
+        ])
+        self.search = Scenarios.objects.create(project=self.project, scenarios_name="Search", mapping_file=[
+            HEADER, row("When I search", "search")
+        ])
+
+    def test_changed_scenarios_are_updated_in_one_statement(self):
+        heals = [heal("login", "sign-in"), heal("sign-in", "sign-in-2"), heal("pay", "")]
+        scenarios = [self.login, self.checkout, self.search]
+        # Savepoint, bulk insert, indexed row lookup, bulk update, scenario and project version bumps, release
+        with self.assertNumQueries(7):
+            updated = propagate_heals(self.execution, heals, scenarios)
+        self.assertEqual(updated, 2)
+
+        self.login.refresh_from_db()
+        self.checkout.refresh_from_db()
+        self.assertEqual(self.login.mapping_file[1][2], "email")
+        self.assertEqual(self.login.mapping_file[2][2], "sign-in-2")  # Healed twice in report order
+        self.assertEqual(self.login.mapping_file[2][8], "#sign-in-2")
+        self.assertEqual(self.checkout.mapping_file[1][6], "/html/body/div/sign-in-2")
+        self.assertEqual(self.checkout.mapping_file[2][2], "pay")  # Incomplete heal is not applied
+        self.assertEqual(HealedElements.objects.filter(execution=self.execution).count(), 3)
@@ -0,0 +1,89 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from accounts.http_cache import clear_response_cache
+from accounts.models import CustomUser, Project, Scenarios, Execution, Metrics, ExecutionSequence
+from accounts.controllers.heal_propagation import propagate_heals
+
+HEADER = ["Step", "Page", "ID", "Class", "Name", "Value", "XPath (Absolute)", "XPath (Relative)", "CSS Selector"]
+ROW = ["When I click login", "https://shop.test/login", "login", "N/A", "N/A", "N/A", "/html/body/login", "N/A", "#login"]
+
+
+### pre-requisite for this testcase : need a user, a project with a scenario, a sequence and an execution with metrics
+
+### goal : polled endpoints answer 304 or a cached body while the data is unchanged, and a fresh body after any write
+class HttpCacheTestCase(APITestCase):
+    def setUp(self):
+        clear_response_cache()
+        self.user = CustomUser.objects.create_user(email="cache@example.com", password="Test@1234", full_name="Cache")
+        self.project = Project.objects.create(project_name="Cache", user=self.user)
+        self.scenario = Scenarios.objects.create(project=self.project, scenarios_name="Login", mapping_file=[HEADER, ROW])
+        ExecutionSequence.objects.create(project=self.project, number="nightly")
+        self.execution = Execution.objects.create(execution_name="Run 1", project=self.project)
+        Metrics.objects.create(execution=self.execution, number_of_scenarios=1, number_of_healed_elements=0)
+
+    def test_unchanged_mapping_is_not_modified(self):
+        url = reverse("get_scenario_mapping", args=[self.scenario.scenario_id])
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("ETag", first)
+        self.assertIn("Last-Modified", first)
+
+        # Version check only: no mapping rows are loaded
+        with self.assertNumQueries(1):
+            second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+
+        # Without validators the cached body is served
+        with self.assertNumQueries(1):
+            third = self.client.get(url)
+        self.assertEqual(third.data, first.data)
+
+    def test_mapping_write_changes_etag(self):
+        url = reverse("get_scenario_mapping", args=[self.scenario.scenario_id])
+        first = self.client.get(url)
+
+        self.scenario.mapping_file = [HEADER, ROW[:2] + ["sign-in"] + ROW[3:]]
+        self.scenario.save()
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertEqual(second.data["mapping_file"][1][2], "sign-in")
+
+    def test_bulk_heal_changes_etags(self):
+        mapping_url = reverse("get_scenario_mapping", args=[self.scenario.scenario_id])
+        metrics_url = reverse("get_project_metrics", args=[self.project.project_id])
+        mapping_etag = self.client.get(mapping_url)["ETag"]
+        metrics_etag = self.client.get(metrics_url)["ETag"]
+
+        propagate_heals(self.execution, [{
+            "original_element_id": "login",
+            "new_strategies": {"id": "sign-in", "CSS Selector": "#sign-in", "XPath (Absolute)": "/html/body/sign-in"},
+            "timestamp": "2026-10-18T10:00:00",
+        }], [self.scenario])
+
+        mapping = self.client.get(mapping_url, HTTP_IF_NONE_MATCH=mapping_etag)
+        self.assertEqual(mapping.status_code, 200)
+        self.assertEqual(mapping.data["mapping_file"][1][2], "sign-in")
+        metrics = self.client.get(metrics_url, HTTP_IF_NONE_MATCH=metrics_etag)
+        self.assertEqual(metrics.status_code, 200)
+        self.assertEqual(len(metrics.data["healed_elements"]), 1)
+
+    def test_project_endpoints_follow_writes(self):
+        names = ("get_metrics", "get_project_metrics", "project_metrics_summary", "get_execution_sequences")
+        etags = {}
+        for name in names:
+            url = reverse(name, args=[self.project.project_id])
+            etags[name] = self.client.get(url)["ETag"]
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[name]).status_code, 304, name)
+
+        Metrics.objects.create(
+            execution=Execution.objects.create(execution_name="Run 2", project=self.project),
+            number_of_scenarios=1, number_of_healed_elements=0
+        )
+        ExecutionSequence.objects.create(project=self.project, number="weekly")
+
+        for name in names:
+            url = reverse(name, args=[self.project.project_id])
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[name]).status_code, 200, name)
+        self.assertEqual(len(self.client.get(reverse("get_metrics", args=[self.project.project_id])).data), 2)
+        self.assertEqual(len(self.client.get(reverse("get_execution_sequences", args=[self.project.project_id])).data), 2)
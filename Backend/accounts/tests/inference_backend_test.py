@@ -0,0 +1,46 @@
+import copy
+import os
+import torch
+from django.test import SimpleTestCase, override_settings
+from transformers import AutoTokenizer, BertConfig, BertModel
+from accounts.controllers.embedding_service import EmbeddingService
+from accounts.controllers.inference_backend import get_inference_backend, quantize_int8, INT8, FP32
+
+MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'controllers', 'models', 'fine_tuned_model'
+)
+
+
+### pre-requisite for this testcase : tokenizer/config of the bundled fine-tuned model (no download needed)
+
+### goal : the int8 backend quantizes the Linear layers, keeps embeddings close to fp32 and caches them under its own revision
+class InferenceBackendTestCase(SimpleTestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
+        self.model = BertModel(BertConfig.from_pretrained(MODEL_DIR)).eval()
+
+    def test_int8_embeddings_stay_close_to_fp32(self):
+        quantized = quantize_int8(copy.deepcopy(self.model))
+        self.assertFalse(any(type(module) is torch.nn.Linear for module in quantized.modules()))
+
+        texts = ["When the user clicks the login button", "button id=submit text=Sign in", "input id=email"]
+        fp32 = EmbeddingService(self.tokenizer, self.model).encode(texts)
+        int8 = EmbeddingService(self.tokenizer, quantized).encode(texts)
+        similarity = torch.nn.functional.cosine_similarity(fp32, int8)
+        self.assertTrue(torch.all(similarity > 0.99), similarity)
+
+    def test_backend_is_part_of_the_cache_revision(self):
+        fp32 = EmbeddingService(self.tokenizer, self.model, model_name=MODEL_DIR, backend=FP32)
+        int8 = EmbeddingService(self.tokenizer, self.model, model_name=MODEL_DIR, backend=INT8)
+        self.assertNotEqual(fp32.revision, int8.revision)
+        self.assertTrue(int8.revision.endswith("+int8"))
+
+    @override_settings(INFERENCE_BACKEND="INT8")
+    def test_backend_from_settings(self):
+        self.assertEqual(get_inference_backend(), INT8)
+
+    @override_settings(INFERENCE_BACKEND="bf16")
+    def test_unknown_backend_falls_back_to_fp32(self):
+        self.assertEqual(get_inference_backend(), FP32)
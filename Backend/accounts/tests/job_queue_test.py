@@ -0,0 +1,123 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.models import CustomUser, Project, Execution, Job
+from accounts.jobs import enqueue, job_handler, requeue_stale_jobs, run_worker
+
+calls = []
+
+
+@job_handler('test_echo')
+def echo(ctx, payload):
+    ctx.plan(["first", "second"])
+    with ctx.step("first"):
+        calls.append(payload["value"])
+    with ctx.step("second"):
+        pass
+    return {"echo": payload["value"]}, 201
+
+
+@job_handler('test_flaky', max_attempts=2)
+def flaky(ctx, payload):
+    with ctx.step("only"):
+        raise RuntimeError("boom")
+
+
+### pre-requisite for this testcase : nothing (test handlers registered above)
+
+### goal : queued jobs are claimed by a worker, report per-step progress, store their response and retry or fail cleanly
+@override_settings(JOBS={'EAGER': False, 'HEARTBEAT_SECONDS': 0, 'RETRY_DELAY_SECONDS': 60, 'STALE_AFTER_SECONDS': 60})
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_worker_runs_queued_job(self):
+        job = enqueue('test_echo', {"value": 7})
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(calls, [])
+
+        result = self.client.get(reverse('job_result', args=[job.job_id]))
+        self.assertEqual(result.status_code, 202)
+
+        run_worker(once=True)
+        job.refresh_from_db()
+        self.assertEqual(calls, [7])
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual([step["status"] for step in job.steps], [Job.SUCCEEDED, Job.SUCCEEDED])
+
+        status = self.client.get(reverse('job_status', args=[job.job_id]))
+        self.assertEqual(status.json()["progress"], {"completed": 2, "total": 2, "current_step": None})
+        result = self.client.get(reverse('job_result', args=[job.job_id]))
+        self.assertEqual(result.status_code, 201)
+        self.assertEqual(result.json(), {"echo": 7})
+
+    def test_failed_job_is_retried_then_failed(self):
+        job = enqueue('test_flaky', {})
+        run_worker(once=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertGreater(job.available_at, timezone.now())  # Backoff: not claimed again yet
+
+        Job.objects.filter(pk=job.pk).update(available_at=timezone.now())
+        run_worker(once=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.result_status), (Job.FAILED, 2, 500))
+        self.assertIn("RuntimeError: boom", job.error)
+        self.assertEqual(job.steps[0]["status"], Job.FAILED)
+
+    def test_stale_running_job_is_requeued(self):
+        job = enqueue('test_echo', {"value": 1})
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.RUNNING, locked_by="dead-worker", attempts=1, heartbeat_at=timezone.now() - timedelta(minutes=5)
+        )
+        self.assertEqual(requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)  # No attempts left
+
+        job = enqueue('test_flaky', {})
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.RUNNING, attempts=1, heartbeat_at=timezone.now() - timedelta(minutes=5)
+        )
+        requeue_stale_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+
+
+### pre-requisite for this testcase : need a user, a project and an execution to give healing feedback on
+
+### goal : slow endpoints answer 202 with a job id at once; the job's result is fetched separately and only by its owner
+class JobEndpointsTestCase(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="jobs@example.com", password="Test@1234", full_name="Job User")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        self.project = Project.objects.create(project_name="Jobs", user=self.user)
+        self.execution = Execution.objects.create(execution_name="Run", project=self.project)
+
+    @override_settings(JOBS={'EAGER': False})
+    def test_endpoint_returns_job_id(self):
+        response = self.client.post(reverse('accept_healing'), {"execution_id": self.execution.execution_id}, format="json")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], Job.QUEUED)
+        job = Job.objects.get(job_id=response.data["job_id"])
+        self.assertEqual((job.kind, job.user, job.project), ('accept_healing', self.user, self.project))
+
+        # Validation still happens in the request
+        response = self.client.post(reverse('accept_healing'), {}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+        other = CustomUser.objects.create_user(email="other@example.com", password="Test@1234", full_name="Other")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(other)}")
+        self.assertEqual(self.client.get(reverse('job_status', args=[job.job_id])).status_code, 404)
+
+    @override_settings(JOBS={'EAGER': True})
+    def test_eager_mode_runs_in_request(self):
+        response = self.client.post(reverse('reject_healing'), {"execution_id": self.execution.execution_id}, format="json")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], Job.SUCCEEDED)
+        self.assertEqual(response.data["result"], {"message": "No healing examples to fine-tune with"})
+
+        result = self.client.get(response.data["result_url"])
+        self.assertEqual(result.status_code, 200)
@@ -0,0 +1,102 @@
+from django.test import SimpleTestCase
+from selenium.common.exceptions import JavascriptException
+from accounts.controllers.self_healing_framework.locator_cache import (
+    LocatorCache, LOOKUP_SCRIPT, url_pattern, clear_locator_cache
+)
+
+
+class FakePage:
+    """Answers LOOKUP_SCRIPT for a page with a given structure fingerprint and (kind, value) -> element map."""
+
+    def __init__(self, fingerprint, elements):
+        self.fingerprint = fingerprint
+        self.elements = elements
+        self.calls = []
+
+    def execute_script(self, script, fingerprints, entries, max_depth, max_elements):
+        assert script == LOOKUP_SCRIPT
+        self.calls.append((list(fingerprints), [list(entry) for entry in entries]))
+        if self.fingerprint not in fingerprints:
+            return [self.fingerprint, None]
+        for kind, value in entries[fingerprints.index(self.fingerprint)]:
+            if (kind, value) in self.elements:
+                return [self.fingerprint, self.elements[(kind, value)]]
+        return [self.fingerprint, None]
+
+
+STEP = "When I click on the login button"
+ELEMENT_INFO = {
+    'locator_strategies': {'id': 'login', 'CSS Selector': '#login-btn', 'XPath (Absolute)': '/html/body/button'},
+    'resolved_strategy': 'CSS Selector'
+}
+
+
+### pre-requisite for this testcase : nothing (fake WebDriver)
+
+### goal : resolved locators are cached per (project, URL pattern, step, mapped locators, DOM fingerprint), re-validated in one script and dropped when stale
+class LocatorCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        clear_locator_cache()
+
+    def test_url_pattern_ignores_record_ids_and_query(self):
+        self.assertEqual(url_pattern("https://shop.test/orders/42?tab=1#top"), "https://shop.test/orders/:id")
+        self.assertEqual(
+            url_pattern("https://shop.test/u/3f2504e0-4f89-11d3-9a0c-0305e82c3301/edit"), "https://shop.test/u/:id/edit"
+        )
+        self.assertNotEqual(url_pattern("https://shop.test/login"), url_pattern("https://shop.test/signup"))
+
+    def test_store_then_hit_across_pages_of_the_same_pattern(self):
+        driver = FakePage("abc:120", {('css', '#login-btn'): "button"})
+        cache = LocatorCache(driver)
+
+        element, fingerprint = cache.lookup("https://shop.test/orders/1", STEP, dict(ELEMENT_INFO))
+        self.assertIsNone(element)
+        self.assertEqual(fingerprint, "abc:120")
+        cache.store("https://shop.test/orders/1", fingerprint, STEP, ELEMENT_INFO)
+
+        # Another scenario (new cache object) on another record of the same page
+        info = {'locator_strategies': ELEMENT_INFO['locator_strategies']}
+        element, _ = LocatorCache(driver).lookup("https://shop.test/orders/2", STEP, info)
+        self.assertEqual(element, "button")
+        self.assertEqual(info['resolved_strategy'], 'CSS Selector')  # Reported to the strategy agent
+        self.assertEqual(driver.calls[-1], (["abc:120"], [[['css', '#login-btn']]]))  # Only the winning locator
+
+    def test_changed_structure_misses_and_stale_locator_is_dropped(self):
+        driver = FakePage("abc:120", {})
+        cache = LocatorCache(driver)
+        cache.store("https://shop.test/login", "abc:120", STEP, ELEMENT_INFO)
+
+        driver.fingerprint = "def:98"
+        self.assertEqual(cache.lookup("https://shop.test/login", STEP, dict(ELEMENT_INFO)), (None, "def:98"))
+
+        driver.fingerprint = "abc:120"
+        self.assertEqual(cache.lookup("https://shop.test/login", STEP, dict(ELEMENT_INFO)), (None, "abc:120"))
+        cache.lookup("https://shop.test/login", STEP, dict(ELEMENT_INFO))
+        self.assertEqual(driver.calls[-1], ([], []))
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_healed_element_caches_all_locators_and_script_errors_miss(self):
+        info = {'locator_strategies': {'id': 'new-login', 'XPath (Absolute)': '/html/body/div/button'}}
+        self.assertEqual(LocatorCache.locators_for(info), [['id', 'new-login'], ['xpath', '/html/body/div/button']])
+
+        class Navigating:
+            def execute_script(self, *args):
+                raise JavascriptException("page is navigating")
+
+        self.assertEqual(LocatorCache(Navigating()).lookup("https://shop.test/login", STEP, dict(ELEMENT_INFO)), (None, None))
+
+    def test_projects_and_edited_mappings_do_not_share_entries(self):
+        driver = FakePage("abc:120", {('css', '#login-btn'): "button", ('id', 'sign-in'): "new button"})
+        LocatorCache(driver, project_id=1).store("https://shop.test/login", "abc:120", STEP, dict(ELEMENT_INFO))
+        self.assertEqual(LocatorCache(driver, project_id=1).lookup("https://shop.test/login", STEP, dict(ELEMENT_INFO))[0], "button")
+
+        # Same step text on the same page in another project
+        self.assertIsNone(LocatorCache(driver, project_id=2).lookup("https://shop.test/login", STEP, dict(ELEMENT_INFO))[0])
+
+        # The user edited the step's mapping: the cached locator is not used any more
+        edited = {'locator_strategies': {'id': 'sign-in', 'CSS Selector': '#sign-in'}}
+        self.assertIsNone(LocatorCache(driver, project_id=1).lookup("https://shop.test/login", STEP, edited)[0])
+
+        # A remembered heal keeps the key of the mapped locators
+        healed = {'locator_strategies': {'id': 'sign-in'}, 'original_strategies': ELEMENT_INFO['locator_strategies']}
+        self.assertEqual(LocatorCache(driver, project_id=1).lookup("https://shop.test/login", STEP, healed)[0], "button")
@@ -0,0 +1,85 @@
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from accounts.jobs import enqueue
+from accounts.models import CustomUser, Project, Execution, HealedLocator, Job
+from accounts.controllers.locator_memory import LocatorMemory, forget_heals, locator_key
+from accounts.controllers.self_healing_framework.mapping_loader import MappingLoader
+
+ROW = {
+    'Step': 'When I click on the login button',
+    'Page': 'https://shop.test/login',
+    'ID': 'login',
+    'CSS Selector': '#login',
+    'XPath (Absolute)': '/html/body/form/button',
+}
+HEALED = {'id': 'sign-in', 'CSS Selector': '#sign-in', 'XPath (Absolute)': '/html/body/div/form/button'}
+
+
+### pre-requisite for this testcase : need a user and a project to remember heals for
+
+### goal : a heal is stored per project, applied by the mapping loader on the next run, its reuse is counted and a rejection removes it
+class LocatorMemoryTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="memory@example.com", password="Test@1234", full_name="Memory")
+        self.project = Project.objects.create(project_name="Memory", user=self.user)
+
+    def test_remembered_heal_is_applied_on_next_load(self):
+        original = MappingLoader([ROW]).load_mappings()[ROW['Step']]['locator_strategies']
+        LocatorMemory(self.project).remember(original, HEALED, confidence=0.82)
+
+        memory = LocatorMemory(self.project)
+        element_info = MappingLoader([ROW], memory).load_mappings()[ROW['Step']]
+        self.assertEqual(element_info['locator_strategies'], HEALED)
+        self.assertEqual(element_info['original_strategies'], original)
+
+        memory.record_hit(original)
+        memory.record_hit(original)
+        self.assertEqual(memory.flush(), 1)
+        entry = HealedLocator.objects.get(project=self.project)
+        self.assertEqual((entry.hit_count, entry.confidence), (2, 0.82))
+        self.assertIsNotNone(entry.last_validated_at)
+
+    def test_key_ignores_empty_strategies_and_projects_are_separate(self):
+        self.assertEqual(locator_key({'id': 'a', 'CSS Selector': ''}), locator_key({'id': 'a'}))
+
+        LocatorMemory(self.project).remember({'id': 'a'}, {'id': 'b'})
+        other = Project.objects.create(project_name="Other", user=self.user)
+        self.assertIsNone(LocatorMemory(other).lookup({'id': 'a'}))
+        self.assertEqual(LocatorMemory(self.project).lookup({'id': 'a'}), {'id': 'b'})
+
+        # A new heal of the same element replaces the old one
+        LocatorMemory(self.project).remember({'id': 'a'}, {'id': 'c'})
+        self.assertEqual(HealedLocator.objects.filter(project=self.project).count(), 1)
+
+    @override_settings(JOBS={'EAGER': True})
+    @patch('accounts.controllers.self_healing_framework.fine_tuner.ModelFineTuner')
+    def test_rejected_heal_is_not_applied_on_next_run(self, fine_tuner):
+        fine_tuner.return_value.fine_tune.return_value = True
+        # First run: the element is healed and remembered right away
+        original = MappingLoader([ROW]).load_mappings()[ROW['Step']]['locator_strategies']
+        LocatorMemory(self.project).remember(original, HEALED, confidence=0.82)
+        other = {'id': 'cart'}
+        LocatorMemory(self.project).remember(other, {'id': 'basket'})
+
+        execution = Execution.objects.create(execution_name="Run 1", project=self.project)
+        job = enqueue('reject_healing', {
+            "execution_id": execution.execution_id,
+            "healed_elements": [{
+                "original_element_id": ROW['ID'],
+                "original_strategies": original,
+                "new_strategies": HEALED,
+            }],
+        }, user=self.user, project=self.project)
+        self.assertEqual(job.status, Job.SUCCEEDED)
+
+        # Next run: the mapped locators are used again; other heals are kept
+        element_info = MappingLoader([ROW], LocatorMemory(self.project)).load_mappings()[ROW['Step']]
+        self.assertEqual(element_info['locator_strategies'], original)
+        self.assertNotIn('original_strategies', element_info)
+        self.assertEqual(LocatorMemory(self.project).lookup(other), {'id': 'basket'})
+
+    def test_reject_keeps_a_newer_heal(self):
+        LocatorMemory(self.project).remember({'id': 'a'}, {'id': 'c'})
+        # The user rejects an older report that healed a to b
+        self.assertEqual(forget_heals(self.project, [{"original_strategies": {'id': 'a'}, "new_strategies": {'id': 'b'}}]), 0)
+        self.assertEqual(LocatorMemory(self.project).lookup({'id': 'a'}), {'id': 'c'})
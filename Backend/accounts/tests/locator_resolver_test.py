@@ -0,0 +1,66 @@
+import time
+from django.test import SimpleTestCase
+from selenium.common.exceptions import JavascriptException
+from accounts.controllers.self_healing_framework.locator_resolver import LocatorResolver, RESOLVE_SCRIPT
+
+
+class FakePage:
+    """Answers RESOLVE_SCRIPT from a dict of (kind, value) -> element; elements may appear after some ticks."""
+
+    def __init__(self, elements, appear_after=0, fail_first=0):
+        self.elements = elements
+        self.appear_after = appear_after
+        self.fail_first = fail_first
+        self.calls = 0
+
+    def execute_script(self, script, locators):
+        assert script == RESOLVE_SCRIPT
+        self.calls += 1
+        if self.calls <= self.fail_first:
+            raise JavascriptException("page is navigating")
+        if self.calls <= self.appear_after:
+            return None
+        for position, (kind, value) in enumerate(locators):
+            if (kind, value) in self.elements:
+                return [position, self.elements[(kind, value)]]
+        return None
+
+
+STRATEGIES = {
+    'id': 'login-button',
+    'CSS Selector': '#login-btn',
+    'XPath (Absolute)': '/html/body/form/button',
+    'unknown strategy': 'ignored'
+}
+
+
+### pre-requisite for this testcase : nothing (fake WebDriver)
+
+### goal : all strategies are raced in one script per tick, the first hit returns at once and the winning strategy is recorded
+class LocatorResolverTestCase(SimpleTestCase):
+    def test_broken_primary_costs_one_tick(self):
+        driver = FakePage({('css', '#login-btn'): "button"})
+        resolver = LocatorResolver(driver)
+
+        start = time.monotonic()
+        result = resolver.resolve(STRATEGIES, timeout=10)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(result.element, "button")
+        self.assertEqual(result.strategy, 'CSS Selector')
+        self.assertEqual(driver.calls, 1)
+        self.assertEqual(resolver.wins, {'CSS Selector': 1})
+
+    def test_priority_order_and_polling(self):
+        driver = FakePage({('xpath', '/html/body/form/button'): "by-xpath", ('id', 'login-button'): "by-id"},
+                          appear_after=2, fail_first=1)
+        result = LocatorResolver(driver, poll_interval=0.01).resolve(STRATEGIES, timeout=5)
+        self.assertEqual(result.strategy, 'id')
+        self.assertEqual(result.polls, 3)
+
+    def test_timeout_when_nothing_matches(self):
+        driver = FakePage({})
+        start = time.monotonic()
+        self.assertIsNone(LocatorResolver(driver, poll_interval=0.02).resolve(STRATEGIES, timeout=0.1))
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertGreater(driver.calls, 1)
+        self.assertIsNone(LocatorResolver(driver).resolve({'id': '', 'unknown': 'x'}))
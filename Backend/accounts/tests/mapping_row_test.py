@@ -0,0 +1,45 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.models import CustomUser, Project, Scenarios, MappingRow
+
+HEADER = ["Step", "Page", "ID", "Class", "Name", "Value", "XPath (Absolute)", "XPath (Relative)", "CSS Selector"]
+MAPPING = [
+    HEADER,
+    ["When I type the email", "https://shop.test/login", "email", "field", "email", "N/A", "/html/body/input", "N/A", "#email"],
+    ["When I click login", "https://shop.test/login", "login", "btn", "N/A", "N/A", "/html/body/button", "N/A", "#login"],
+]
+
+
+### pre-requisite for this testcase : need a user, a project and scenarios with mappings
+
+### goal : mappings are stored as indexed rows, read back in the list-of-lists shape and queryable across scenarios
+class MappingRowTestCase(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="rows@example.com", password="Test@1234", full_name="Rows")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        self.project = Project.objects.create(project_name="Rows", user=self.user)
+        self.scenario = Scenarios.objects.create(project=self.project, scenarios_name="Login", mapping_file=MAPPING)
+
+    def test_rows_round_trip_and_cross_scenario_lookup(self):
+        self.assertEqual(self.scenario.mapping_rows.count(), 2)
+        self.assertEqual(Scenarios.objects.get(pk=self.scenario.pk).mapping_file, MAPPING)
+
+        Scenarios.objects.create(project=self.project, scenarios_name="Checkout", mapping_file=[HEADER, MAPPING[2]])
+        rows = MappingRow.objects.filter(scenario__project=self.project, element_id="login")
+        self.assertEqual(rows.count(), 2)
+
+        # Columns outside the standard header are kept
+        scenario = Scenarios.objects.create(project=self.project, mapping_file=[HEADER + ["Note"], MAPPING[1] + ["flaky"]])
+        self.assertEqual(Scenarios.objects.get(pk=scenario.pk).mapping_file[1][-1], "flaky")
+
+    def test_mapping_endpoints_keep_the_list_of_lists_shape(self):
+        response = self.client.get(reverse('get_scenario_mapping', args=[self.scenario.scenario_id]))
+        self.assertEqual(response.data["mapping_file"], MAPPING)
+
+        updated = [HEADER, MAPPING[1]]
+        response = self.client.put(
+            reverse('update_scenario_mapping', args=[self.scenario.scenario_id]), {"mapping_file": updated}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.scenario.mapping_rows.values_list('element_id', flat=True)), ["email"])
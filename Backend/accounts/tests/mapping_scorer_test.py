@@ -0,0 +1,118 @@
+import json
+import time
+from unittest import mock
+import numpy as np
+import torch
+from django.test import SimpleTestCase
+from accounts.controllers import fuzzy_scorer
+from accounts.controllers.fuzzy_scorer import attribute_scores
+from accounts.controllers.mapping_scorer import (
+    score_matrix, score_steps, is_dropdown_step, FUZZY_ATTRIBUTES, OPTION_ATTRIBUTES, FUZZY_CANDIDATES
+)
+from accounts.tests.fuzzy_scorer_test import FIXTURES, COUNTRIES, realistic_elements
+
+
+def embedded(steps, elements, dim=1024, seed=0):
+    """
+    score_steps arguments for steps and elements with random embeddings and descriptions.
+    """
+    generator = torch.Generator().manual_seed(seed)
+    return (
+        steps, torch.randn(len(steps), dim, generator=generator), torch.randn(len(steps), dim, generator=generator),
+        [True] * len(steps),
+        elements, torch.randn(len(elements), dim, generator=generator), torch.randn(len(elements), dim, generator=generator),
+        [index % 3 != 0 for index in range(len(elements))]
+    )
+
+
+### pre-requisite for this testcase : the mapping fixtures in benchmarks/fixtures/inference_fixtures.json
+
+### goal : the steps x elements scores apply the same weights as the per-pair mapping loop, and the whole scoring stage stays under a second
+class MappingScorerTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with open(FIXTURES) as f:
+            cls.fixtures = json.load(f)
+
+    def test_matrix_matches_pairwise_formula(self):
+        torch.manual_seed(0)
+        steps = ["When user enters name", "And user selects Egypt from the country dropdown"]
+        step_embeddings = torch.randn(2, 8)
+        step_description_embeddings = torch.randn(2, 8)
+        element_embeddings = torch.randn(3, 8)
+        element_description_embeddings = torch.randn(3, 8)
+        step_has_description = [True, False]
+        element_has_description = [True, True, False]
+        roles = ["input", "option", "select"]
+        fuzzy_scores = np.array([[100.0, 50.0, 0.0], [20.0, 40.0, 60.0]])
+        option_scores = np.array([[0.0, 0.0, 0.0], [0.0, 150.0, 0.0]])
+
+        matrix = score_matrix(
+            step_embeddings, element_embeddings,
+            step_description_embeddings, element_description_embeddings,
+            step_has_description, element_has_description,
+            fuzzy_scores=fuzzy_scores, option_scores=option_scores,
+            dropdown_steps=[is_dropdown_step(step) for step in steps], element_roles=roles
+        )
+
+        cos = torch.nn.functional.cosine_similarity
+        for i in range(2):
+            for j in range(3):
+                expected = cos(step_embeddings[i:i + 1], element_embeddings[j:j + 1]).item()
+                if step_has_description[i] and element_has_description[j]:
+                    description = cos(step_description_embeddings[i:i + 1], element_description_embeddings[j:j + 1]).item()
+                    expected = expected * 0.8 + description * 0.2
+                expected += fuzzy_scores[i, j] / 500 * 0.2
+                if i == 1 and roles[j] == "option":
+                    expected += option_scores[i, j] / 200 * 0.3
+                elif i == 1 and roles[j] == "select":
+                    expected *= 0.5
+                self.assertAlmostEqual(matrix[i, j], expected, places=5)
+
+    def test_score_steps_matches_the_full_matrix(self):
+        steps = [case["step"] for case in self.fixtures["mapping"]]
+        elements = [{"attributes": element} for elements in self.fixtures["pages"].values() for element in elements]
+        elements += realistic_elements(self.fixtures["pages"], FUZZY_CANDIDATES - len(elements))
+        arguments = embedded(steps, elements, dim=16)
+
+        dropdown_steps = [is_dropdown_step(step) for step in steps]
+        self.assertTrue(any(dropdown_steps))
+        option_scores = attribute_scores(steps, elements, OPTION_ATTRIBUTES)
+        option_scores[~np.asarray(dropdown_steps)] = 0
+        _, step_embeddings, step_description_embeddings, step_has_description, \
+            _, element_embeddings, element_description_embeddings, element_has_description = arguments
+        full = score_matrix(
+            step_embeddings, element_embeddings,
+            step_description_embeddings, element_description_embeddings,
+            step_has_description, element_has_description,
+            fuzzy_scores=attribute_scores(steps, elements, FUZZY_ATTRIBUTES), option_scores=option_scores,
+            dropdown_steps=dropdown_steps, element_roles=[element["attributes"]["role"] for element in elements]
+        )
+
+        # Every element is a candidate: the result is exactly the full matrix's
+        best_indices, best_scores = score_steps(*arguments)
+        np.testing.assert_array_equal(best_indices, full.argmax(axis=1))
+        np.testing.assert_array_equal(best_scores, full.max(axis=1))
+
+    def test_fifty_steps_against_five_thousand_elements(self):
+        elements = realistic_elements(self.fixtures["pages"], 5000)
+        fixture_steps = [case["step"] for case in self.fixtures["mapping"]]
+        dropdown_scenario = [f"And the user selects {COUNTRIES[i % len(COUNTRIES)]} {i} from the country dropdown" for i in range(50)]
+
+        for steps in ([fixture_steps[i % len(fixture_steps)] for i in range(50)], dropdown_scenario):
+            arguments = embedded(steps, elements)
+            start = time.perf_counter()
+            best_indices, best_scores = score_steps(*arguments)
+            elapsed = time.perf_counter() - start
+
+            self.assertEqual(best_indices.shape, (50,))
+            self.assertLess(elapsed, 1.0)
+
+            # Fuzzy matching is bounded by the candidates, not by the number of elements
+            with mock.patch.object(fuzzy_scorer, "partial_ratio", wraps=fuzzy_scorer.partial_ratio) as partial_ratio:
+                score_steps(*arguments)
+            self.assertLessEqual(partial_ratio.call_count, 50 * FUZZY_CANDIDATES * (len(FUZZY_ATTRIBUTES) + len(OPTION_ATTRIBUTES)))
+
+        # The dropdown bonus still reaches the options among thousands of elements
+        self.assertEqual({elements[index]["attributes"]["role"] for index in best_indices}, {"option"})
@@ -0,0 +1,136 @@
+import os
+import subprocess
+import sys
+import torch
+from django.conf import settings
+from django.test import SimpleTestCase
+from accounts.controllers.model_registry import ModelRegistry, estimate_size_mb
+
+
+def make_model(megabytes):
+    # float32 weights: 262144 parameters per MB
+    return torch.nn.Linear(262144 * megabytes, 1, bias=False)
+
+
+### pre-requisite for this testcase : nothing (loaders build small in-memory torch modules)
+
+### goal : models load lazily and once, idle models are evicted LRU past the memory budget, and a failing loader backs off
+class ModelRegistryTestCase(SimpleTestCase):
+    def setUp(self):
+        self.calls = []
+
+    def loader(self, name, megabytes=1):
+        def load():
+            self.calls.append(name)
+            return make_model(megabytes)
+        return load
+
+    def test_models_load_on_first_use_only(self):
+        registry = ModelRegistry()
+        registry.register("a", self.loader("a"))
+        self.assertFalse(registry.is_loaded("a"))
+        self.assertEqual(self.calls, [])
+
+        first = registry.get("a")
+        second = registry.get("a")
+        self.assertIs(first, second)
+        self.assertEqual(self.calls, ["a"])
+        self.assertAlmostEqual(estimate_size_mb(first), 1.0, places=2)
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        registry = ModelRegistry(memory_budget_mb=2.5)
+        for name in ("a", "b", "c"):
+            registry.register(name, self.loader(name))
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")  # "b" is now the least recently used model
+        registry.get("c")
+
+        self.assertTrue(registry.is_loaded("a"))
+        self.assertFalse(registry.is_loaded("b"))
+        self.assertTrue(registry.is_loaded("c"))
+        self.assertLessEqual(registry.loaded_size_mb(), 2.5)
+
+        # Evicted models come back on their next use
+        registry.get("b")
+        self.assertEqual(self.calls, ["a", "b", "c", "b"])
+
+    def test_leased_models_are_not_evicted(self):
+        registry = ModelRegistry(memory_budget_mb=1.5)
+        registry.register("a", self.loader("a"))
+        registry.register("b", self.loader("b"))
+        with registry.lease("a"):
+            registry.get("b")
+            self.assertTrue(registry.is_loaded("a"))
+
+    def test_new_version_replaces_loaded_model(self):
+        registry = ModelRegistry()
+        old = registry.get("fine-tuned", self.loader("v1"), version="v1")
+        self.assertIs(registry.get("fine-tuned", self.loader("v1"), version="v1"), old)
+        new = registry.get("fine-tuned", self.loader("v2"), version="v2")
+        self.assertIsNot(new, old)
+        self.assertEqual(self.calls, ["v1", "v2"])
+
+    def test_failed_loader_backs_off(self):
+        registry = ModelRegistry(failure_backoff_seconds=60)
+        attempts = []
+
+        def failing():
+            attempts.append(1)
+            raise OSError("hub unreachable")
+
+        registry.register("summarizer", failing)
+        for _ in range(3):
+            with self.assertRaises(OSError):
+                registry.get("summarizer")
+        self.assertEqual(len(attempts), 1)
+
+    def test_lazy_proxy_loads_on_attribute_access(self):
+        registry = ModelRegistry()
+        registry.register("a", self.loader("a"))
+        proxy = registry.proxy("a")
+        self.assertEqual(self.calls, [])
+        self.assertEqual(proxy.in_features, 262144)
+        self.assertEqual(self.calls, ["a"])
+
+    def test_proxy_calls_are_leased_and_hold_no_instance(self):
+        registry = ModelRegistry(memory_budget_mb=1.5)
+        registry.register("a", self.loader("a"))
+        registry.register("b", self.loader("b"))
+        proxy = registry.proxy("a")
+
+        # A call in progress keeps "a" loaded while another model is loaded
+        def forward(inputs):
+            registry.get("b")
+            self.assertTrue(registry.is_loaded("a"))
+            return inputs.sum()
+
+        model = registry.get("a")
+        model.forward = forward
+        del model
+        proxy.forward(torch.ones(1))
+        self.assertEqual(registry.entries["a"].leases, 0)
+
+        # Between calls the model is evictable, and the proxy doesn't keep the old instance
+        registry.get("b")
+        self.assertFalse(registry.is_loaded("a"))
+        self.assertEqual(proxy(torch.ones(1, 262144)).shape, (1, 1))
+        self.assertEqual(self.calls, ["a", "b", "a"])
+        self.assertFalse(registry.is_loaded("b"))
+
+    def test_url_conf_imports_without_ml_libraries(self):
+        # Run in a fresh interpreter: this test process already has torch imported
+        script = (
+            "import sys, django; django.setup(); import Backend.urls; "
+            "print(','.join(m for m in ('torch', 'transformers', 'selenium', 'sentence_transformers') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "Backend.settings"},
+            capture_output=True,
+            text=True,
+            timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
@@ -0,0 +1,116 @@
+import os
+import hashlib
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from django.test import SimpleTestCase
+from accounts.controllers.page_fetcher import PageFetcher, PageCache
+
+
+class StaticHandler(SimpleHTTPRequestHandler):
+    """Static file handler that also answers If-None-Match with ETags and records requests."""
+
+    requests_seen = []
+    active = 0
+    max_active = 0
+    delay = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            time.sleep(cls.delay)
+            path = self.translate_path(self.path)
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    etag = '"' + hashlib.md5(f.read()).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self._etag = etag
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def end_headers(self):
+        if getattr(self, "_etag", None):
+            self.send_header("ETag", self._etag)
+            self._etag = None
+        super().end_headers()
+
+
+### pre-requisite for this testcase : nothing (serves a temporary directory with a local static HTTP server)
+
+### goal : pages are fetched concurrently within the per-host limit, and unchanged pages are served from the cache or revalidated with a 304
+class PageFetcherTestCase(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.site_dir = os.path.join(self.tmp.name, "site")
+        os.makedirs(self.site_dir)
+        for index in range(6):
+            self.write_page(f"page{index}.html", f"<html><body><button id='b{index}'>Go</button></body></html>")
+
+        StaticHandler.requests_seen = []
+        StaticHandler.active = 0
+        StaticHandler.max_active = 0
+        StaticHandler.delay = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), partial(StaticHandler, directory=self.site_dir))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def write_page(self, name, html):
+        with open(os.path.join(self.site_dir, name), "w") as f:
+            f.write(html)
+
+    def make_fetcher(self, **kwargs):
+        return PageFetcher(cache=PageCache(os.path.join(self.tmp.name, "cache")), **kwargs)
+
+    def test_fetch_all_respects_per_host_limit(self):
+        StaticHandler.delay = 0.1
+        urls = [f"{self.base_url}/page{index}.html" for index in range(6)]
+        pages = self.make_fetcher(max_workers=6, per_host=2).fetch_all(urls)
+
+        self.assertEqual(list(pages), urls)
+        self.assertIn("id='b3'", pages[urls[3]].text)
+        self.assertTrue(all(page.source == "network" for page in pages.values()))
+        self.assertEqual(StaticHandler.max_active, 2)
+
+    def test_fresh_pages_skip_the_network(self):
+        url = f"{self.base_url}/page0.html"
+        self.make_fetcher(ttl_seconds=60).fetch(url)
+        page = self.make_fetcher(ttl_seconds=60).fetch(url)
+
+        self.assertEqual(page.source, "cache")
+        self.assertEqual(len(StaticHandler.requests_seen), 1)
+
+    def test_expired_pages_are_revalidated(self):
+        url = f"{self.base_url}/page1.html"
+        fetcher = self.make_fetcher(ttl_seconds=0)
+        fetcher.fetch(url)
+
+        unchanged = fetcher.fetch(url)
+        self.assertEqual(unchanged.source, "revalidated")
+        self.assertIn("id='b1'", unchanged.text)
+        self.assertIsNotNone(StaticHandler.requests_seen[-1][1])
+
+        self.write_page("page1.html", "<html><body><input id='changed'></body></html>")
+        changed = fetcher.fetch(url)
+        self.assertEqual(changed.source, "network")
+        self.assertIn("id='changed'", changed.text)
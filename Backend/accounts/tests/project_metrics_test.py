@@ -0,0 +1,73 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from accounts.models import CustomUser, Project, Execution, Metrics, HealedElements, ProjectMetricsRollup
+
+
+### pre-requisite for this testcase : need a user, a project and executions with metrics and healed elements
+
+### goal : the rollup follows every metrics row, the summary is a constant number of queries and the history is paged by cursor
+class ProjectMetricsTestCase(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="metrics@example.com", password="Test@1234", full_name="Metrics")
+        self.project = Project.objects.create(project_name="Metrics", user=self.user)
+
+    def add_execution(self, name, scenarios, healed):
+        execution = Execution.objects.create(execution_name=name, project=self.project)
+        metrics = Metrics.objects.create(
+            execution=execution, number_of_scenarios=scenarios, number_of_healed_elements=healed
+        )
+        ProjectMetricsRollup.add(metrics, self.project.project_id)
+        HealedElements.objects.bulk_create([
+            HealedElements(execution=execution, past_element_attribute=f"{name}-old-{i}",
+                           new_element_attribute=f"{name}-new-{i}", label=True)
+            for i in range(healed)
+        ])
+        return execution
+
+    def test_rollup_totals_follow_metrics(self):
+        self.add_execution("Run 1", 4, 1)
+        self.add_execution("Run 2", 6, 3)
+
+        rollup = ProjectMetricsRollup.objects.get(project=self.project)
+        self.assertEqual(rollup.execution_count, 2)
+        self.assertEqual(rollup.total_scenarios, 10)
+        self.assertEqual(rollup.total_healed_elements, 4)
+        self.assertIsNotNone(rollup.last_execution_at)
+
+    def test_summary_query_count_does_not_grow_with_history(self):
+        url = reverse("project_metrics_summary", args=[self.project.project_id])
+        self.add_execution("Run 0", 2, 1)
+        # Project check, rollup, latest executions
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+        for i in range(1, 30):
+            self.add_execution(f"Run {i}", 2, 1)
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_scenarios"], 60)
+        self.assertEqual(response.data["total_healed_elements"], 30)
+        self.assertEqual(response.data["execution_count"], 30)
+        self.assertEqual(len(response.data["execution_data"]), 20)
+
+    def test_healed_elements_are_paged_by_cursor(self):
+        self.add_execution("Run 1", 5, 3)
+        self.add_execution("Run 2", 5, 2)
+        url = reverse("project_healed_elements", args=[self.project.project_id])
+
+        first = self.client.get(url, {"page_size": 3})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(first.data["results"]), 3)
+        self.assertIsNotNone(first.data["next"])
+
+        second = self.client.get(first.data["next"])
+        self.assertEqual(len(second.data["results"]), 2)
+        self.assertIsNone(second.data["next"])
+        seen = {item["past_id"] for item in first.data["results"] + second.data["results"]}
+        self.assertEqual(len(seen), 5)
+
+    def test_unknown_project(self):
+        response = self.client.get(reverse("project_metrics_summary", args=[999]))
+        self.assertEqual(response.status_code, 404)
@@ -43,4 +43,20 @@ class ProjectTestCase(APITestCase):
         response = self.client.post(self.create_project_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-        self.assertIn("detail", response.data)  # Ensure error message is returned
\ No newline at end of file
+        self.assertIn("detail", response.data)  # Ensure error message is returned
+
+    def test_update_project_settings_toggles_summarization(self):
+        """Test switching semantic summarization off for a project"""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        project = Project.objects.create(project_name="Summaries", user=self.user)
+        self.assertTrue(project.enable_summarization)
+
+        url = reverse("update_project_settings", args=[project.project_id])
+        response = self.client.put(url, {"enable_summarization": False}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        project.refresh_from_db()
+        self.assertFalse(project.enable_summarization)
+
+        response = self.client.put(url, {"enable_summarization": "no"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
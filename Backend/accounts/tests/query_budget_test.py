@@ -0,0 +1,157 @@
+from rest_framework.test import APITestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.http_cache import clear_response_cache
+from accounts.models import (
+    CustomUser, Project, Scenarios, Execution, Metrics, HealedElements, ExecutionSequence, SequenceScenario,
+    ProjectMetricsRollup
+)
+
+HEADER = ["Step", "Page", "ID", "Class", "Name", "Value", "XPath (Absolute)", "XPath (Relative)", "CSS Selector"]
+
+# Size of the seeded dataset; a query budget holds only if it does not grow with these
+SCENARIOS = 60
+EXECUTIONS = 40
+HEALS_PER_EXECUTION = 5
+
+# JWT authentication loads the request user
+AUTH = 1
+
+
+def mapping(index, steps=10):
+    return [HEADER] + [
+        [f"When I do step {step}", "https://app.test/page", f"el-{index}-{step}", "N/A", "N/A", "N/A",
+         f"/html/body/div[{step}]", "N/A", f"#el-{index}-{step}"]
+        for step in range(steps)
+    ]
+
+
+### pre-requisite for this testcase : need two users, a project with many scenarios, a sequence, executions, metrics and healed elements
+
+### goal : every read and reorder endpoint stays within a fixed number of queries on a large project
+class QueryBudgetTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email="budget@example.com", password="Test@1234", full_name="Budget")
+        cls.other = CustomUser.objects.create_user(email="other@example.com", password="Test@1234", full_name="Other")
+        cls.project = Project.objects.create(project_name="Budget", user=cls.user)
+        Project.objects.bulk_create([Project(project_name=f"Other {i}", user=cls.other) for i in range(5)])
+
+        cls.scenarios = [
+            Scenarios.objects.create(project=cls.project, scenarios_name=f"Scenario {i}", mapping_file=mapping(i))
+            for i in range(SCENARIOS)
+        ]
+        cls.sequence = ExecutionSequence.objects.create(project=cls.project, number="nightly")
+        SequenceScenario.objects.bulk_create([
+            SequenceScenario(execution_sequence=cls.sequence, scenario=scenario, order=i)
+            for i, scenario in enumerate(cls.scenarios)
+        ])
+
+        for i in range(EXECUTIONS):
+            execution = Execution.objects.create(execution_name=f"Run {i}", project=cls.project)
+            metrics = Metrics.objects.create(
+                execution=execution, number_of_scenarios=SCENARIOS, number_of_healed_elements=HEALS_PER_EXECUTION
+            )
+            ProjectMetricsRollup.add(metrics, cls.project.project_id)
+            HealedElements.objects.bulk_create([
+                HealedElements(execution=execution, past_element_attribute=f"old-{i}-{j}",
+                               new_element_attribute=f"new-{i}-{j}", label=True)
+                for j in range(HEALS_PER_EXECUTION)
+            ])
+
+    def setUp(self):
+        # Budgets are for a cold cache; a cached response costs only its version check
+        clear_response_cache()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def assertBudget(self, budget, method, url, data=None):
+        # assertNumQueries with a maximum: the exact count may drop, it may not grow
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format="json")
+        self.assertLessEqual(
+            len(queries), budget,
+            f"{method.upper()} {url} ran {len(queries)} queries (budget {budget}):\n"
+            + "\n".join(query["sql"] for query in queries.captured_queries)
+        )
+        return response
+
+    def test_get_projects(self):
+        response = self.assertBudget(AUTH + 1, "get", reverse("get_projects"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([project["project_id"] for project in response.data], [self.project.project_id])
+
+    def test_get_projects_requires_authentication(self):
+        self.client.credentials()
+        self.assertEqual(self.client.get(reverse("get_projects")).status_code, 401)
+
+    def test_get_execution_sequence_scenarios(self):
+        url = reverse("get_execution_sequence_scenarios", args=[self.project.project_id, "nightly"])
+        # Project, sequence, joined sequence scenarios
+        response = self.assertBudget(AUTH + 3, "get", url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), SCENARIOS)
+        self.assertEqual(response.data[0]["project_name"], "Budget")
+        self.assertEqual(response.data[0]["execution_sequence_id"], self.sequence.execution_sequence_id)
+
+    def test_update_scenario_order(self):
+        new_order = [
+            {"scenario_id": scenario.scenario_id, "order": SCENARIOS - i}
+            for i, scenario in enumerate(self.scenarios)
+        ]
+        # Sequence, sequence scenarios, savepoint, bulk update, sequence timestamp, project version, release
+        response = self.assertBudget(AUTH + 7, "post", reverse("update_scenario_order"), {
+            "execution_sequence_id": self.sequence.execution_sequence_id, "new_order": new_order
+        })
+        self.assertEqual(response.status_code, 200)
+        first = SequenceScenario.objects.get(execution_sequence=self.sequence, scenario=self.scenarios[0])
+        self.assertEqual(first.order, SCENARIOS)
+
+    def test_update_scenario_order_unknown_scenario_changes_nothing(self):
+        new_order = [
+            {"scenario_id": self.scenarios[0].scenario_id, "order": 99},
+            {"scenario_id": 123456, "order": 1},
+        ]
+        response = self.client.post(reverse("update_scenario_order"), {
+            "execution_sequence_id": self.sequence.execution_sequence_id, "new_order": new_order
+        }, format="json")
+        self.assertEqual(response.status_code, 404)
+        first = SequenceScenario.objects.get(execution_sequence=self.sequence, scenario=self.scenarios[0])
+        self.assertEqual(first.order, 0)
+
+    def test_get_metrics(self):
+        # Project version, metrics
+        response = self.assertBudget(AUTH + 2, "get", reverse("get_metrics", args=[self.project.project_id]))
+        self.assertEqual(len(response.data), EXECUTIONS)
+
+    def test_get_project_metrics(self):
+        # Project version, rollup, latest metrics, first page of healed elements
+        response = self.assertBudget(AUTH + 4, "get", reverse("get_project_metrics", args=[self.project.project_id]))
+        self.assertEqual(response.data["total_healed_elements"], EXECUTIONS * HEALS_PER_EXECUTION)
+        # The body is bounded however long the history grows
+        self.assertEqual(len(response.data["execution_data"]), 20)
+        self.assertEqual(len(response.data["healed_elements"]), 50)
+        self.assertEqual(response.data["healed_elements"][0]["past_id"], f"old-{EXECUTIONS - 1}-{HEALS_PER_EXECUTION - 1}")
+        self.assertEqual(
+            response.data["healed_elements_url"], reverse("project_healed_elements", args=[self.project.project_id])
+        )
+
+    def test_project_metrics_summary(self):
+        # Project check, rollup, latest executions
+        self.assertBudget(AUTH + 3, "get", reverse("project_metrics_summary", args=[self.project.project_id]))
+
+    def test_project_healed_elements(self):
+        # Project check, page
+        response = self.assertBudget(AUTH + 2, "get", reverse("project_healed_elements", args=[self.project.project_id]))
+        self.assertEqual(len(response.data["results"]), 50)
+
+    def test_get_execution_sequences(self):
+        self.assertBudget(AUTH + 2, "get", reverse("get_execution_sequences", args=[self.project.project_id]))
+        self.assertBudget(AUTH + 2, "get", reverse("get_execution_sequences_exe", args=[self.project.project_id]))
+
+    def test_get_scenario_mapping(self):
+        scenario = self.scenarios[0]
+        # Scenario, mapping rows
+        response = self.assertBudget(AUTH + 2, "get", reverse("get_scenario_mapping", args=[scenario.scenario_id]))
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,81 @@
+from django.db import connection
+from django.test import TestCase
+from accounts.models import (
+    CustomUser, Project, Scenarios, Execution, Metrics, ExecutionSequence, SequenceScenario
+)
+
+# Seeded history: enough rows that a scan would be chosen only when no index fits
+PROJECTS = 100
+EXECUTIONS = 100_000
+SEQUENCES_PER_PROJECT = 20
+SCENARIOS_PER_PROJECT = 10
+
+
+### pre-requisite for this testcase : need a database seeded with 100k executions and their metrics over many projects, with planner statistics
+
+### goal : the planner answers the hot list and metrics queries with the composite indexes
+class QueryPlanTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = CustomUser.objects.create_user(email="plan@example.com", password="Test@1234", full_name="Plan")
+        projects = Project.objects.bulk_create([Project(project_name=f"Project {i}", user=user) for i in range(PROJECTS)])
+        cls.project = projects[PROJECTS // 2]
+
+        executions = Execution.objects.bulk_create([
+            Execution(execution_name=f"Run {i}", project=projects[i % PROJECTS]) for i in range(EXECUTIONS)
+        ], batch_size=5000)
+        Metrics.objects.bulk_create([
+            Metrics(execution=execution, number_of_scenarios=10, number_of_healed_elements=1) for execution in executions
+        ], batch_size=5000)
+
+        scenarios = Scenarios.objects.bulk_create([
+            Scenarios(project=project, scenarios_name=f"Scenario {i}")
+            for project in projects for i in range(SCENARIOS_PER_PROJECT)
+        ])
+        sequences = ExecutionSequence.objects.bulk_create([
+            ExecutionSequence(project=project, number=f"seq-{i}")
+            for project in projects for i in range(SEQUENCES_PER_PROJECT)
+        ])
+        SequenceScenario.objects.bulk_create([
+            SequenceScenario(execution_sequence=sequence, scenario=scenario, order=order)
+            for sequence in sequences
+            for order, scenario in enumerate(s for s in scenarios if s.project_id == sequence.project_id)
+        ], batch_size=5000)
+        cls.sequence = sequences[PROJECTS // 2 * SEQUENCES_PER_PROJECT]
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"{index_name} not used:\n{plan}")
+
+    def assertNoFullScan(self, queryset, *tables):
+        # Full table scans as SQLite and PostgreSQL print them
+        plan = queryset.explain()
+        for table in tables:
+            self.assertNotRegex(plan, rf"\b(SCAN|Seq Scan on) {table}\b", f"full scan of {table}:\n{plan}")
+
+    def test_project_executions(self):
+        self.assertUsesIndex(Execution.objects.filter(project=self.project)[:20], "execution_project_created_idx")
+
+    def test_project_metrics(self):
+        # Driven by the project's executions, then each execution's metrics row
+        self.assertNoFullScan(
+            Metrics.objects.filter(execution__project_id=self.project.project_id).select_related('execution')[:20],
+            "execution", "metrics"
+        )
+
+    def test_execution_sequence_lookup(self):
+        self.assertUsesIndex(
+            ExecutionSequence.objects.filter(project=self.project, number="seq-3"), "exec_seq_project_number_idx"
+        )
+
+    def test_sequence_scenarios_in_order(self):
+        self.assertUsesIndex(
+            SequenceScenario.objects.filter(execution_sequence=self.sequence).order_by('order'),
+            "seq_scenario_seq_order_idx"
+        )
+
+    def test_project_scenarios(self):
+        self.assertUsesIndex(Scenarios.objects.filter(project=self.project), "scenarios_project_created_idx")
@@ -0,0 +1,65 @@
+import time
+from django.test import SimpleTestCase
+from selenium.common.exceptions import JavascriptException
+from accounts.controllers.self_healing_framework.readiness import (
+    ReadinessWaiter, PAGE_STATE_SCRIPT, INTERACTABLE_SCRIPT, HOOK_SCRIPT
+)
+
+
+class FakeBrowser:
+    """Replays a list of page states ([readyState, in-flight requests, quiet ms]) and interactability answers."""
+
+    def __init__(self, page_states=(), interactable=(), fail_first=0):
+        self.page_states = list(page_states)
+        self.interactable = list(interactable)
+        self.fail_first = fail_first
+        self.calls = 0
+        self.cdp = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params["source"]))
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        if self.calls <= self.fail_first:
+            raise JavascriptException("page is navigating")
+        answers = self.page_states if script == PAGE_STATE_SCRIPT else self.interactable
+        assert script in (PAGE_STATE_SCRIPT, INTERACTABLE_SCRIPT)
+        return answers.pop(0) if len(answers) > 1 else answers[0]
+
+
+### pre-requisite for this testcase : nothing (fake WebDriver)
+
+### goal : readiness waits return as soon as the page signals are met, never exceed the cap and are recorded per step
+class ReadinessWaiterTestCase(SimpleTestCase):
+    def test_page_waits_for_load_network_and_quiet_dom(self):
+        driver = FakeBrowser(page_states=[
+            ["loading", 0, 0], ["complete", 2, 0], ["complete", 0, 50], ["complete", 0, 400]
+        ], fail_first=1)
+        waiter = ReadinessWaiter(driver, max_wait=5, quiet_ms=300, poll_interval=0.01)
+
+        waited = waiter.wait_for_page()
+        self.assertLess(waited, 1)
+        self.assertEqual(driver.calls, 5)
+        self.assertEqual(driver.cdp, [("Page.addScriptToEvaluateOnNewDocument", HOOK_SCRIPT)])
+
+        waiter.wait_for_page()
+        self.assertEqual(len(driver.cdp), 1)  # The hook is registered once per driver
+
+    def test_element_wait_returns_at_once_when_interactable(self):
+        driver = FakeBrowser(interactable=[True])
+        start = time.monotonic()
+        ReadinessWaiter(driver, max_wait=5).wait_for_element("button")
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(driver.calls, 1)
+
+    def test_wait_is_capped_and_recorded(self):
+        driver = FakeBrowser(interactable=[False])
+        waiter = ReadinessWaiter(driver, max_wait=0.2, poll_interval=0.02)
+        waited = waiter.wait_for_element("covered-button")
+        self.assertGreaterEqual(waited, 0.2)
+        self.assertLess(waited, 0.5)
+
+        waiter.record("When I click login", page_wait=0.1234, element_wait=waited)
+        self.assertEqual(waiter.timings[0]["step"], "When I click login")
+        self.assertEqual(waiter.timings[0]["page_wait"], 0.123)
@@ -0,0 +1,45 @@
+import random
+from django.test import TestCase
+from accounts.models import CustomUser, Project, StrategyStat
+from accounts.controllers.self_healing_framework.rl_healing_agent import RLHealingAgent, element_tag
+from accounts.controllers.strategy_stats import load_strategy_agent, save_strategy_stats
+
+STRATEGIES = {'id': 'login', 'CSS Selector': '#login', 'XPath (Absolute)': '/html/body/form/button[2]'}
+ELEMENT_INFO = {'Page': 'https://shop.test/orders/7?tab=2', 'XPath (Absolute)': '/html/body/form/button[2]'}
+
+
+### pre-requisite for this testcase : need a user and a project to persist strategy statistics for
+
+### goal : the agent learns which strategy hits per page and tag, orders strategies by it and its statistics survive runs
+class StrategyAgentTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="bandit@example.com", password="Test@1234", full_name="Bandit")
+        self.project = Project.objects.create(project_name="Bandit", user=self.user)
+
+    def test_context_is_page_pattern_and_tag(self):
+        self.assertEqual(RLHealingAgent.context(ELEMENT_INFO), ("https://shop.test/orders/:id", "button"))
+        self.assertEqual(element_tag({'XPath (Absolute)': ''}), '*')
+
+    def test_learns_order_and_persists_it(self):
+        agent = load_strategy_agent(self.project, rng=random.Random(1))
+        context = agent.context(ELEMENT_INFO)
+        for _ in range(30):
+            # Generated ids and selectors break on this page; the XPath always resolves
+            order = list(agent.order(STRATEGIES, context))
+            agent.observe(context, order, 'XPath (Absolute)')
+        self.assertEqual(list(agent.order(STRATEGIES, context))[0], 'XPath (Absolute)')
+
+        self.assertEqual(save_strategy_stats(self.project, agent), 3)
+        self.assertEqual(agent.pending, {})
+        xpath = StrategyStat.objects.get(project=self.project, strategy='XPath (Absolute)')
+        self.assertEqual((xpath.page_pattern, xpath.tag_name, xpath.successes, xpath.failures),
+                         ("https://shop.test/orders/:id", "button", 30, 0))
+
+        # A later run starts from the saved statistics, including for other tags of the page
+        agent = load_strategy_agent(self.project, rng=random.Random(2))
+        first = [list(agent.order(STRATEGIES, (context[0], "input")))[0] for _ in range(20)]
+        self.assertGreaterEqual(first.count('XPath (Absolute)'), 18)
+
+        agent.observe(context, ['id'], 'id')
+        save_strategy_stats(self.project, agent)
+        self.assertEqual(StrategyStat.objects.get(project=self.project, strategy='id').successes, 1)
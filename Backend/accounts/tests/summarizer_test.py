@@ -0,0 +1,59 @@
+import os
+import tempfile
+from django.test import SimpleTestCase
+from accounts.controllers.summarizer import SummarizationStage, SummaryCache, NO_DESCRIPTION
+
+
+class FakeSummarizer:
+    """Stands in for the BART pipeline: records every call and upper-cases the text."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, max_length, min_length, **kwargs):
+        self.calls.append((list(texts), max_length, min_length))
+        return [{"summary_text": text.upper()} for text in texts]
+
+
+### pre-requisite for this testcase : nothing (fake pipeline, temporary SQLite cache)
+
+### goal : every unique text is summarized once, in batched calls, results persist across processes and the stage can be switched off
+class SummarizationStageTestCase(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp.name, "summaries.sqlite3")
+        self.summarizer = FakeSummarizer()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_stage(self, summarizer=None):
+        summarizer = summarizer or self.summarizer
+        return SummarizationStage(lambda: summarizer, "fake-bart", cache=SummaryCache(self.cache_path))
+
+    def test_unique_texts_are_summarized_once_in_batches(self):
+        texts = ["click the login button", "enter the username", "click the login button", "submit"]
+        descriptions = self.make_stage().summarize(texts)
+
+        self.assertEqual(descriptions, [text.upper() for text in texts])
+        summarized = [text for batch, _, _ in self.summarizer.calls for text in batch]
+        self.assertEqual(sorted(summarized), sorted(set(texts)))
+        # Texts with the same generation lengths share a pipeline call
+        self.assertEqual(len(self.summarizer.calls), 3)
+
+    def test_summaries_persist_across_stages(self):
+        self.make_stage().summarize(["enter the password"])
+
+        other = FakeSummarizer()
+        descriptions = self.make_stage(other).summarize(["enter   the password", "new step"])
+
+        self.assertEqual(descriptions, ["ENTER THE PASSWORD", "NEW STEP"])
+        self.assertEqual(other.calls, [(["new step"], 2, 1)])
+
+    def test_disabled_or_unavailable_summarization_falls_back(self):
+        stage = self.make_stage()
+        self.assertEqual(stage.summarize(["a", "b"], enabled=False), [NO_DESCRIPTION, NO_DESCRIPTION])
+        self.assertEqual(self.summarizer.calls, [])
+
+        unavailable = SummarizationStage(lambda: None, "fake-bart", cache=SummaryCache(self.cache_path))
+        self.assertEqual(unavailable.summarize(["a step"], fallback="No description"), ["No description"])
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import SignupView, LoginView, get_user, documents, create_project, get_projects, scenario, healing, execute_tests, get_metrics, get_project_metrics, get_execution_sequences, get_execution_sequence_scenarios, update_scenario_order, get_execution_sequences_exe, create_execution_sequence, update_profile, get_scenario_mapping, update_scenario_mapping, accept_healing, reject_healing
+from .views import SignupView, LoginView, get_user, documents, create_project, get_projects, scenario, healing, execute_tests, get_metrics, get_project_metrics, get_execution_sequences, get_execution_sequence_scenarios, update_scenario_order, get_execution_sequences_exe, create_execution_sequence, update_profile, get_scenario_mapping, update_scenario_mapping, accept_healing, reject_healing, update_project_settings, job_status, job_result, project_metrics_summary, project_healed_elements
 
 urlpatterns = [
     path('signup/', SignupView.as_view(), name='signup'),
@@ -10,9 +10,12 @@ urlpatterns = [
     path('healing/', healing, name='healing'),
     path('create_project/', create_project, name='create_project'),
     path('get_projects/', get_projects, name='get_projects'),
+    path('update_project_settings/<int:project_id>/', update_project_settings, name='update_project_settings'),
     path('execute_tests/', execute_tests, name='execute_tests'),
     path('metrics/<int:project_id>/', get_metrics, name='get_metrics'),
     path('project_metrics/<int:project_id>/', get_project_metrics, name='get_project_metrics'),
+    path('project_metrics/<int:project_id>/summary/', project_metrics_summary, name='project_metrics_summary'),
+    path('project_metrics/<int:project_id>/healed_elements/', project_healed_elements, name='project_healed_elements'),
     path('get_execution_sequences/<int:project_id>/', get_execution_sequences, name='get_execution_sequences'),
     path('get_execution_sequence_scenarios/<int:project_id>/<str:execution_sequence_number>/', get_execution_sequence_scenarios, name='get_execution_sequence_scenarios'), 
     path('update_scenario_order/', update_scenario_order, name='update_scenario_order'),
@@ -25,4 +28,8 @@ urlpatterns = [
     # New paths for fine-tuning
     path('accept_healing/', accept_healing, name='accept_healing'),
     path('reject_healing/', reject_healing, name='reject_healing'),
+
+    # Background jobs (execution, mapping and fine-tuning endpoints return a job id)
+    path('jobs/<int:job_id>/', job_status, name='job_status'),
+    path('jobs/<int:job_id>/result/', job_result, name='job_result'),
 ]
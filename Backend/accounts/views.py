@@ -4,34 +4,26 @@ from rest_framework.decorators import api_view,permission_classes
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import get_user_model  # Import get_user_model
-from .serializers import UserSerializer, CustomTokenObtainPairSerializer,ProjectSerializer,ScenarioSerializer,MetricsSerializer,ProjectMetricsSerializer
-from .controllers.mapping import MappingProcessor
-from .models import Project,Scenarios,Metrics,Execution,HealedElements,ExecutionSequence,SequenceScenario
-from .controllers.bdd_processor import process_bdd
-from .controllers.html_processor import process_html
-from .controllers.mapping import map_bdd_to_html
-from .controllers.heal import SelfHealingFramework
+from .serializers import UserSerializer, CustomTokenObtainPairSerializer,ProjectSerializer,ScenarioSerializer,MetricsSerializer,ProjectMetricsSerializer,HealedElementsSerializer
+from .models import Project,Scenarios,Metrics,Execution,HealedElements,ExecutionSequence,SequenceScenario,ProjectMetricsRollup
+from .pagination import HealedElementsCursorPagination
+from .http_cache import cached_response
 from rest_framework.permissions import IsAuthenticated
 import json
-from datetime import datetime
-from django.db.models import Sum
+from django.db import transaction
 
 from . import models
 from django.db.models import F
 
-from .controllers.self_healing_framework.fine_tuner import ModelFineTuner
-from .models import FineTuningData
+from .models import FineTuningData, Job
+from .jobs import enqueue, progress
+from django.urls import reverse
 
-User = get_user_model()  # Get the custom user model
-
-def get_attribute_simple(attributes, key):
-    value = attributes.get(key)
-    if value is None:
-        return "N/A"
-    if isinstance(value, list):
-        return ", ".join(value) if value else "N/A"
-    return str(value)
+# The mapping/healing controllers pull in torch, transformers and selenium, so they are
+# imported inside the views that use them: the process starts (and serves auth/CRUD
+# endpoints) without paying for them, and models load on first use via the model registry.
 
+User = get_user_model()  # Get the custom user model
 
 class SignupView(generics.CreateAPIView):
     queryset = User.objects.all()  # Use the custom user model
@@ -94,7 +86,6 @@ def get_user(request):  # Fixed: Changed 'self' to 'request'
 @api_view(['POST'])
 def documents(request):
     data = request.data
-    processor = MappingProcessor()
 
     project_id = data.get('project_id')
     execution_sequence_number = data.get('execution_sequence_number')
@@ -132,34 +123,22 @@ def documents(request):
             "error": f"Execution sequence number '{execution_sequence_number}' not found for project_id {project_id}"
         }, status=404)
 
-    # Process BDD and test script mapping
-    outputs = processor.process_all_features(bdd_files, test_script_files)
-
-    for idx, output in enumerate(outputs):
-        # Save Scenario
-        scenario_obj = Scenarios.objects.create(
-            project=project,
-            scenarios_name=scenarios_name,
-            mapping_file=output
-        )
-
-        # Add to SequenceScenario with order preserved
-        SequenceScenario.objects.create(
-            execution_sequence=execution_sequence,
-            scenario=scenario_obj,
-            order=idx + 1  # 1-based index
-        )
-
-    return Response({
-        "message": "Added Successfully",
-        "execution_sequence_id": execution_sequence.execution_sequence_id
-    }, status=201)
+    # Mapping the feature files takes minutes; it runs in a background job
+    job = enqueue('documents', {
+        "execution_sequence_id": execution_sequence.execution_sequence_id,
+        "scenarios_name": scenarios_name,
+        "bdd_files": bdd_files,
+        "test_script_files": test_script_files
+    }, user=request.user, project=project)
+    return job_accepted(job)
 
 
 
 
 @api_view(['POST'])
 def healing(request):
+    from .controllers.heal import SelfHealingFramework
+
     data = request.data
     mapping = data.get('mapping')
     header = mapping[0]
@@ -168,7 +147,7 @@ def healing(request):
     framework.start_browser()
     try:
         framework.driver.get(mapping[1][1])
-        framework.execute_all_steps(delay=0.0)
+        framework.execute_all_steps()
         return Response(framework.report())
     finally:
         framework.close()
@@ -246,92 +225,21 @@ def scenario(request):
     if not all([bdd, links, project_id, scenarios_name]):
         return Response({"error": "Missing bdd, links, project_id, or scenarios_name"}, status=400)
 
-    print("Starting the script...")
-    print("Processing BDD scenario...")
-    bdd_scenario = process_bdd(bdd)
-    print("BDD scenario processed.")
-
-    print("Processing HTML pages...")
-    clean_links = [link.strip() for link in links.split("\n") if link.strip()]
-    html_pages = process_html(clean_links)
-    print("HTML pages processed.")
-
-    print("Performing mapping...")
-    mappings = map_bdd_to_html(bdd_scenario, html_pages)
-    print("Mapping completed.")
-
-    print("Writing results to CSV format...")
-    response = [[
-        "Step", "Page", "ID", "Class", "Name", "Value",
-        "XPath (Absolute)", "XPath (Relative)", "CSS Selector"
-    ]]
-    for match in mappings:
-        response.append([
-            match["step"],
-            match["page"],
-            get_attribute_simple(match["element"]["attributes"], "id"),
-            get_attribute_simple(match["element"]["attributes"], "class"),
-            get_attribute_simple(match["element"]["attributes"], "name"),
-            get_attribute_simple(match["element"]["attributes"], "value"),
-            get_attribute_simple(match["element"]["attributes"], "xpath_absolute"),
-            get_attribute_simple(match["element"]["attributes"], "xpath_relative"),
-            get_attribute_simple(match["element"]["attributes"], "css_selector"),
-        ])
-
     try:
         project = Project.objects.get(project_id=project_id)
     except Project.DoesNotExist:
         return Response({"error": "Invalid project_id"}, status=404)
 
-    # Get or create the execution sequence
-    if execution_sequence_number:
-        execution_sequence, _ = ExecutionSequence.objects.get_or_create(
-            project=project,
-            number=execution_sequence_number
-        )
-    else:
-        # Get the latest sequence number and add 1
-        last_sequence = ExecutionSequence.objects.filter(project=project).order_by('-number').first()
-        next_sequence_number = last_sequence.number + 1 if last_sequence else 1
-        execution_sequence = ExecutionSequence.objects.create(
-            project=project,
-            number=next_sequence_number
-        )
-
-    # Create Scenario object
-    scenario_obj = Scenarios.objects.create(
-        project=project,
-        scenarios_name=scenarios_name,  # Added scenarios_name
-        mapping_file=response
-    )
-
-    # Determine the order and shift if necessary
-    if order:
-        order_value = int(order)
-        # Shift existing scenarios at or after this order
-        SequenceScenario.objects.filter(
-            execution_sequence=execution_sequence,
-            order__gte=order_value
-        ).update(order=F('order') + 1)
-    else:
-        last_order = SequenceScenario.objects.filter(
-            execution_sequence=execution_sequence
-        ).order_by('-order').first()
-        order_value = last_order.order + 1 if last_order else 1
-
-    # Create SequenceScenario at the correct order
-    SequenceScenario.objects.create(
-        execution_sequence=execution_sequence,
-        scenario=scenario_obj,
-        order=order_value
-    )
-
-    return Response({
-        "message": "Added Successfully",
-        "scenario_id": scenario_obj.scenario_id,
-        "execution_sequence_id": execution_sequence.execution_sequence_id,
-        "order": order_value
-    }, status=201)
+    # BDD/HTML processing and mapping run in a background job
+    job = enqueue('scenario', {
+        "bdd": bdd,
+        "links": links,
+        "project_id": project.project_id,
+        "execution_sequence_number": execution_sequence_number,
+        "order": order,
+        "scenarios_name": scenarios_name
+    }, user=request.user, project=project)
+    return job_accepted(job)
 
 
 
@@ -353,7 +261,8 @@ def create_project(request):
     try:
         project = Project.objects.create(
             project_name=data.get('project_name'), 
-            user_id=request.user.id
+            user_id=request.user.id,
+            enable_summarization=data.get('enable_summarization', True)
         )
 
         return Response(
@@ -362,6 +271,7 @@ def create_project(request):
                 "project": {
                     "id": project.project_id,
                     "name": project.project_name,
+                    "enable_summarization": project.enable_summarization,
                     "created_at": project.created_at,
                 }
             },
@@ -374,9 +284,30 @@ def create_project(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+def update_project_settings(request, project_id):
+    """
+    Update the settings of a project (currently whether mapping generates semantic descriptions).
+    """
+    try:
+        project = Project.objects.get(project_id=project_id, user=request.user)
+    except Project.DoesNotExist:
+        return Response({"error": "Project not found"}, status=404)
+
+    enable_summarization = request.data.get('enable_summarization')
+    if not isinstance(enable_summarization, bool):
+        return Response({"error": "enable_summarization must be a boolean"}, status=400)
+
+    project.enable_summarization = enable_summarization
+    project.save(update_fields=['enable_summarization', 'updated_at'])
+    return Response(ProjectSerializer(project).data, status=200)
+
 @api_view(['GET'])
+@permission_classes([IsAuthenticated])
 def get_projects(request):
-    projects = Project.objects.all()
+    # Only the projects of the authenticated user
+    projects = Project.objects.filter(user=request.user)
     return Response(ProjectSerializer(projects,many=True).data)
 
 
@@ -519,7 +450,7 @@ def get_projects(request):
 def execute_tests(request):
     """
     Execute test steps for a given project and execution_sequence_number.
-    Steps are executed in the order defined in SequenceScenario.
+    Steps are executed in the order defined in SequenceScenario, in a background job.
     """
     data = request.data
     execution_name = data.get('execution_name', 'Default Execution')
@@ -559,18 +490,9 @@ def execute_tests(request):
                 }
             }, status=404)
 
-        # Create execution record
-        execution = Execution.objects.create(
-            execution_name=execution_name,
-            project_id=project_id,
-        )
-
-        # Fetch the scenarios for that exact execution sequence
-        sequence_entries = SequenceScenario.objects.filter(
+        if not SequenceScenario.objects.filter(
             execution_sequence_id=execution_sequence.execution_sequence_id
-        ).order_by('order')
-
-        if not sequence_entries.exists():
+        ).exists():
             return Response({
                 "success": False,
                 "message": f"No scenarios found in the selected execution sequence.",
@@ -583,96 +505,12 @@ def execute_tests(request):
                 }
             }, status=404)
 
-        # Build the combined test steps and track scenarios
-        all_steps = []
-        scenario_mapping = {}  # Map scenario_id to scenario object for updates
-        for entry in sequence_entries:
-            scenario = entry.scenario
-            mapping = scenario.mapping_file
-            header = mapping[0]
-            test_steps = [dict(zip(header, row)) for row in mapping[1:]]
-            all_steps.extend(test_steps)
-            scenario_mapping[scenario.scenario_id] = scenario  # Store scenario reference
-
-        scenario_count = sum(1 for row in all_steps if row.get("Step", "").strip().startswith("When"))
-
-        # Initialize and run the test framework
-        framework = SelfHealingFramework(all_steps)
-        framework.scenario_count = scenario_count
-
-        try:
-            framework.start_browser()
-            framework.execute_all_steps(delay=3.5)
-            report = framework.get_healing_report()
-
-            # Store healed elements
-            for element in report['healed_elements']:
-                HealedElements.objects.create(
-                    execution=execution,
-                    past_element_attribute=element['original_element_id'],
-                    new_element_attribute=element['new_strategies'].get('id', ''),
-                    label=True,
-                    created_at=element.get('timestamp'),
-                )
-
-            # Update the scenarios' mapping_file with new strategies
-            for healed_element in report['healed_elements']:
-                old_id = healed_element['original_element_id']
-                new_strategies = healed_element['new_strategies']
-                new_id = new_strategies.get('id', '')
-                new_css = new_strategies.get('CSS Selector', '')
-                new_xpath = new_strategies.get('XPath (Absolute)', '')
-
-                # Update the mapping_file for each scenario
-                for scenario in scenario_mapping.values():
-                    mapping = scenario.mapping_file
-                    for row in mapping[1:]:
-                        # Assuming indices: 2=ID, 8=CSS Selector, 6=XPath (adjust if different)
-                        if row[2] == old_id and new_id and new_css and new_xpath:
-                            row[2] = new_id
-                            row[8] = new_css
-                            row[6] = new_xpath
-                    scenario.save()  # Save the updated scenario to the database
-
-            # Store metrics
-            Metrics.objects.create(
-                execution=execution,
-                number_of_scenarios=report['metrics']['total_scenarios'],
-                number_of_healed_elements=report['metrics']['healed_count'],
-            )
-
-            execution.status = 'COMPLETED' if report['success'] else 'COMPLETED_WITH_ERRORS'
-            execution.save()
-
-            return Response({
-                "success": report['success'],
-                "message": report.get('message', 'Execution completed'),
-                "execution_id": execution.execution_id,  # Add this line to include execution_id
-                "healed_elements": report['healed_elements'],
-                "broken_elements": report['broken_elements'],
-                "metrics": report['metrics']
-            })
-
-        except Exception as e:
-            execution.status = 'FAILED'
-            execution.error_message = str(e)
-            execution.save()
-
-            return Response({
-                "success": False,
-                "message": f"Test execution failed: {str(e)}",
-                "healed_elements": [],
-                "broken_elements": [],
-                "metrics": {
-                    "total_scenarios": scenario_count,
-                    "healed_count": 0,
-                    "broken_count": 0
-                }
-            }, status=500)
-
-        finally:
-            if hasattr(framework, 'close'):
-                framework.close()
+        # The browser run takes minutes; a job worker executes it and stores the report on the job
+        job = enqueue('execute_tests', {
+            "execution_sequence_id": execution_sequence.execution_sequence_id,
+            "execution_name": execution_name
+        }, user=request.user, project=execution_sequence.project)
+        return job_accepted(job)
 
     except Exception as e:
         return Response({
@@ -690,35 +528,81 @@ def execute_tests(request):
 
 @api_view(['GET'])
 def get_metrics(request, project_id):
-    metrics = Metrics.objects.filter(execution__project_id=project_id)
-    serializer = MetricsSerializer(metrics, many=True)
-    return Response(serializer.data)
+    def build():
+        metrics = Metrics.objects.filter(execution__project_id=project_id).select_related('execution')
+        return MetricsSerializer(metrics, many=True).data
+
+    project = Project.objects.filter(project_id=project_id).only('data_version', 'updated_at').first()
+    if project is None:
+        return Response(build())
+    return cached_response(request, 'metrics', project_id, project.data_version, project.updated_at, build)
+
+# Executions shown in the dashboard chart
+SUMMARY_EXECUTIONS = 20
 
 @api_view(['GET'])
 def get_project_metrics(request, project_id):
-    try:
-        project = Project.objects.get(project_id=project_id)
-    except Project.DoesNotExist:
+    """
+    Bounded project overview: the running totals, the latest executions and the first page of
+    healed elements, newest first. Older healed elements are paged by project_healed_elements.
+    """
+    project = Project.objects.filter(project_id=project_id).only('data_version', 'updated_at').first()
+    if project is None:
         return Response({"error": "Project not found"}, status=404)
 
-    # Fetch executions and related data
-    executions = Execution.objects.filter(project=project)
-    metrics = Metrics.objects.filter(execution__in=executions).select_related('execution')
-    healed_elements = HealedElements.objects.filter(execution__in=executions).select_related('execution')
-
-    # Calculate totals
-    total_scenarios = metrics.aggregate(total=Sum('number_of_scenarios'))['total'] or 0
-    total_healed_elements = metrics.aggregate(total=Sum('number_of_healed_elements'))['total'] or 0
-
-    # Serialize data
-    data = {
-        'total_scenarios': total_scenarios,
-        'total_healed_elements': total_healed_elements,
-        'execution_data': metrics,
-        'healed_elements': healed_elements
-    }
-    serializer = ProjectMetricsSerializer(data)
-    return Response(serializer.data, status=200)
+    def build():
+        rollup = ProjectMetricsRollup.objects.filter(project_id=project_id).first()
+        metrics = Metrics.objects.filter(execution__project_id=project_id).select_related('execution')[:SUMMARY_EXECUTIONS]
+        healed_elements = HealedElements.objects.filter(
+            execution__project_id=project_id
+        ).select_related('execution').order_by(*HealedElementsCursorPagination.ordering)[:HealedElementsCursorPagination.page_size]
+
+        data = {
+            'total_scenarios': rollup.total_scenarios if rollup else 0,
+            'total_healed_elements': rollup.total_healed_elements if rollup else 0,
+            'execution_data': metrics,
+            'healed_elements': healed_elements,
+            'healed_elements_url': reverse('project_healed_elements', args=[project_id]),
+        }
+        return ProjectMetricsSerializer(data).data
+
+    return cached_response(request, 'project_metrics', project_id, project.data_version, project.updated_at, build)
+
+@api_view(['GET'])
+def project_metrics_summary(request, project_id):
+    """
+    Dashboard summary in constant time: the project's running totals and its latest executions.
+    The healed-element history is paged separately by project_healed_elements.
+    """
+    project = Project.objects.filter(project_id=project_id).only('data_version', 'updated_at').first()
+    if project is None:
+        return Response({"error": "Project not found"}, status=404)
+
+    def build():
+        rollup = ProjectMetricsRollup.objects.filter(project_id=project_id).first()
+        latest = Metrics.objects.filter(execution__project_id=project_id).select_related('execution')[:SUMMARY_EXECUTIONS]
+        return {
+            'total_scenarios': rollup.total_scenarios if rollup else 0,
+            'total_healed_elements': rollup.total_healed_elements if rollup else 0,
+            'execution_count': rollup.execution_count if rollup else 0,
+            'last_execution_at': rollup.last_execution_at if rollup else None,
+            'execution_data': MetricsSerializer(latest, many=True).data,
+        }
+
+    return cached_response(request, 'project_metrics_summary', project_id, project.data_version, project.updated_at, build)
+
+@api_view(['GET'])
+def project_healed_elements(request, project_id):
+    """
+    Cursor-paginated healed-element history of a project, newest first (?cursor=..., ?page_size=...).
+    """
+    if not Project.objects.filter(project_id=project_id).exists():
+        return Response({"error": "Project not found"}, status=404)
+
+    healed_elements = HealedElements.objects.filter(execution__project_id=project_id).select_related('execution')
+    paginator = HealedElementsCursorPagination()
+    page = paginator.paginate_queryset(healed_elements, request)
+    return paginator.get_paginated_response(HealedElementsSerializer(page, many=True).data)
 
 @api_view(['GET'])
 def get_execution_sequences(request, project_id):
@@ -727,15 +611,17 @@ def get_execution_sequences(request, project_id):
     except Project.DoesNotExist:
         return Response({"error": "Project not found"}, status=404)
 
-    execution_sequences = ExecutionSequence.objects.filter(project=project)
-    sequence_data = [
-        {
-            "number": seq.number,
-            "execution_sequence_id": seq.execution_sequence_id
-        }
-        for seq in execution_sequences
-    ]
-    return Response(sequence_data, status=200)
+    def build():
+        execution_sequences = ExecutionSequence.objects.filter(project=project)
+        return [
+            {
+                "number": seq.number,
+                "execution_sequence_id": seq.execution_sequence_id
+            }
+            for seq in execution_sequences
+        ]
+
+    return cached_response(request, 'execution_sequences', project_id, project.data_version, project.updated_at, build)
 
 @api_view(['GET'])
 def get_execution_sequence_scenarios(request, project_id, execution_sequence_number):
@@ -752,9 +638,14 @@ def get_execution_sequence_scenarios(request, project_id, execution_sequence_num
     except ExecutionSequence.DoesNotExist:
         return Response({"error": "Execution sequence not found"}, status=404)
 
+    # One joined query: only the columns listed below are loaded
     sequence_scenarios = SequenceScenario.objects.filter(
         execution_sequence=execution_sequence
-    ).select_related('scenario').order_by('order')
+    ).select_related('scenario__project').only(
+        'order', 'execution_sequence_id',
+        'scenario__scenario_id', 'scenario__scenarios_name', 'scenario__created_at',
+        'scenario__project__project_name'
+    ).order_by('order')
 
     scenarios = [
         {
@@ -763,7 +654,7 @@ def get_execution_sequence_scenarios(request, project_id, execution_sequence_num
             "project_name": seq_scenario.scenario.project.project_name,
             "created_at": seq_scenario.scenario.created_at.isoformat(),
             "order": seq_scenario.order,
-            "execution_sequence_id": seq_scenario.execution_sequence.execution_sequence_id
+            "execution_sequence_id": seq_scenario.execution_sequence_id
         }
         for seq_scenario in sequence_scenarios
     ]
@@ -790,26 +681,30 @@ def update_scenario_order(request):
     if not isinstance(new_order, list):
         return Response({"error": "new_order must be a list"}, status=400)
 
-    # Update the order of each scenario
+    orders = {}
     for item in new_order:
         scenario_id = item.get('scenario_id')
         order = item.get('order')
         if not scenario_id or order is None:
             return Response({"error": "Each item in new_order must have scenario_id and order"}, status=400)
-
-        try:
-            sequence_scenario = SequenceScenario.objects.get(
-                execution_sequence=execution_sequence,
-                scenario_id=scenario_id
-            )
-            sequence_scenario.order = order
-            sequence_scenario.save()
-        except SequenceScenario.DoesNotExist:
+        orders[scenario_id] = order
+
+    # Load the sequence's scenarios in one query, then write every new order in one statement
+    sequence_scenarios = {
+        sequence_scenario.scenario_id: sequence_scenario
+        for sequence_scenario in SequenceScenario.objects.filter(
+            execution_sequence=execution_sequence, scenario_id__in=list(orders)
+        ).only('sequence_scenario_id', 'scenario_id', 'order')
+    }
+    for scenario_id, order in orders.items():
+        if scenario_id not in sequence_scenarios:
             return Response({"error": f"Scenario {scenario_id} not found in this execution sequence"}, status=404)
+        sequence_scenarios[scenario_id].order = order
 
-    # Update the updated_at timestamp of the execution sequence
-    execution_sequence.updated_at = datetime.now()
-    execution_sequence.save()
+    with transaction.atomic():
+        SequenceScenario.objects.bulk_update(sequence_scenarios.values(), ['order'])
+        # Update the updated_at timestamp of the execution sequence
+        execution_sequence.save(update_fields=['updated_at'])
 
     return Response({"message": "Order updated successfully"}, status=200)
 
@@ -907,13 +802,17 @@ def get_scenario_mapping(request, scenario_id):
     """
     try:
         scenario = Scenarios.objects.get(scenario_id=scenario_id)
-        return Response({
+    except Scenarios.DoesNotExist:
+        return Response({"error": "Scenario not found"}, status=404)
+
+    def build():
+        return {
             "scenario_id": scenario.scenario_id,
             "scenarios_name": scenario.scenarios_name,
             "mapping_file": scenario.mapping_file
-        }, status=200)
-    except Scenarios.DoesNotExist:
-        return Response({"error": "Scenario not found"}, status=404)
+        }
+
+    return cached_response(request, 'scenario_mapping', scenario_id, scenario.version, scenario.updated_at, build)
 
 @api_view(['PUT'])
 def update_scenario_mapping(request, scenario_id):
@@ -962,66 +861,12 @@ def accept_healing(request):
     except Execution.DoesNotExist:
         return Response({"error": f"Execution with ID {execution_id} not found"}, status=404)
     
-    # Update the healed elements to mark them as accepted
-    try:
-        HealedElements.objects.filter(execution=execution).update(label=True)
-        
-        # Prepare training examples for fine-tuning
-        training_examples = []
-        for element in healed_elements:
-            # Add to training examples directly
-            training_examples.append({
-                'original_id': element.get('original_element_id', ''),
-                'new_strategies': element.get('new_strategies', {}),
-                'label': True  # Positive example
-            })
-            
-            # Also store in database for future use
-            try:
-                FineTuningData.objects.create(
-                    execution=execution,
-                    original_attributes={"id": element.get('original_element_id', '')},
-                    matched_attributes=element.get('new_strategies', {}),
-                    label=True
-                )
-            except Exception as e:
-                # Log but continue if database storage fails
-                print(f"Error storing fine-tuning data: {str(e)}")
-        
-        # Fine-tune the model if there are examples
-        if training_examples:
-            try:
-                fine_tuner = ModelFineTuner()
-                success = fine_tuner.fine_tune(training_examples)
-                
-                if success:
-                    return Response({
-                        "message": "Healing accepted and model fine-tuned successfully",
-                        "examples_count": len(training_examples)
-                    }, status=200)
-                else:
-                    return Response({
-                        "message": "Healing accepted but model fine-tuning failed",
-                        "examples_count": len(training_examples)
-                    }, status=500)
-            except Exception as e:
-                import traceback
-                print(f"Fine-tuning error: {str(e)}")
-                print(traceback.format_exc())
-                return Response({
-                    "message": "Healing accepted but model fine-tuning failed",
-                    "error": str(e),
-                    "examples_count": len(training_examples)
-                }, status=500)
-        else:
-            return Response({
-                "message": "No healing examples to fine-tune with",
-            }, status=200)
-    except Exception as e:
-        import traceback
-        print(f"Accept healing error: {str(e)}")
-        print(traceback.format_exc())
-        return Response({"error": str(e)}, status=500)
+    # Storing the feedback and fine-tuning run in a background job
+    job = enqueue('accept_healing', {
+        "execution_id": execution.execution_id,
+        "healed_elements": healed_elements
+    }, user=request.user, project=execution.project)
+    return job_accepted(job)
 
 @api_view(['POST'])
 def reject_healing(request):
@@ -1040,40 +885,56 @@ def reject_healing(request):
     except Execution.DoesNotExist:
         return Response({"error": "Execution not found"}, status=404)
     
-    # Store fine-tuning data
-    training_examples = []
-    for element in healed_elements:
-        # Create fine-tuning data record
-        fine_tuning_data = FineTuningData.objects.create(
-            execution=execution,
-            original_attributes={"id": element.get('original_element_id', ''), "other_attrs": element.get('original_attributes', {})},
-            matched_attributes={"id": element.get('new_strategies', {}).get('id', ''), "other_attrs": element.get('matched_attributes', {})},
-            label=False  # Negative example
-        )
-        
-        # Add to training examples
-        training_examples.append({
-            'original_attributes': fine_tuning_data.original_attributes,
-            'matched_attributes': fine_tuning_data.matched_attributes,
-            'label': False
-        })
-    
-    # Fine-tune the model if there are examples
-    if training_examples:
-        fine_tuner = ModelFineTuner()
-        success = fine_tuner.fine_tune(training_examples)
-        
-        if success:
-            return Response({
-                "message": "Healing rejected and model fine-tuned successfully",
-                "examples_count": len(training_examples)
-            }, status=200)
-        else:
-            return Response({
-                "message": "Healing rejected but model fine-tuning failed",
-                "examples_count": len(training_examples)
-            }, status=500)
-    else:
-        return Response({
-            "message": "No healing examples to fine-tune with",
-        }, status=200)
+    # Storing the feedback and fine-tuning run in a background job
+    job = enqueue('reject_healing', {
+        "execution_id": execution.execution_id,
+        "healed_elements": healed_elements
+    }, user=request.user, project=execution.project)
+    return job_accepted(job)
+
+
+def job_accepted(job):
+    """
+    202 response for an enqueued job. When the job already ran (JOBS['EAGER']), its result is included.
+    """
+    data = progress(job)
+    data["status_url"] = reverse('job_status', args=[job.job_id])
+    data["result_url"] = reverse('job_result', args=[job.job_id])
+    if job.is_finished:
+        data["result"] = job.result
+    return Response(data, status=202)
+
+
+def _get_job(request, job_id):
+    job = Job.objects.filter(job_id=job_id).first()
+    # Jobs started by a signed-in user are only visible to that user
+    if job is None or (job.user_id and job.user_id != getattr(request.user, 'pk', None)):
+        return None
+    return job
+
+
+@api_view(['GET'])
+def job_status(request, job_id):
+    """
+    Status and per-step progress of a background job.
+    """
+    job = _get_job(request, job_id)
+    if job is None:
+        return Response({"error": "Job not found"}, status=404)
+    data = progress(job)
+    data["result_url"] = reverse('job_result', args=[job.job_id])
+    return Response(data, status=200)
+
+
+@api_view(['GET'])
+def job_result(request, job_id):
+    """
+    Response of a finished job, with the status code the endpoint would have returned;
+    202 with the job status while it is still queued or running.
+    """
+    job = _get_job(request, job_id)
+    if job is None:
+        return Response({"error": "Job not found"}, status=404)
+    if not job.is_finished:
+        return Response(progress(job), status=202)
+    return Response(job.result, status=job.result_status or 200)
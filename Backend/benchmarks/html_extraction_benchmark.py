@@ -0,0 +1,128 @@
+"""
+Benchmark of the interactive-element extraction used by process_html.
+
+Compares the single-pass lxml extractor (accounts.controllers.element_extractor) with the
+previous BeautifulSoup/html.parser path, which rebuilt each element's XPath by walking to the
+root and rescanning the siblings at every level, on synthetic wide, deep and mixed pages.
+
+Usage (from Backend/):
+    python benchmarks/html_extraction_benchmark.py [--sizes 500 2000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from accounts.controllers.element_extractor import INTERACTIVE_ELEMENTS, extract_page  # noqa: E402
+
+
+def legacy_xpath(tag, absolute=True):
+    path = []
+    current = tag
+    while current:
+        if current.name:
+            siblings = [sibling for sibling in current.parent.find_all(current.name, recursive=False)] if current.parent else []
+            index = siblings.index(current) + 1 if siblings else 1
+            path.append(f"{current.name}[{index}]")
+        current = current.parent
+    path.reverse()
+    return "/" + "/".join(path) if absolute else "./" + "/".join(path)
+
+
+def legacy_css_selector(tag):
+    selector = tag.name
+    if tag.get("id"):
+        selector += f"#{tag.get('id')}"
+    elif tag.get("class"):
+        selector += "." + ".".join(tag.get("class"))
+    return selector
+
+
+def legacy_extract(page_html):
+    """
+    The BeautifulSoup extraction loop process_html used before the lxml extractor.
+    """
+    soup = BeautifulSoup(page_html, "html.parser")
+    elements = []
+    for tag in soup.find_all(INTERACTIVE_ELEMENTS):
+        attributes = {
+            "role": tag.name,
+            "id": tag.get("id"),
+            "name": tag.get("name"),
+            "type": tag.get("type"),
+            "value": tag.get("value"),
+            "class": tag.get("class"),
+            "text": tag.text.strip(),
+            "placeholder": tag.get("placeholder", ""),
+            "parent": tag.parent.name if tag.parent else None,
+            "siblings": [sibling.name for sibling in tag.find_previous_siblings()]
+        }
+        parent_select = tag.find_parent("select") if tag.name == "option" else None
+        attributes["xpath_absolute"] = legacy_xpath(tag, absolute=True)
+        attributes["xpath_relative"] = legacy_xpath(tag, absolute=False)
+        attributes["css_selector"] = (
+            f"select#{parent_select.get('id')} option[value='{tag.get('value')}']"
+            if (tag.name == "option" and parent_select)
+            else legacy_css_selector(tag)
+        )
+        elements.append({"content": str(tag), "attributes": attributes})
+    return elements, soup.get_text()
+
+
+def wide_page(size):
+    fields = "".join(
+        f"<label for='f{i}'>Field {i}</label><input id='f{i}' name='field{i}' type='text'>"
+        for i in range(size)
+    )
+    return f"<html><body><form>{fields}<button type='submit'>Save</button></form></body></html>"
+
+
+def deep_page(size):
+    # Depth is capped below libxml2's huge_tree limit; wider levels make up the size
+    depth = min(size, 1000)
+    return "<html><body>" + "<div><span>x</span>" * depth + "<button id='deep'>Go</button>" + "</div>" * depth + "</body></html>"
+
+
+def mixed_page(size):
+    rows = "".join(
+        f"<tr><td>{i}</td><td><a href='/item/{i}'>Item {i}</a></td>"
+        f"<td><select name='qty{i}'><option value='1'>1</option><option value='2'>2</option></select></td>"
+        f"<td><button class='btn add' value='{i}'>Add</button></td></tr>"
+        for i in range(size // 4)
+    )
+    return f"<html><body><nav><a href='/'>Home</a></nav><table>{rows}</table></body></html>"
+
+
+def best_of(function, page, repeat):
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        elements, _ = function(page)
+        best = min(best, time.perf_counter() - start)
+        count = len(elements)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'page':<8}{'size':>8}{'elements':>10}{'bs4 (s)':>12}{'lxml (s)':>12}{'speedup':>10}")
+    for name, build in (("wide", wide_page), ("deep", deep_page), ("mixed", mixed_page)):
+        for size in args.sizes:
+            page = build(size)
+            legacy_time, legacy_count = best_of(legacy_extract, page, args.repeat)
+            lxml_time, lxml_count = best_of(extract_page, page, args.repeat)
+            assert legacy_count == lxml_count, f"{name}/{size}: {legacy_count} != {lxml_count} elements"
+            print(f"{name:<8}{size:>8}{lxml_count:>10}{legacy_time:>12.3f}{lxml_time:>12.3f}{legacy_time / lxml_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Accuracy-vs-latency report of the inference backends (fp32, dynamic int8, ONNX) for the
+E5 mapping model and the MiniLM/fine-tuned healing model.
+
+Runs the mapping and healing fixtures in benchmarks/fixtures/inference_fixtures.json through
+every backend and reports, per model and backend:
+- load time, single-text latency (median) and batch throughput on CPU
+- top-1 accuracy on the mapping (step -> element) and healing (broken locator -> element) fixtures
+- agreement of the top-1 decisions with fp32, and mean cosine similarity to the fp32 embeddings
+
+Usage (from Backend/, with the models available locally or from the Hugging Face hub):
+    python benchmarks/inference_backend_report.py [--models e5 healing] [--backends fp32 int8 onnx] [--output report.md]
+
+--random-weights builds randomly initialised encoders from the bundled fine-tuned model config
+instead of loading weights; accuracy is meaningless then, but latency and fp32/int8 agreement
+still show the effect of quantization (useful to check the script without network access).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import torch
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from accounts.controllers.embedding_service import EmbeddingService  # noqa: E402
+from accounts.controllers.inference_backend import (  # noqa: E402
+    BACKENDS, FP32, INT8, load_sentence_transformer, load_transformer, quantize_int8
+)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "inference_fixtures.json")
+FINE_TUNED_MODEL = os.path.join(BACKEND_DIR, "accounts", "controllers", "models", "fine_tuned_model")
+E5_MODEL = "intfloat/e5-large-v2"
+HEALING_THRESHOLD = 0.3  # ElementHealer only accepts matches above this similarity
+
+
+def element_text(attributes):
+    """Text representation used by process_html for mapping."""
+    return " ".join([attributes.get("role", "")] + [
+        f"{key}={attributes.get(key)}" for key in ("id", "name", "type", "value", "text", "placeholder")
+    ])
+
+
+def healing_text(attributes):
+    """Text representation used by ElementHealer._attributes_to_text."""
+    return " ".join(str(value) for value in attributes.values() if value)
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+class Encoder:
+    """Uniform encode(texts) -> unit vectors over EmbeddingService and SentenceTransformer models."""
+
+    def __init__(self, encode, backend, load_seconds):
+        self.encode = encode
+        self.backend = backend
+        self.load_seconds = load_seconds
+
+
+def load_encoder(model, backend, random_weights):
+    start = time.perf_counter()
+    if random_weights:
+        from transformers import AutoConfig, AutoModel, AutoTokenizer
+
+        if backend not in (FP32, INT8):
+            raise RuntimeError("random weights only support fp32 and int8")
+        torch.manual_seed(0)  # Same weights for every backend
+        network = AutoModel.from_config(AutoConfig.from_pretrained(FINE_TUNED_MODEL)).eval()
+        if backend == INT8:
+            network = quantize_int8(network)
+        service = EmbeddingService(AutoTokenizer.from_pretrained(FINE_TUNED_MODEL), network)
+        encode = lambda texts: normalize(service.encode(texts).numpy())  # noqa: E731
+    elif model == "e5":
+        from transformers import AutoTokenizer
+
+        network, backend = load_transformer(E5_MODEL, backend)
+        service = EmbeddingService(AutoTokenizer.from_pretrained(E5_MODEL), network)
+        encode = lambda texts: normalize(service.encode(texts).numpy())  # noqa: E731
+    else:
+        path = FINE_TUNED_MODEL if os.path.exists(os.path.join(FINE_TUNED_MODEL, "model.safetensors")) else "all-MiniLM-L6-v2"
+        network, backend = load_sentence_transformer(path, backend)
+        encode = lambda texts: normalize(network.encode(list(texts), convert_to_numpy=True))  # noqa: E731
+    return Encoder(encode, backend, time.perf_counter() - start)
+
+
+def run_fixtures(encoder, fixtures):
+    """Top-1 decisions, best scores and embeddings for the mapping and healing fixtures."""
+    results = {}
+    for task, query_text, candidate_text, query_key in (
+        ("mapping", lambda case: case["step"], element_text, "step"),
+        ("healing", lambda case: healing_text(case["original"]), healing_text, "original"),
+    ):
+        decisions, scores, correct, embeddings = [], [], [], []
+        for case in fixtures[task]:
+            candidates = fixtures["pages"][case["page"]]
+            vectors = encoder.encode([query_text(case)] + [candidate_text(candidate) for candidate in candidates])
+            similarity = vectors[1:] @ vectors[0]
+            best = int(np.argmax(similarity))
+            decisions.append(best)
+            scores.append(float(similarity[best]))
+            correct.append(candidates[best].get("id") == case["expected_id"])
+            embeddings.append(vectors)
+        results[task] = {
+            "decisions": decisions,
+            "scores": scores,
+            "accuracy": float(np.mean(correct)),
+            "embeddings": np.vstack(embeddings)
+        }
+    return results
+
+
+def measure_latency(encoder, texts, repeat):
+    singles = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            encoder.encode([text])
+            singles.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encoder.encode(texts)
+    batch_seconds = (time.perf_counter() - start) / repeat
+    return statistics.median(singles) * 1000, len(texts) / batch_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", nargs="+", default=["e5", "healing"], choices=["e5", "healing"])
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU threads (default: torch's choice)")
+    parser.add_argument("--random-weights", action="store_true")
+    parser.add_argument("--output", help="also write the markdown report to this file")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    with open(FIXTURES) as f:
+        fixtures = json.load(f)
+    texts = [case["step"] for case in fixtures["mapping"]] + [
+        element_text(element) for elements in fixtures["pages"].values() for element in elements
+    ]
+
+    lines = [
+        f"# Inference backend report ({'random weights' if args.random_weights else 'pretrained weights'}, "
+        f"{torch.get_num_threads()} CPU threads)",
+        "",
+        f"{len(fixtures['mapping'])} mapping steps, {len(fixtures['healing'])} healing cases, "
+        f"latency over {len(texts)} fixture texts.",
+        "",
+        "| model | backend | load (s) | single text (ms) | batch (texts/s) | mapping acc | healing acc "
+        "| mapping = fp32 | healing = fp32 | healing accept = fp32 | cosine to fp32 |",
+        "|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for model in args.models:
+        baseline = None
+        for backend in args.backends:
+            try:
+                encoder = load_encoder(model, backend, args.random_weights)
+            except Exception as e:
+                lines.append(f"| {model} | {backend} | failed: {e} |||||||||")
+                continue
+            label = backend if encoder.backend == backend else f"{backend} (fell back to {encoder.backend})"
+            results = run_fixtures(encoder, fixtures)
+            single_ms, throughput = measure_latency(encoder, texts, args.repeat)
+            if baseline is None and encoder.backend == FP32:
+                baseline = results
+
+            def agreement(task):
+                if baseline is None:
+                    return "n/a"
+                same = np.mean(np.array(results[task]["decisions"]) == np.array(baseline[task]["decisions"]))
+                return f"{same:.0%}"
+
+            accept_same = "n/a"
+            cosine = "n/a"
+            if baseline is not None:
+                accepted = np.array(results["healing"]["scores"]) > HEALING_THRESHOLD
+                accepted_fp32 = np.array(baseline["healing"]["scores"]) > HEALING_THRESHOLD
+                accept_same = f"{np.mean(accepted == accepted_fp32):.0%}"
+                cosine = np.mean([
+                    np.mean(np.sum(results[task]["embeddings"] * baseline[task]["embeddings"], axis=1))
+                    for task in ("mapping", "healing")
+                ])
+                cosine = f"{cosine:.4f}"
+            lines.append(
+                f"| {model} | {label} | {encoder.load_seconds:.1f} | {single_ms:.1f} | {throughput:.0f} "
+                f"| {results['mapping']['accuracy']:.0%} | {results['healing']['accuracy']:.0%} "
+                f"| {agreement('mapping')} | {agreement('healing')} | {accept_same} | {cosine} |"
+            )
+
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Mean time-to-locate with the learned strategy order (RLHealingAgent) against the fixed
+mapping order (id, CSS Selector, XPath).
+
+Replays a suite for several runs. Every step's strategies hit or miss with per-page, per-tag
+probabilities: generated ids break on single-page-app pages, CSS selectors break on pages
+whose classes churn, and XPaths break where the layout moves. Each lookup is costed for the
+two lookup modes of SelfHealingFramework:
+- sequential: strategies are waited on in order, as the "parallel" mode's future loop
+  does, so every miss before the hit costs the wait timeout
+- race: all strategies are evaluated in one in-page script per tick, so only a lookup
+  with no hit at all costs the timeout and the order mostly decides which locator wins
+
+Steps come from a synthetic suite, or from a scenario mapping exported from the API
+(--mapping: the mapping_file rows, header first). Page and tag contexts are taken from it.
+
+Usage (from Backend/):
+    python benchmarks/strategy_order_benchmark.py [--runs 20] [--mapping scenario.json] [--seed 7]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from accounts.controllers.self_healing_framework.rl_healing_agent import RLHealingAgent  # noqa: E402
+
+STRATEGIES = ['id', 'CSS Selector', 'XPath (Absolute)']
+
+# Probability that each strategy still resolves, by page profile
+PROFILES = {
+    'stable': {'id': 0.98, 'CSS Selector': 0.95, 'XPath (Absolute)': 0.9},
+    'generated_ids': {'id': 0.15, 'CSS Selector': 0.6, 'XPath (Absolute)': 0.92},
+    'class_churn': {'id': 0.3, 'CSS Selector': 0.2, 'XPath (Absolute)': 0.85},
+    'moving_layout': {'id': 0.25, 'CSS Selector': 0.9, 'XPath (Absolute)': 0.3},
+}
+TAGS = ['button', 'input', 'a', 'select']
+
+
+def synthetic_suite(rng, pages=8, steps_per_page=6):
+    steps = []
+    for page in range(pages):
+        profile = list(PROFILES)[page % len(PROFILES)]
+        for step in range(steps_per_page):
+            tag = TAGS[step % len(TAGS)]
+            steps.append({
+                'Page': f"https://app.test/page{page}",
+                'XPath (Absolute)': f"/html/body/main/form/{tag}[{step + 1}]",
+                'locator_strategies': {name: f"{name}-{page}-{step}" for name in STRATEGIES},
+                'profile': profile,
+            })
+    return steps
+
+
+def mapping_suite(path):
+    with open(path) as f:
+        mapping = json.load(f)
+    header = mapping[0]
+    steps = []
+    for index, row in enumerate(mapping[1:]):
+        row = dict(zip(header, row))
+        steps.append({
+            'Page': row.get('Page', ''),
+            'XPath (Absolute)': row.get('XPath (Absolute)', ''),
+            'locator_strategies': {name: row.get(name) or f"{name}-{index}" for name in STRATEGIES},
+            # Pages of a real suite get a profile each, deterministically from their URL
+            'profile': list(PROFILES)[sum(map(ord, row.get('Page', ''))) % len(PROFILES)],
+        })
+    return steps
+
+
+def locate_time(order, hits, mode, hit_cost, timeout):
+    """Seconds to locate the element with the strategies tried in this order."""
+    if mode == 'race':
+        return hit_cost if any(hits.values()) else timeout
+    elapsed = 0.0
+    for name in order:
+        if hits[name]:
+            return elapsed + hit_cost
+        elapsed += timeout
+    return elapsed
+
+
+def replay(steps, runs, learned, mode, rng, hit_cost, timeout):
+    agent = RLHealingAgent(STRATEGIES, rng=random.Random(rng.random()))
+    per_run = []
+    for _ in range(runs):
+        times = []
+        for step in steps:
+            strategies = step['locator_strategies']
+            context = agent.context(step)
+            order = list(agent.order(strategies, context)) if learned else list(strategies)
+            hits = {name: rng.random() < PROFILES[step['profile']][name] for name in strategies}
+            times.append(locate_time(order, hits, mode, hit_cost, timeout))
+            winner = next((name for name in order if hits[name]), None)
+            agent.observe(context, order, winner)
+        per_run.append(statistics.mean(times))
+    return per_run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--mapping", help="Scenario mapping_file JSON (rows, header first)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--hit-cost", type=float, default=0.05, help="Seconds for a lookup that hits")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds a missing locator is waited on")
+    args = parser.parse_args()
+
+    steps = mapping_suite(args.mapping) if args.mapping else synthetic_suite(random.Random(args.seed))
+    print(f"{len(steps)} steps, {args.runs} runs, hit {args.hit_cost}s, miss timeout {args.timeout}s")
+    print(f"{'mode':<12}{'fixed (s)':>12}{'learned (s)':>14}{'last run (s)':>14}{'reduction':>11}")
+    for mode in ('sequential', 'race'):
+        # The same seed replays the same hits and misses for both orders
+        fixed = replay(steps, args.runs, False, mode, random.Random(args.seed), args.hit_cost, args.timeout)
+        learned = replay(steps, args.runs, True, mode, random.Random(args.seed), args.hit_cost, args.timeout)
+        fixed_mean, learned_mean = statistics.mean(fixed), statistics.mean(learned)
+        reduction = 1 - learned_mean / fixed_mean if fixed_mean else 0.0
+        print(f"{mode:<12}{fixed_mean:>12.3f}{learned_mean:>14.3f}{learned[-1]:>14.3f}{reduction:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
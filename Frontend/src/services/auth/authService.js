@@ -2,6 +2,14 @@ import axios from 'axios';
 
 const API_URL = 'http://localhost:8000/api';
 axios.defaults.baseURL = API_URL;
+// Send the access token with every request (endpoints such as /get_projects/ are per user)
+axios.interceptors.request.use((config) => {
+  const token = localStorage.getItem('access_token');
+  if (token && !config.headers.Authorization) {
+    config.headers.Authorization = `Bearer ${token}`;
+  }
+  return config;
+});
 axios.interceptors.response.use(
   (response) => response,
   (error) => {
@@ -0,0 +1,24 @@
+import axios from 'axios';
+
+const POLL_INTERVAL_MS = 2000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Execution, mapping and fine-tuning endpoints answer 202 with a background job id.
+// Polls the job until it finishes and resolves with its result like the synchronous response
+// (axios rejects as usual when the job's result has an error status).
+export const waitForJob = async (request, onProgress) => {
+  const response = await request;
+  if (response.status !== 202 || !response.data?.job_id) {
+    return response;
+  }
+
+  let job = response.data;
+  while (job.status !== 'SUCCEEDED' && job.status !== 'FAILED') {
+    if (onProgress) onProgress(job);
+    await sleep(POLL_INTERVAL_MS);
+    job = (await axios.get(`/jobs/${job.job_id}/`)).data;
+  }
+  if (onProgress) onProgress(job);
+  return axios.get(`/jobs/${job.job_id}/result/`);
+};
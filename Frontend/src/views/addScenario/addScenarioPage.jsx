@@ -18,6 +18,7 @@ import Sidebar from "../common/Sidebar";
 import Navbar from "../common/Navbar";
 import { useState, useEffect } from "react";
 import axios from "axios";
+import { waitForJob } from "../../services/jobs/jobService";
 import { Link } from "react-router-dom";
 
 const AddScenario = () => {
@@ -137,14 +138,14 @@ const AddScenario = () => {
     setLoading(true);
 
     try {
-      const response = await axios.post("/scenario/", {
+      const response = await waitForJob(axios.post("/scenario/", {
         project_id: selectedProject,
         bdd: scenario,
         links: urls,
         execution_sequence_number: executionSequenceNumber,
         order: order || null,
         scenarios_name: scenariosName,
-      });
+      }));
 
       toast({
         title: "Mapping Finished",
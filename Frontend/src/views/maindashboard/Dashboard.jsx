@@ -11,7 +11,8 @@ import {
   Tr,
   Th,
   Td,
-  Select
+  Select,
+  Button
 } from "@chakra-ui/react";
 import { ResponsiveContainer, BarChart, Bar, XAxis, YAxis, Tooltip, CartesianGrid } from "recharts";
 
@@ -19,11 +20,19 @@ import { ResponsiveContainer, BarChart, Bar, XAxis, YAxis, Tooltip, CartesianGri
 import Sidebar from "../common/Sidebar";
 import Navbar from "../common/Navbar";
 
+const toHealedRow = elem => ({
+  name: elem.execution_name,
+  pastId: elem.past_id,
+  newId: elem.new_id,
+  date: new Date(elem.created_at).toLocaleDateString()
+});
+
 const Dashboard = () => {
   const [totalScenarios, setTotalScenarios] = useState(0);
   const [totalHealedElements, setTotalHealedElements] = useState(0);
   const [executionData, setExecutionData] = useState([]);
   const [healedElements, setHealedElements] = useState([]);
+  const [healedNextPage, setHealedNextPage] = useState(null);
   const [projects, setProjects] = useState([]);
   const [selectedProjectId, setSelectedProjectId] = useState('');
 
@@ -48,20 +57,20 @@ const Dashboard = () => {
     if (selectedProjectId) {
       const fetchProjectMetrics = async () => {
         try {
-          const response = await axios.get(`/project_metrics/${selectedProjectId}/`);
-          const data = response.data;
+          // Totals and latest executions, plus the first page of the healing history
+          const [summary, healed] = await Promise.all([
+            axios.get(`/project_metrics/${selectedProjectId}/summary/`),
+            axios.get(`/project_metrics/${selectedProjectId}/healed_elements/`)
+          ]);
+          const data = summary.data;
           setTotalScenarios(data.total_scenarios);
           setTotalHealedElements(data.total_healed_elements);
           setExecutionData(data.execution_data.map(exec => ({
             name: exec.execution_name,
             count: exec.number_of_healed_elements
           })));
-          setHealedElements(data.healed_elements.map(elem => ({
-            name: elem.execution_name,
-            pastId: elem.past_id,
-            newId: elem.new_id,
-            date: new Date(elem.created_at).toLocaleDateString()
-          })));
+          setHealedElements(healed.data.results.map(toHealedRow));
+          setHealedNextPage(healed.data.next);
         } catch (error) {
           console.error('Error fetching project metrics:', error);
         }
@@ -70,6 +79,16 @@ const Dashboard = () => {
     }
   }, [selectedProjectId]);
 
+  const loadMoreHealed = async () => {
+    try {
+      const response = await axios.get(healedNextPage);
+      setHealedElements(current => [...current, ...response.data.results.map(toHealedRow)]);
+      setHealedNextPage(response.data.next);
+    } catch (error) {
+      console.error('Error fetching healed elements:', error);
+    }
+  };
+
   const healedPercentage = totalScenarios > 0 ? Math.round((totalHealedElements / totalScenarios) * 100) : 0;
 
   return (
@@ -324,6 +343,13 @@ const Dashboard = () => {
                     ))}
                   </Tbody>
                 </Table>
+                {healedNextPage && (
+                  <Flex justify="center" mt={4}>
+                    <Button size="sm" variant="outline" colorScheme="blue" onClick={loadMoreHealed}>
+                      Load more
+                    </Button>
+                  </Flex>
+                )}
               </Box>
             </Flex>
           </Box>
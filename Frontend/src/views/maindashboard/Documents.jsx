@@ -19,6 +19,7 @@ import Sidebar from "../common/Sidebar";
 import Navbar from "../common/Navbar";
 import { useState, useEffect } from "react";
 import axios from "axios";
+import { waitForJob } from "../../services/jobs/jobService";
 import { Link } from "react-router-dom";
 
 const Documents = () => {
@@ -171,11 +172,11 @@ const Documents = () => {
     formData.append("scenarios_name", scenariosName);
 
     try {
-      const response = await axios.post("/documents/", formData, {
+      const response = await waitForJob(axios.post("/documents/", formData, {
         headers: {
           "Content-Type": "multipart/form-data",
         },
-      });
+      }));
 
       toast({
         title: "Files uploaded successfully.",
@@ -36,6 +36,7 @@ import { FiCheckCircle, FiXCircle, FiAlertTriangle, FiInfo } from 'react-icons/f
 import Sidebar from '../common/Sidebar';
 import Navbar from '../common/Navbar';
 import axios from 'axios';
+import { waitForJob } from '../../services/jobs/jobService';
 
 const Execute = () => {
   const toast = useToast();
@@ -122,11 +123,11 @@ const Execute = () => {
     setTestResults(null);
 
     try {
-      const response = await axios.post('/execute_tests/', {
+      const response = await waitForJob(axios.post('/execute_tests/', {
         project_id: selectedProject,
         execution_sequence_number: executionSequenceNumber,
         execution_name: executionName || 'Default Execution',
-      });
+      }));
 
       setTestResults(response.data);
 
@@ -161,10 +162,10 @@ const Execute = () => {
         throw new Error("Execution ID is missing from test results");
       }
       
-      const response = await axios.post('/accept_healing/', {
+      const response = await waitForJob(axios.post('/accept_healing/', {
         execution_id: testResults.execution_id,
         healed_elements: testResults.healed_elements,
-      });
+      }));
       
       toast({
         title: 'Healing accepted',
@@ -197,10 +198,10 @@ const Execute = () => {
         throw new Error("Execution ID is missing from test results");
       }
       
-      const response = await axios.post('/reject_healing/', {
+      const response = await waitForJob(axios.post('/reject_healing/', {
         execution_id: testResults.execution_id,
         healed_elements: testResults.healed_elements,
-      });
+      }));
       
       toast({
         title: 'Healing rejected',
@@ -33,6 +33,7 @@ import Sidebar from "../common/Sidebar";
 import Navbar from "../common/Navbar";
 import { useState, useEffect } from "react";
 import axios from "axios";
+import { waitForJob } from "../../services/jobs/jobService";
 import { Link } from "react-router-dom";
 
 const UpdateOrder = () => {
@@ -230,14 +231,14 @@ const UpdateOrder = () => {
     }
     setIsAdding(true);
     try {
-      await axios.post("/scenario/", {
+      await waitForJob(axios.post("/scenario/", {
         project_id: selectedProject,
         bdd: addBDD,
         links: addUrls,
         execution_sequence_number: executionSequenceNumber,
         order: addOrder || null,
         scenarios_name: addScenarioName,
-      });
+      }));
       toast({
         title: "Scenario Added",
         description: "Scenario added successfully.",